@@ -3,17 +3,36 @@ Flask Backend API for Claude ROI Insight Calculator
 Handles JIRA API calls and ROI analysis
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from jira_api_client import JiraAPIClient
-from data_analyzer import ROIAnalyzer
+from jira_api_client import JIRA_POOL_SIZE, JiraAPIClient, JiraFetchError, jira_session_stats
+from jira_sync import JiraSyncState
+from issue_store import IssueStore
+from model_analyzer import ModelUsageAnalyzer
+from data_analyzer import ROIAnalyzer, dataset_cache_stats, dataset_fingerprint, parse_date
+from engineer_roi import EngineerUsageIndex, join_engineer_usage, load_engineer_identities
+from response_cache import FastJSONProvider, ResponseCache, cached_json_response, gzip_chunks
+from store_analyzer import StoreROIAnalyzer
+from streaming_analyzer import StreamingROIAnalyzer
+from usage_analyzer import UsageAnalyzer
+from usage_index import UsageFileChangedError, load_usage_index, usage_index_stats
+from usage_rollups import UsageRollups
+from usage_store import load_usage_store, usage_file_version, usage_store_stats
+from snapshot import is_snapshot, MANIFEST_FILE
+import json
 import os
+import threading
 from datetime import datetime
+from typing import Dict, Tuple
 import traceback
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
+# Encode JSON responses with orjson when it is installed
+if FastJSONProvider.available:
+    app.json = FastJSONProvider(app)
+
 # Add request/response logging middleware
 @app.before_request
 def log_request():
@@ -35,12 +54,109 @@ os.makedirs(DATA_DIR, exist_ok=True)
 
 JIRA_EXPORT_PATH = os.path.join(DATA_DIR, 'jira_export.csv')
 PROCESSED_DATA_PATH = os.path.join(DATA_DIR, 'processed_data.csv')
+PROCESSED_SNAPSHOT_PATH = os.path.join(DATA_DIR, 'processed_snapshot')
+
+# Optional JIRA Assignee Id (or name) -> usage email mapping for engineers whose names don't match
+ENGINEER_IDENTITIES_PATH = os.path.join(DATA_DIR, 'engineer_identities.json')
+
+# Per-project updated-since watermarks for incremental JIRA syncs
+JIRA_SYNC_STATE_PATH = os.path.join(DATA_DIR, 'jira_sync_state.json')
+jira_sync_state = JiraSyncState(JIRA_SYNC_STATE_PATH)
+
+# Fetched issues, partitioned by JIRA site and project
+ISSUE_STORE_PATH = os.path.join(DATA_DIR, 'issues.sqlite3')
+issue_store = IssueStore(ISSUE_STORE_PATH)
+
+# Claude Code API usage data per demo company (an NDJSON copy is used when present)
+USAGE_DATA_FILES = {
+    'fintechco': 'fintechco_api_usage_data.json',
+    'pharmaco': 'pharmaco_api_usage_data.json'
+}
+
+
+# Materialized daily usage rollups (the database is opened on first use), synced
+# from each usage file once per file version
+USAGE_ROLLUPS_PATH = os.path.join(DATA_DIR, 'usage_rollups.sqlite3')
+
+# Relative error of approximate (HyperLogLog) distinct-user counts
+DISTINCT_ERROR_RATE = float(os.getenv('DISTINCT_ERROR_RATE', '0.01'))
+
+usage_rollups = UsageRollups(USAGE_ROLLUPS_PATH, sketch_error_rate=DISTINCT_ERROR_RATE)
+
+# (path, usage_file_version) each company's rollups were last synced from
+_synced_usage_versions: Dict[str, Tuple[str, str]] = {}
+_usage_sync_lock = threading.Lock()
+
+
+def sync_usage_rollups(company: str, path: str):
+    """
+    Bring a company's rollups up to date with its usage file (only new days are aggregated)
+
+    Runs once per file version: while the file is unchanged, requests only
+    compare its version and never touch the database. Syncs run one at a time.
+    """
+    version = (path, usage_file_version(path))
+    if _synced_usage_versions.get(company) == version:
+        return
+
+    with _usage_sync_lock:
+        if _synced_usage_versions.get(company) != version:
+            if not usage_rollups.is_current(company, path):
+                usage_rollups.sync(company, load_usage_store(path))
+            _synced_usage_versions[company] = version
+
+
+def usage_data_path(company: str) -> str:
+    """Path of a company's usage file, preferring an .ndjson copy of the JSON file"""
+    json_path = os.path.join(DATA_DIR, USAGE_DATA_FILES[company])
+    ndjson_path = os.path.splitext(json_path)[0] + '.ndjson'
+    return ndjson_path if os.path.exists(ndjson_path) else json_path
+
+# CSV exports larger than this are analyzed in chunks instead of being loaded whole
+STREAMING_THRESHOLD_BYTES = int(os.getenv('STREAMING_THRESHOLD_MB', '512')) * 1024 * 1024
+
+
+def build_analyzer(data_path: str, claude_adoption_date: str) -> ROIAnalyzer:
+    """Lean in-memory analyzer, or a streaming one for CSVs above STREAMING_THRESHOLD_BYTES"""
+    if os.path.isfile(data_path) and os.path.getsize(data_path) > STREAMING_THRESHOLD_BYTES:
+        print(f"🌊 Streaming large export: {data_path}")
+        return StreamingROIAnalyzer(data_path, claude_adoption_date)
+    return ROIAnalyzer(data_path, claude_adoption_date, lean=True)
+
+
+# Serialized analysis responses keyed by (endpoint, dataset fingerprint, company, adoption date)
+response_cache = ResponseCache(int(os.getenv('RESPONSE_CACHE_MB', '64')) * 1024 * 1024)
+
+# /api/usage-data responses up to this size are cached (pre-compressed); larger ones are streamed
+USAGE_DATA_CACHE_BYTES = int(os.getenv('USAGE_DATA_CACHE_MB', '8')) * 1024 * 1024
+
+
+def jira_data_path() -> str:
+    """
+    Path to load fetched JIRA data from
+
+    Prefers the columnar snapshot written after the last fetch, which loads
+    without re-parsing, unless the CSV export is newer.
+    """
+    if is_snapshot(PROCESSED_SNAPSHOT_PATH) and os.path.exists(JIRA_EXPORT_PATH):
+        snapshot_mtime = os.path.getmtime(os.path.join(PROCESSED_SNAPSHOT_PATH, MANIFEST_FILE))
+        if snapshot_mtime >= os.path.getmtime(JIRA_EXPORT_PATH):
+            return PROCESSED_SNAPSHOT_PATH
+    return JIRA_EXPORT_PATH
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'message': 'Claude ROI API is running'})
+    """Health check endpoint (also reports memory used by cached datasets)"""
+    return jsonify({
+        'status': 'healthy',
+        'message': 'Claude ROI API is running',
+        'datasets': dataset_cache_stats(),
+        'usage_stores': usage_store_stats(),
+        'usage_indexes': usage_index_stats(),
+        'response_cache': response_cache.stats(),
+        'jira_sessions': jira_session_stats()
+    })
 
 
 @app.route('/api/fetch-demo-data', methods=['POST'])
@@ -68,6 +184,17 @@ def fetch_demo_data():
 
         claude_adoption_date = data['claude_adoption_date'].strip()
         company = data.get('company', 'fintechco').strip().lower()
+        granularity = str(data.get('granularity', 'week')).strip().lower()
+
+        if granularity not in ROIAnalyzer.TIME_SERIES_FREQUENCIES:
+            return jsonify({
+                'error': f"Invalid granularity: {granularity}. Must be one of {', '.join(ROIAnalyzer.TIME_SERIES_FREQUENCIES)}"
+            }), 400
+
+        try:
+            adoption_day = parse_date(claude_adoption_date).strftime('%Y-%m-%d')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         print(f"✅ Using Claude Adoption Date: {claude_adoption_date}")
         print(f"✅ Selected Company: {company}")
@@ -91,35 +218,36 @@ def fetch_demo_data():
                 'expected_path': DEMO_DATA_PATH
             }), 404
 
+        # Serve repeat requests for the same data file and date from memory
+        cache_key = ('demo', dataset_fingerprint(DEMO_DATA_PATH), company, adoption_day, granularity)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ Serving cached analysis for {company}")
+            return cached_json_response(cached)
+
         print(f"📂 Loading data from: {DEMO_DATA_PATH}")
 
         # Analyze data using the selected CSV
-        analyzer = ROIAnalyzer(DEMO_DATA_PATH, claude_adoption_date)
+        analyzer = build_analyzer(DEMO_DATA_PATH, claude_adoption_date)
 
         # Get metrics
-        summary_metrics = analyzer.get_summary_metrics()
-        time_series_data = analyzer.get_time_series_data()
-        status_breakdown = analyzer.get_status_breakdown()
-        priority_breakdown = analyzer.get_priority_breakdown()
+        results = analyzer.analyze(granularity)
 
-        # Count total issues from CSV
-        import pandas as pd
-        df = pd.read_csv(DEMO_DATA_PATH)
-        total_issues = len(df)
+        # Count total issues in the CSV (before invalid rows were filtered out)
+        total_issues = analyzer.source_rows
 
         print(f"✅ Successfully analyzed {total_issues} issues for {company}")
 
-        return jsonify({
+        cached = response_cache.put(cache_key, {
             'success': True,
             'message': f'Successfully analyzed {total_issues} issues for {company}',
             'total_issues': total_issues,
             'company': company,
-            'summary_metrics': summary_metrics,
-            'time_series_data': time_series_data,
-            'status_breakdown': status_breakdown,
-            'priority_breakdown': priority_breakdown,
+            'granularity': granularity,
+            **results,
             'demo_mode': True
         })
+        return cached_json_response(cached)
 
     except Exception as e:
         print(f"Error in fetch_demo_data: {str(e)}")
@@ -141,7 +269,10 @@ def fetch_jira_data():
         "email": "your-email@company.com",
         "api_token": "your-api-token",
         "project_name": "FinTechCo Backlog",  # or project key
-        "claude_adoption_date": "2025-08-25"
+        "claude_adoption_date": "2025-08-25",
+        "workers": 4,  # optional: fetch created-date windows concurrently (default 1, serial)
+        "sync": "incremental",  # optional: only fetch issues updated since the last sync (default "full")
+        "stream": true  # optional: write full syncs page by page as they arrive (default false)
     }
     """
     try:
@@ -167,6 +298,33 @@ def fetch_jira_data():
         claude_adoption_date = data['claude_adoption_date'].strip()
         project_name = data.get('project_name', '').strip()
         project_key = data.get('project_key', '').strip()
+        granularity = str(data.get('granularity', 'week')).strip().lower()
+
+        if granularity not in ROIAnalyzer.TIME_SERIES_FREQUENCIES:
+            return jsonify({
+                'error': f"Invalid granularity: {granularity}. Must be one of {', '.join(ROIAnalyzer.TIME_SERIES_FREQUENCIES)}"
+            }), 400
+
+        try:
+            workers = int(data.get('workers', 1))
+        except (TypeError, ValueError):
+            workers = 0
+        if not 1 <= workers <= JIRA_POOL_SIZE:
+            return jsonify({
+                'error': f'workers must be an integer from 1 to {JIRA_POOL_SIZE}'
+            }), 400
+
+        sync_mode = str(data.get('sync', 'full')).strip().lower()
+        if sync_mode not in ('full', 'incremental'):
+            return jsonify({
+                'error': f"Invalid sync: {sync_mode}. Must be one of full, incremental"
+            }), 400
+
+        stream = str(data.get('stream', False)).strip().lower() in ('true', '1')
+        if stream and workers > 1:
+            return jsonify({
+                'error': 'stream writes pages in order as they arrive; use workers=1'
+            }), 400
 
         print(f"✅ All required fields present")
         print(f"   JIRA URL: {jira_url}")
@@ -206,43 +364,92 @@ def fetch_jira_data():
                 'available_projects': [{'key': p['key'], 'name': p['name']} for p in projects]
             }), 400
 
-        print(f"Fetching issues with JQL: {jql_query}")
+        # Incremental syncs need a watermark for this project's current export and a stored copy
+        project = project_name or project_key
+        watermark = None
+        if sync_mode == 'incremental':
+            watermark = jira_sync_state.watermark(jira_base_url, project, JIRA_EXPORT_PATH)
+            if watermark is not None and issue_store.partition(client.jira_url, project) is None:
+                watermark = None
+            if watermark is None:
+                print("ℹ️  No watermark for this project's current export - running a full sync")
+                sync_mode = 'full'
+            else:
+                jql_query = client.updated_since_jql(jql_query, watermark)
 
-        # Fetch all issues
-        issues = client.get_all_issues(jql_query)
+        print(f"Fetching issues with JQL: {jql_query}")
 
-        if not issues:
+        # Fetch all issues (only those updated since the watermark when incremental). Streamed
+        # full syncs are written page by page as they arrive; incremental ones are small already
+        # A failed page aborts the sync before anything is written: a partial fetch must not
+        # replace the export or the stored issues, nor move the watermark past unfetched issues
+        streamed = stream and sync_mode == 'full'
+        try:
+            if streamed:
+                issues = client.stream_issues(jql_query)
+            else:
+                issues = client.get_all_issues(jql_query, workers=workers)
+
+            # Export to CSV (upserted by Issue id when incremental)
+            if sync_mode == 'full':
+                exported = client.export_to_csv(issues, JIRA_EXPORT_PATH)
+                if not exported:
+                    return jsonify({
+                        'error': 'No issues found in the specified project',
+                        'jql_query': jql_query
+                    }), 404
+                counts = {'added': exported, 'updated': 0, 'total': exported}
+            else:
+                counts = client.upsert_csv(issues, JIRA_EXPORT_PATH)
+        except JiraFetchError as e:
+            print(f"❌ Fetch aborted, nothing saved: {str(e)}")
             return jsonify({
-                'error': 'No issues found in the specified project',
+                'error': f'{e}. The fetch was aborted and nothing was saved; please retry.',
                 'jql_query': jql_query
-            }), 404
+            }), 502
 
-        print(f"Retrieved {len(issues)} issues")
+        fetched = issues.issues if streamed else len(issues)
+        print(f"Retrieved {fetched} issues")
+
+        # Keep the project's partition of the issue store in step (a stream is gone, so store the CSV)
+        if streamed:
+            issue_store.replace_partition_from_csv(client.jira_url, project, JIRA_EXPORT_PATH)
+        else:
+            client.export_to_store(issues, issue_store, project, replace=(sync_mode == 'full'))
 
-        # Export to CSV
-        client.export_to_csv(issues, JIRA_EXPORT_PATH)
+        latest = issues.latest_updated if streamed else client.latest_updated(issues)
+        if watermark is not None and (latest is None or latest < watermark):
+            latest = watermark
+        if latest is not None:
+            jira_sync_state.record(jira_base_url, project, JIRA_EXPORT_PATH, latest, counts['total'])
 
         # Analyze data
         print(f"Analyzing data with Claude adoption date: {claude_adoption_date}")
-        analyzer = ROIAnalyzer(JIRA_EXPORT_PATH, claude_adoption_date)
+        analyzer = build_analyzer(JIRA_EXPORT_PATH, claude_adoption_date)
 
         # Get metrics
-        summary_metrics = analyzer.get_summary_metrics()
-        time_series_data = analyzer.get_time_series_data()
-        status_breakdown = analyzer.get_status_breakdown()
-        priority_breakdown = analyzer.get_priority_breakdown()
+        results = analyzer.analyze(granularity)
 
-        # Export processed data
+        # Export processed data (a streamed export has no in-memory frame to snapshot; the
+        # dashboard then reads the newer CSV, see jira_data_path)
         analyzer.export_processed_data(PROCESSED_DATA_PATH)
+        if not isinstance(analyzer, StreamingROIAnalyzer):
+            analyzer.export_processed_data(PROCESSED_SNAPSHOT_PATH, format='snapshot')
 
         return jsonify({
             'success': True,
-            'message': f'Successfully fetched and analyzed {len(issues)} issues',
-            'total_issues': len(issues),
-            'summary_metrics': summary_metrics,
-            'time_series_data': time_series_data,
-            'status_breakdown': status_breakdown,
-            'priority_breakdown': priority_breakdown
+            'message': f'Successfully fetched {fetched} issues and analyzed {counts["total"]}',
+            'total_issues': counts['total'],
+            'sync': {
+                'mode': sync_mode,
+                'fetched_issues': fetched,
+                'streamed': streamed,
+                'added_issues': counts['added'],
+                'updated_issues': counts['updated'],
+                'watermark': latest.isoformat() if latest else None
+            },
+            'granularity': granularity,
+            **results
         })
 
     except Exception as e:
@@ -270,32 +477,213 @@ def get_dashboard_data():
 
         # Get query parameters
         claude_adoption_date = request.args.get('claude_adoption_date')
+        granularity = request.args.get('granularity', 'week').strip().lower()
+
+        if not claude_adoption_date:
+            return jsonify({
+                'error': 'claude_adoption_date query parameter is required'
+            }), 400
+
+        if granularity not in ROIAnalyzer.TIME_SERIES_FREQUENCIES:
+            return jsonify({
+                'error': f"Invalid granularity: {granularity}. Must be one of {', '.join(ROIAnalyzer.TIME_SERIES_FREQUENCIES)}"
+            }), 400
+
+        try:
+            adoption_day = parse_date(claude_adoption_date).strftime('%Y-%m-%d')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        data_path = jira_data_path()
+        cache_key = ('dashboard', dataset_fingerprint(data_path), None, adoption_day, granularity)
+        cached = response_cache.get(cache_key)
+
+        if cached is None:
+            # Re-analyze with potentially new adoption date
+            analyzer = build_analyzer(data_path, claude_adoption_date)
+
+            # Get all metrics
+            results = analyzer.analyze(granularity)
+
+            cached = response_cache.put(cache_key, {
+                'success': True,
+                'has_data': True,
+                'granularity': granularity,
+                **results
+            })
+
+        return cached_json_response(cached)
+
+    except Exception as e:
+        print(f"Error in get_dashboard_data: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'trace': traceback.format_exc()
+        }), 500
+
+
+@app.route('/api/project-analysis', methods=['GET'])
+def get_project_analysis():
+    """
+    Get dashboard data for one stored project, aggregated in the issue store
+
+    Query parameters:
+    - project: project name or key as fetched (required)
+    - claude_adoption_date: Claude adoption date (required)
+    - site: JIRA site base URL (optional if only one site has the project)
+    - granularity: time series bucket size (optional, default week)
+    - since, until: created date range, until exclusive (optional)
+    - status, priority, assignee: only issues with this status, priority or
+      assignee (name or account id) (optional)
+    """
+    try:
+        project = request.args.get('project', '').strip()
+        claude_adoption_date = request.args.get('claude_adoption_date')
+        granularity = request.args.get('granularity', 'week').strip().lower()
+
+        if not project or not claude_adoption_date:
+            return jsonify({
+                'error': 'project and claude_adoption_date query parameters are required'
+            }), 400
+
+        if granularity not in ROIAnalyzer.TIME_SERIES_FREQUENCIES:
+            return jsonify({
+                'error': f"Invalid granularity: {granularity}. Must be one of {', '.join(ROIAnalyzer.TIME_SERIES_FREQUENCIES)}"
+            }), 400
+
+        filters = {}
+        try:
+            adoption_day = parse_date(claude_adoption_date).strftime('%Y-%m-%d')
+            for name in ('since', 'until'):
+                if request.args.get(name):
+                    filters[name] = parse_date(request.args[name]).strftime('%Y-%m-%d')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        for name in ('status', 'priority', 'assignee'):
+            if request.args.get(name):
+                filters[name] = request.args[name]
+
+        # Find the project's partition
+        site = request.args.get('site', '').strip().rstrip('/')
+        partitions = [p for p in issue_store.partitions(project) if not site or p['site'] == site]
+        if not partitions:
+            return jsonify({
+                'error': f'No stored issues for project {project}. Please fetch JIRA data first.',
+                'has_data': False,
+                'stored_projects': [{'site': p['site'], 'project': p['project']} for p in issue_store.partitions()]
+            }), 404
+        if len(partitions) > 1:
+            return jsonify({
+                'error': f'Project {project} is stored for several JIRA sites; pass site',
+                'sites': [p['site'] for p in partitions]
+            }), 400
+        partition = partitions[0]
+
+        cache_key = ('project-analysis', partition['site'], project, partition['version'],
+                     adoption_day, granularity,
+                     tuple(sorted(filters.items())))
+        cached = response_cache.get(cache_key)
+
+        if cached is None:
+            analyzer = StoreROIAnalyzer(issue_store, partition['site'], project, claude_adoption_date, **filters)
+            results = analyzer.analyze(granularity)
+
+            cached = response_cache.put(cache_key, {
+                'success': True,
+                'has_data': True,
+                'site': partition['site'],
+                'project': project,
+                'filters': filters,
+                'total_issues': analyzer.source_rows,
+                'granularity': granularity,
+                **results
+            })
+
+        return cached_json_response(cached)
+
+    except Exception as e:
+        print(f"Error in get_project_analysis: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'trace': traceback.format_exc()
+        }), 500
+
+
+@app.route('/api/stored-projects', methods=['GET'])
+def get_stored_projects():
+    """List the (site, project) partitions in the issue store with issue counts and last sync time"""
+    try:
+        return jsonify({
+            'success': True,
+            'projects': issue_store.partitions()
+        })
+
+    except Exception as e:
+        print(f"Error in get_stored_projects: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'trace': traceback.format_exc()
+        }), 500
+
+
+@app.route('/api/adoption-sweep', methods=['GET'])
+def get_adoption_sweep():
+    """
+    Get ROI summary metrics for a range of candidate adoption dates
+
+    Query parameters:
+    - claude_adoption_date: currently selected adoption date (required)
+    - company: 'fintechco' or 'pharmaco' to sweep demo data (optional, defaults to fetched JIRA data)
+    - start, end: candidate date range (optional, defaults to first/last created issue)
+    - step_days: days between candidate dates (optional, default 1)
+    """
+    try:
+        claude_adoption_date = request.args.get('claude_adoption_date')
 
         if not claude_adoption_date:
             return jsonify({
                 'error': 'claude_adoption_date query parameter is required'
             }), 400
 
-        # Re-analyze with potentially new adoption date
-        analyzer = ROIAnalyzer(JIRA_EXPORT_PATH, claude_adoption_date)
+        company = request.args.get('company', '').strip().lower()
+        if not company:
+            data_path = jira_data_path()
+        elif company in ('fintechco', 'pharmaco'):
+            data_path = os.path.join(DATA_DIR, f'{company}_data.csv')
+        else:
+            return jsonify({
+                'error': f'Invalid company: {company}. Must be "fintechco" or "pharmaco"'
+            }), 400
+
+        if not os.path.exists(data_path):
+            return jsonify({
+                'error': 'No data available. Please fetch JIRA data first.',
+                'has_data': False
+            }), 404
+
+        try:
+            step_days = int(request.args.get('step_days', 1))
+        except ValueError:
+            return jsonify({'error': 'step_days must be an integer'}), 400
 
-        # Get all metrics
-        summary_metrics = analyzer.get_summary_metrics()
-        time_series_data = analyzer.get_time_series_data()
-        status_breakdown = analyzer.get_status_breakdown()
-        priority_breakdown = analyzer.get_priority_breakdown()
+        analyzer = build_analyzer(data_path, claude_adoption_date)
+        sweep = analyzer.get_adoption_sweep(
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            step_days=step_days
+        )
 
         return jsonify({
             'success': True,
             'has_data': True,
-            'summary_metrics': summary_metrics,
-            'time_series_data': time_series_data,
-            'status_breakdown': status_breakdown,
-            'priority_breakdown': priority_breakdown
+            **sweep
         })
 
     except Exception as e:
-        print(f"Error in get_dashboard_data: {str(e)}")
+        print(f"Error in get_adoption_sweep: {str(e)}")
         print(traceback.format_exc())
         return jsonify({
             'error': str(e),
@@ -349,20 +737,22 @@ def get_projects():
 @app.route('/api/usage-data', methods=['GET'])
 def get_usage_data():
     """
-    Get Claude Code API usage data for analytics
+    Get Claude Code API usage records for analytics
 
     Query parameters:
     - company: 'fintechco' or 'pharmaco' (required)
-
-    Returns processed usage metrics including:
-    - Time series data (lines of code, commits, PRs)
-    - Organization penetration stats
-    - User leaderboard
-    - Active users trends
+    - since: Only records on or after this date (YYYY-MM-DD, optional)
+    - until: Only records before this date (YYYY-MM-DD, optional)
+    - actor: Only this actor's records (email address, optional)
+    - organization_id: Only this organization's records (optional)
+    - limit: Page size (optional; all matching records when omitted)
+    - cursor: next_cursor from the previous page (optional)
+
+    Returns the matching raw usage records in date order, with total_matching
+    and next_cursor (null on the last page). Records are located through an
+    index built once per file version, so only the requested records are read.
     """
     try:
-        import json
-
         # Get company parameter from query string
         company = request.args.get('company', '').strip().lower()
 
@@ -372,16 +762,144 @@ def get_usage_data():
             }), 400
 
         # Select the correct data file based on company
-        if company == 'fintechco':
-            data_filename = 'fintechco_api_usage_data.json'
-        elif company == 'pharmaco':
-            data_filename = 'pharmaco_api_usage_data.json'
+        if company not in USAGE_DATA_FILES:
+            return jsonify({
+                'error': f'Invalid company: {company}. Must be "fintechco" or "pharmaco"'
+            }), 400
+
+        try:
+            since = request.args.get('since', '').strip() or None
+            until = request.args.get('until', '').strip() or None
+            since = parse_date(since).strftime('%Y-%m-%d') if since else None
+            until = parse_date(until).strftime('%Y-%m-%d') if until else None
+            limit = request.args.get('limit')
+            limit = int(limit) if limit else None
+        except ValueError as e:
+            return jsonify({'error': f'Invalid query parameter: {e}'}), 400
+
+        if limit is not None and limit < 1:
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+
+        API_DATA_PATH = usage_data_path(company)
+
+        if not os.path.exists(API_DATA_PATH):
+            return jsonify({
+                'error': 'API usage data not found',
+                'expected_path': API_DATA_PATH,
+                'company': company
+            }), 404
+
+        cache_key = ('usage-data', dataset_fingerprint(API_DATA_PATH), company, since, until,
+                     request.args.get('actor') or None, request.args.get('organization_id') or None,
+                     request.args.get('cursor') or None, limit)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached_json_response(cached)
+
+        index = load_usage_index(API_DATA_PATH)
+        rows = index.select(
+            since=since,
+            until=until,
+            actor=request.args.get('actor') or None,
+            organization_id=request.args.get('organization_id') or None
+        )
+
+        try:
+            page_rows, next_cursor = index.page(rows, request.args.get('cursor') or None, limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        print(f"📂 Serving {len(page_rows)} of {len(rows)} matching usage records for {company}")
+
+        # Open the file and look up every span now, so problems are reported before the response starts
+        try:
+            usage_file = index.open_file()
+        except UsageFileChangedError as e:
+            return jsonify({'error': f'{e}; please retry'}), 409
+        records = index.iter_raw(page_rows, usage_file)
+
+        def generate():
+            # Each record's JSON text is copied from the file as-is, one at a time. If the
+            # file changes mid-read this raises before the closing bracket, so a streamed
+            # body is cut off as invalid JSON instead of ending as a plausible partial page
+            with usage_file:
+                yield ('{"success": true, "company": ' + json.dumps(company) + ', "data": [').encode('utf-8')
+                for i, raw in enumerate(records):
+                    yield b',' + raw if i else raw
+                yield ('], "metadata": ' + json.dumps(index.metadata)
+                       + ', "total_matching": ' + str(len(rows))
+                       + ', "next_cursor": ' + json.dumps(next_cursor) + '}').encode('utf-8')
+
+        # Pages that fit are serialized and compressed once per file version
+        if int(index.lengths[page_rows].sum()) <= USAGE_DATA_CACHE_BYTES:
+            try:
+                body = b''.join(generate())
+            except UsageFileChangedError as e:
+                return jsonify({'error': f'{e}; please retry'}), 409
+            return cached_json_response(response_cache.put_body(cache_key, body))
+
+        # Larger responses stream straight from the file, gzipped on the fly if the client accepts it
+        if request.accept_encodings.quality('gzip'):
+            response = Response(gzip_chunks(generate()), mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
         else:
+            response = Response(generate(), mimetype='application/json')
+        # The file is closed even if the body is never read (HEAD requests, dropped clients)
+        response.call_on_close(usage_file.close)
+        response.vary.add('Accept-Encoding')
+        return response
+
+    except Exception as e:
+        print(f"Error in get_usage_data: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'trace': traceback.format_exc()
+        }), 500
+
+
+@app.route('/api/usage-metrics', methods=['GET'])
+def get_usage_metrics():
+    """
+    Get aggregated Claude Code usage metrics for the usage dashboard
+
+    Query parameters:
+    - company: 'fintechco' or 'pharmaco' (required)
+    - start_date: Only count usage on or after this date (YYYY-MM-DD, optional)
+    - end_date: Only count usage before this date (YYYY-MM-DD, optional)
+    - approximate: 'true' to estimate unique and daily active users by merging the
+      rollups' HyperLogLog sketches (within about DISTINCT_ERROR_RATE) (optional)
+
+    Returns the same series and tables the dashboard used to compute from
+    /api/usage-data, without the raw records:
+    - Summary totals and estimated savings
+    - Daily lines of code, PRs/commits and active users (weekdays only)
+    - Organization penetration
+    - Top users by sessions
+    """
+    try:
+        company = request.args.get('company', '').strip().lower()
+        start_date = request.args.get('start_date', '').strip() or None
+        end_date = request.args.get('end_date', '').strip() or None
+        approximate = request.args.get('approximate', '').strip().lower() == 'true'
+
+        if not company:
+            return jsonify({
+                'error': 'Missing required query parameter: company'
+            }), 400
+
+        if company not in USAGE_DATA_FILES:
             return jsonify({
                 'error': f'Invalid company: {company}. Must be "fintechco" or "pharmaco"'
             }), 400
 
-        API_DATA_PATH = os.path.join(DATA_DIR, data_filename)
+        try:
+            start_date = parse_date(start_date).strftime('%Y-%m-%d') if start_date else None
+            end_date = parse_date(end_date).strftime('%Y-%m-%d') if end_date else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        API_DATA_PATH = usage_data_path(company)
 
         if not os.path.exists(API_DATA_PATH):
             return jsonify({
@@ -390,21 +908,432 @@ def get_usage_data():
                 'company': company
             }), 404
 
-        print(f"📂 Loading API usage data for {company} from: {API_DATA_PATH}")
+        cache_key = ('usage-metrics', dataset_fingerprint(API_DATA_PATH), company, start_date, end_date, approximate)
+        cached = response_cache.get(cache_key)
+
+        if cached is None:
+            # Aggregations read the daily rollups, which only re-aggregate days added since the last sync
+            sync_usage_rollups(company, API_DATA_PATH)
+            analyzer = UsageAnalyzer.from_rollups(usage_rollups, company, start_date, end_date, approximate)
 
-        with open(API_DATA_PATH, 'r', encoding='utf-8') as f:
-            usage_data = json.load(f)
+            cached = response_cache.put(cache_key, {
+                'success': True,
+                'company': company,
+                'start_date': start_date,
+                'end_date': end_date,
+                'distinct_error_rate': DISTINCT_ERROR_RATE if approximate else None,
+                'total_records': usage_rollups.source_state(company)['records'],
+                **analyzer.analyze()
+            })
+
+        return cached_json_response(cached)
+
+    except Exception as e:
+        print(f"Error in get_usage_metrics: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'trace': traceback.format_exc()
+        }), 500
+
+
+@app.route('/api/usage-models', methods=['GET'])
+def get_usage_models():
+    """
+    Get per-model token and cost analytics
+
+    Query parameters:
+    - company: 'fintechco' or 'pharmaco' (required)
+    - start_date: Only count usage on or after this date (YYYY-MM-DD, optional)
+    - end_date: Only count usage before this date (YYYY-MM-DD, optional)
+
+    Returns cost, token categories and cache hit ratio (cache reads / prompt
+    tokens) overall, per model, per day and per organization, plus cost per
+    line of code, commit and PR for the day and organization breakdowns.
+    """
+    try:
+        company = request.args.get('company', '').strip().lower()
+        start_date = request.args.get('start_date', '').strip() or None
+        end_date = request.args.get('end_date', '').strip() or None
+
+        if not company:
+            return jsonify({
+                'error': 'Missing required query parameter: company'
+            }), 400
+
+        if company not in USAGE_DATA_FILES:
+            return jsonify({
+                'error': f'Invalid company: {company}. Must be "fintechco" or "pharmaco"'
+            }), 400
+
+        try:
+            start_date = parse_date(start_date).strftime('%Y-%m-%d') if start_date else None
+            end_date = parse_date(end_date).strftime('%Y-%m-%d') if end_date else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        API_DATA_PATH = usage_data_path(company)
+
+        if not os.path.exists(API_DATA_PATH):
+            return jsonify({
+                'error': 'API usage data not found',
+                'expected_path': API_DATA_PATH,
+                'company': company
+            }), 404
+
+        cache_key = ('usage-models', dataset_fingerprint(API_DATA_PATH), company, start_date, end_date)
+        cached = response_cache.get(cache_key)
+
+        if cached is None:
+            analyzer = ModelUsageAnalyzer(load_usage_store(API_DATA_PATH), start_date, end_date)
+
+            cached = response_cache.put(cache_key, {
+                'success': True,
+                'company': company,
+                'start_date': start_date,
+                'end_date': end_date,
+                **analyzer.analyze()
+            })
+
+        return cached_json_response(cached)
+
+    except Exception as e:
+        print(f"Error in get_usage_models: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'trace': traceback.format_exc()
+        }), 500
+
+@app.route('/api/usage-rollups', methods=['GET'])
+def get_usage_rollups():
+    """
+    Get summed daily usage rollups
+
+    Query parameters:
+    - company: 'fintechco' or 'pharmaco' (required)
+    - group_by: Comma-separated columns from day, organization_id, actor, model (optional)
+    - since: First day included (YYYY-MM-DD, optional)
+    - until: First day excluded (YYYY-MM-DD, optional)
+    - organization_id: Only this organization (optional)
+    - actor: Only this actor's usage (email address, optional)
+
+    Returns totals of records, sessions, commits, pull requests, lines added and
+    removed, token categories and estimated cost per group (model groups carry
+    the token and cost totals only).
+    """
+    try:
+        company = request.args.get('company', '').strip().lower()
+
+        if not company:
+            return jsonify({
+                'error': 'Missing required query parameter: company'
+            }), 400
+
+        if company not in USAGE_DATA_FILES:
+            return jsonify({
+                'error': f'Invalid company: {company}. Must be "fintechco" or "pharmaco"'
+            }), 400
+
+        group_by = [column.strip() for column in request.args.get('group_by', '').split(',') if column.strip()]
+        unknown = [column for column in group_by if column not in UsageRollups.GROUP_COLUMNS]
+        if unknown:
+            return jsonify({
+                'error': f"Invalid group_by: {', '.join(unknown)}. Must be from {', '.join(UsageRollups.GROUP_COLUMNS)}"
+            }), 400
+
+        try:
+            since = request.args.get('since', '').strip() or None
+            until = request.args.get('until', '').strip() or None
+            since = parse_date(since).strftime('%Y-%m-%d') if since else None
+            until = parse_date(until).strftime('%Y-%m-%d') if until else None
+        except ValueError as e:
+            return jsonify({'error': f'Invalid query parameter: {e}'}), 400
+
+        API_DATA_PATH = usage_data_path(company)
+
+        if not os.path.exists(API_DATA_PATH):
+            return jsonify({
+                'error': 'API usage data not found',
+                'expected_path': API_DATA_PATH,
+                'company': company
+            }), 404
+
+        sync_usage_rollups(company, API_DATA_PATH)
+        totals = usage_rollups.totals(
+            company,
+            group_by=group_by,
+            since=since,
+            until=until,
+            organization_id=request.args.get('organization_id') or None,
+            actor=request.args.get('actor') or None
+        )
 
-        # Return the raw data - frontend will process it
         return jsonify({
             'success': True,
             'company': company,
-            'data': usage_data.get('data', []),
-            'metadata': usage_data.get('metadata', {})
+            'group_by': group_by,
+            'watermark': usage_rollups.source_state(company)['watermark'],
+            'totals': totals
         })
 
     except Exception as e:
-        print(f"Error in get_usage_data: {str(e)}")
+        print(f"Error in get_usage_rollups: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'trace': traceback.format_exc()
+        }), 500
+
+
+@app.route('/api/engineer-roi', methods=['GET'])
+def get_engineer_roi():
+    """
+    Get per-engineer cycle times joined with their Claude Code usage
+
+    Query parameters:
+    - claude_adoption_date: Date Claude Code was adopted (required)
+    - company: 'fintechco' or 'pharmaco' - whose usage data to join (required)
+    - source: 'jira', the fetched JIRA export (optional; the only source with assignees -
+      the demo CSVs have none, so 'demo' is rejected rather than matching no one)
+
+    JIRA assignees are matched to usage actors through data/engineer_identities.json
+    when present, otherwise by email or by the name an email spells. Usage is
+    counted from the adoption date on.
+    """
+    try:
+        claude_adoption_date = request.args.get('claude_adoption_date')
+        company = request.args.get('company', '').strip().lower()
+        source = request.args.get('source', 'jira').strip().lower()
+
+        if not claude_adoption_date:
+            return jsonify({
+                'error': 'claude_adoption_date query parameter is required'
+            }), 400
+
+        if company not in USAGE_DATA_FILES:
+            return jsonify({
+                'error': f'Invalid company: {company}. Must be "fintechco" or "pharmaco"'
+            }), 400
+
+        if source == 'demo':
+            return jsonify({
+                'error': 'The demo data has no assignees, so it cannot be joined per engineer. Fetch JIRA data and use source=jira'
+            }), 400
+
+        if source != 'jira':
+            return jsonify({
+                'error': f'Invalid source: {source}. Must be "jira"'
+            }), 400
+
+        try:
+            adoption_day = parse_date(claude_adoption_date).strftime('%Y-%m-%d')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # The CSV keeps the assignee columns (lean snapshots drop them)
+        data_path = JIRA_EXPORT_PATH
+        API_DATA_PATH = usage_data_path(company)
+
+        if not os.path.exists(data_path):
+            return jsonify({
+                'error': 'No data available. Please fetch JIRA data first.',
+                'has_data': False
+            }), 404
+
+        if not os.path.exists(API_DATA_PATH):
+            return jsonify({
+                'error': 'API usage data not found',
+                'expected_path': API_DATA_PATH,
+                'company': company
+            }), 404
+
+        identities = load_engineer_identities(ENGINEER_IDENTITIES_PATH)
+
+        cycle_times = ROIAnalyzer(data_path, claude_adoption_date).get_engineer_cycle_times()
+
+        sync_usage_rollups(company, API_DATA_PATH)
+        index = EngineerUsageIndex(
+            usage_rollups.totals(company, group_by=['actor'], since=adoption_day),
+            identities
+        )
+        result = join_engineer_usage(cycle_times, index)
+        print(f"👥 Matched {result['matched_engineers']} of {len(cycle_times)} engineers to {company} usage")
+
+        return jsonify({
+            'success': True,
+            'company': company,
+            'source': source,
+            'claude_adoption_date': adoption_day,
+            **result
+        })
+
+    except Exception as e:
+        print(f"Error in get_engineer_roi: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'trace': traceback.format_exc()
+        }), 500
+
+@app.route('/api/usage-leaderboard', methods=['GET'])
+def get_usage_leaderboard():
+    """
+    Get the top engineers by a usage metric
+
+    Query parameters:
+    - company: 'fintechco' or 'pharmaco' (required)
+    - metric: 'loc' (default), 'commits', 'prs', 'sessions' or 'cost'
+    - k: Number of engineers to return (default 10)
+    - since: First day included (YYYY-MM-DD, optional)
+    - until: First day excluded (YYYY-MM-DD, optional)
+    - organization_id: Only this organization (optional)
+
+    Ranks the per-actor rollup totals with a bounded heap (O(n log k)), and
+    returns each leader's sessions, commits, PRs, lines and cost.
+    """
+    try:
+        company = request.args.get('company', '').strip().lower()
+        metric = request.args.get('metric', 'loc').strip().lower()
+
+        if not company:
+            return jsonify({
+                'error': 'Missing required query parameter: company'
+            }), 400
+
+        if company not in USAGE_DATA_FILES:
+            return jsonify({
+                'error': f'Invalid company: {company}. Must be "fintechco" or "pharmaco"'
+            }), 400
+
+        if metric not in UsageRollups.LEADERBOARD_METRICS:
+            return jsonify({
+                'error': f"Invalid metric: {metric}. Must be one of {', '.join(UsageRollups.LEADERBOARD_METRICS)}"
+            }), 400
+
+        try:
+            k = int(request.args.get('k', '10'))
+            if k < 1:
+                raise ValueError(f'k must be a positive integer, got {k}')
+            since = request.args.get('since', '').strip() or None
+            until = request.args.get('until', '').strip() or None
+            since = parse_date(since).strftime('%Y-%m-%d') if since else None
+            until = parse_date(until).strftime('%Y-%m-%d') if until else None
+        except ValueError as e:
+            return jsonify({'error': f'Invalid query parameter: {e}'}), 400
+
+        API_DATA_PATH = usage_data_path(company)
+
+        if not os.path.exists(API_DATA_PATH):
+            return jsonify({
+                'error': 'API usage data not found',
+                'expected_path': API_DATA_PATH,
+                'company': company
+            }), 404
+
+        sync_usage_rollups(company, API_DATA_PATH)
+        leaderboard = usage_rollups.leaderboard(
+            company,
+            metric=metric,
+            k=k,
+            since=since,
+            until=until,
+            organization_id=request.args.get('organization_id') or None
+        )
+
+        return jsonify({
+            'success': True,
+            'company': company,
+            'metric': metric,
+            'k': k,
+            **leaderboard
+        })
+
+    except Exception as e:
+        print(f"Error in get_usage_leaderboard: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'trace': traceback.format_exc()
+        }), 500
+
+
+@app.route('/api/usage-active-users', methods=['GET'])
+def get_usage_active_users():
+    """
+    Get distinct active users per day, week or month
+
+    Query parameters:
+    - company: 'fintechco' or 'pharmaco' (required)
+    - granularity: 'day' (default), 'week' or 'month'
+    - since: First day included (YYYY-MM-DD, optional)
+    - until: First day excluded (YYYY-MM-DD, optional)
+    - organization_id: Only this organization (optional)
+    - by_organization: 'true' to count each organization separately (optional)
+    - approximate: 'true' to merge the daily HyperLogLog sketches instead of
+      counting exact distinct users (optional)
+
+    Approximate counts are within about error_rate (relative standard error)
+    of the exact ones.
+    """
+    try:
+        company = request.args.get('company', '').strip().lower()
+        granularity = request.args.get('granularity', 'day').strip().lower()
+        by_organization = request.args.get('by_organization', '').strip().lower() == 'true'
+        approximate = request.args.get('approximate', '').strip().lower() == 'true'
+
+        if not company:
+            return jsonify({
+                'error': 'Missing required query parameter: company'
+            }), 400
+
+        if company not in USAGE_DATA_FILES:
+            return jsonify({
+                'error': f'Invalid company: {company}. Must be "fintechco" or "pharmaco"'
+            }), 400
+
+        try:
+            since = request.args.get('since', '').strip() or None
+            until = request.args.get('until', '').strip() or None
+            since = parse_date(since).strftime('%Y-%m-%d') if since else None
+            until = parse_date(until).strftime('%Y-%m-%d') if until else None
+        except ValueError as e:
+            return jsonify({'error': f'Invalid query parameter: {e}'}), 400
+
+        API_DATA_PATH = usage_data_path(company)
+
+        if not os.path.exists(API_DATA_PATH):
+            return jsonify({
+                'error': 'API usage data not found',
+                'expected_path': API_DATA_PATH,
+                'company': company
+            }), 404
+
+        sync_usage_rollups(company, API_DATA_PATH)
+        try:
+            active_users = usage_rollups.active_users(
+                company,
+                granularity=granularity,
+                since=since,
+                until=until,
+                organization_id=request.args.get('organization_id') or None,
+                by_organization=by_organization,
+                approximate=approximate
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify({
+            'success': True,
+            'company': company,
+            'granularity': granularity,
+            'approximate': approximate,
+            'error_rate': DISTINCT_ERROR_RATE if approximate else 0,
+            'active_users': active_users
+        })
+
+    except Exception as e:
+        print(f"Error in get_usage_active_users: {str(e)}")
         print(traceback.format_exc())
         return jsonify({
             'error': str(e),
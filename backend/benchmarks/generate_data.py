@@ -0,0 +1,258 @@
+"""
+Synthetic data generator for backend benchmarks
+Produces JIRA exports in the JiraAPIClient.export_to_csv column layout, raw
+JIRA API issues, and Claude Code usage data in the *_api_usage_data.json schema
+
+Usage:
+    python benchmarks/generate_data.py --issues 1000000 --usage 500000 --out /tmp/roi-bench
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+# Same column order as JiraAPIClient.export_to_csv
+EXPORT_COLUMNS = [
+    'Issue Type', 'Issue key', 'Issue id', 'Summary', 'Description', 'Assignee', 'Assignee Id',
+    'Reporter', 'Reporter Id', 'Priority', 'Status', 'Resolution', 'Created', 'Updated',
+    'Due date', 'Custom field (Start date)'
+]
+
+ISSUE_TYPES = ['Task', 'Story', 'Bug', 'Sub-task']
+PRIORITIES = ['Highest', 'High', 'Medium', 'Low', 'Lowest']
+STATUSES = ['Done', 'In Progress', 'To Do', 'In Review']
+PROJECT_KEYS = ['FT', 'ALT', 'LEG', 'PAY', 'RISK']
+
+START_DATE = datetime(2025, 1, 1)
+HISTORY_DAYS = 300
+
+# Usage data
+ORG_DOMAINS = [
+    'platform', 'backend', 'frontend', 'engineering',   # Software Engineers
+    'datascience', 'ml', 'research',                    # Data Scientists
+    'analytics', 'insights', 'reporting'                # Data Analysts
+]
+MODELS = ['claude-sonnet-4-20250514', 'claude-3-5-haiku-20241022', 'claude-opus-4-20250514']
+TERMINALS = ['Terminal.app', 'VS Code Terminal', 'iTerm.app', 'Warp', 'Jupyter Terminal']
+TOOLS = ['edit_tool', 'multi_edit_tool', 'notebook_edit_tool', 'write_tool']
+
+CHUNK_ROWS = 250000
+USAGE_BLOCK = 10000
+
+
+def _jira_dates(days: np.ndarray) -> pd.Series:
+    """Day offsets -> JIRA 'dd/Mon/yy hh:mm AM' strings"""
+    return (pd.Timestamp(START_DATE) + pd.to_timedelta(days, unit='D')).strftime('%d/%b/%y %I:%M %p')
+
+
+def generate_jira_export(n_issues: int, path: str, seed: int = 0, n_assignees: int = 200):
+    """
+    Write a synthetic JIRA export CSV
+
+    Rows are generated and written in chunks, so memory stays flat at any size.
+
+    Args:
+        n_issues: Number of issues
+        path: Output CSV path
+        seed: Random seed
+        n_assignees: Number of distinct assignees
+    """
+    rng = np.random.default_rng(seed)
+    assignees = np.array([f'Engineer {i:04d}' for i in range(n_assignees)])
+    assignee_ids = np.array([f'acct-{i:06d}' for i in range(n_assignees)])
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for chunk_start in range(0, n_issues, CHUNK_ROWS):
+            n = min(CHUNK_ROWS, n_issues - chunk_start)
+            ids = np.arange(chunk_start, chunk_start + n) + 10001
+            projects = rng.choice(PROJECT_KEYS, n)
+
+            created = rng.integers(0, HISTORY_DAYS, n)
+            start = created + rng.integers(0, 4, n)
+            # Durations shrink over time so pre/post adoption periods differ
+            duration = np.maximum(1, rng.normal(9 - 5 * created / HISTORY_DAYS, 3, n)).astype(int)
+            due = start + duration
+            updated = np.minimum(due, HISTORY_DAYS + 30) - rng.integers(0, 2, n)
+            assignee_idx = rng.integers(0, n_assignees, n)
+
+            chunk = pd.DataFrame({
+                'Issue Type': rng.choice(ISSUE_TYPES, n, p=[0.5, 0.25, 0.2, 0.05]),
+                'Issue key': pd.Series(projects).str.cat(ids.astype(str), sep='-'),
+                'Issue id': ids,
+                'Summary': 'Synthetic benchmark issue',
+                'Description': 'Generated by benchmarks/generate_data.py',
+                'Assignee': assignees[assignee_idx],
+                'Assignee Id': assignee_ids[assignee_idx],
+                'Reporter': 'Benchmark Reporter',
+                'Reporter Id': 'acct-reporter',
+                'Priority': rng.choice(PRIORITIES, n, p=[0.05, 0.2, 0.45, 0.25, 0.05]),
+                'Status': rng.choice(STATUSES, n, p=[0.7, 0.1, 0.15, 0.05]),
+                'Resolution': '',
+                'Created': _jira_dates(created),
+                'Updated': _jira_dates(updated),
+                'Due date': _jira_dates(due),
+                'Custom field (Start date)': _jira_dates(start),
+            }, columns=EXPORT_COLUMNS)
+            chunk.loc[chunk['Status'] == 'Done', 'Resolution'] = 'Done'
+
+            chunk.to_csv(f, index=False, header=(chunk_start == 0))
+
+    print(f"✅ Wrote {n_issues} synthetic issues to {path}")
+
+
+def generate_raw_issues(n_issues: int, seed: int = 0) -> Iterator[Dict]:
+    """
+    Yield issues shaped like JIRA REST API v3 search results
+
+    Suitable as input for JiraAPIClient.export_to_csv.
+    """
+    rng = np.random.default_rng(seed)
+    for i in range(n_issues):
+        created = START_DATE + timedelta(days=int(rng.integers(0, HISTORY_DAYS)))
+        start = created + timedelta(days=int(rng.integers(0, 4)))
+        due = start + timedelta(days=int(rng.integers(1, 15)))
+        status = STATUSES[int(rng.integers(0, len(STATUSES)))]
+        assignee = int(rng.integers(0, 200))
+
+        yield {
+            'id': str(10001 + i),
+            'key': f'FT-{10001 + i}',
+            'fields': {
+                'issuetype': {'name': ISSUE_TYPES[i % len(ISSUE_TYPES)]},
+                'summary': 'Synthetic benchmark issue',
+                'description': 'Generated by benchmarks/generate_data.py',
+                'assignee': {'displayName': f'Engineer {assignee:04d}', 'accountId': f'acct-{assignee:06d}'},
+                'reporter': {'displayName': 'Benchmark Reporter', 'accountId': 'acct-reporter'},
+                'priority': {'name': PRIORITIES[i % len(PRIORITIES)]},
+                'status': {'name': status},
+                'resolution': {'name': 'Done'} if status == 'Done' else None,
+                'created': created.strftime('%Y-%m-%dT%H:%M:%S.000+0000'),
+                'updated': due.strftime('%Y-%m-%dT%H:%M:%S.000+0000'),
+                'duedate': due.strftime('%Y-%m-%d'),
+                'customfield_10015': start.strftime('%Y-%m-%d'),
+            }
+        }
+
+
+def _usage_users(n_users: int, company: str) -> List[str]:
+    """Synthetic actor emails spread over the org domains"""
+    return [f'user{i:05d}@{ORG_DOMAINS[i % len(ORG_DOMAINS)]}.{company}.com' for i in range(n_users)]
+
+
+def generate_usage_records(n_records: int, seed: int = 0, company: str = 'benchco',
+                           n_users: int = None, n_orgs: int = 3) -> Iterator[Dict]:
+    """
+    Yield usage records in the *_api_usage_data.json schema, ordered by date
+
+    Args:
+        n_records: Number of records
+        seed: Random seed
+        company: Used in actor email domains
+        n_users: Distinct actors (defaults to about one record per user per day)
+        n_orgs: Distinct organization ids
+    """
+    rng = np.random.default_rng(seed)
+    n_users = n_users or max(50, n_records // HISTORY_DAYS)
+    users = _usage_users(n_users, company)
+    orgs = [f'00000000-0000-4000-8000-{i:012d}' for i in range(n_orgs)]
+
+    per_day = max(1, n_records // HISTORY_DAYS)
+    n_models = len(MODELS)
+    n_tools = len(TOOLS)
+
+    # Random values are drawn in blocks; per-record rng calls dominate otherwise
+    for block_start in range(0, n_records, USAGE_BLOCK):
+        n = min(USAGE_BLOCK, n_records - block_start)
+        user = rng.integers(0, n_users, n)
+        model_count = rng.integers(1, n_models + 1, n)
+        core = rng.integers(0, [10, 600, 150, 7, 3], (n, 5))
+        tokens = rng.integers(0, [500, 2000, 4900, 2950], (n, n_models, 4)) + [0, 0, 100, 50]
+        cost = np.round(rng.random((n, n_models)) * 2, 2)
+        tool_counts = rng.integers(0, [5, 2], (n, n_tools, 2))
+
+        for j in range(n):
+            i = block_start + j
+            day = min(i // per_day, HISTORY_DAYS - 1)
+            u = int(user[j])
+
+            yield {
+                'actor': {'email_address': users[u], 'type': 'user_actor'},
+                'core_metrics': {
+                    'commits_by_claude_code': int(core[j, 0]),
+                    'lines_of_code': {'added': int(core[j, 1]), 'removed': int(core[j, 2])},
+                    'num_sessions': int(core[j, 3]) + 1,
+                    'pull_requests_by_claude_code': int(core[j, 4]),
+                },
+                'customer_type': 'api',
+                'date': (START_DATE + timedelta(days=day)).strftime('%Y-%m-%dT00:00:00Z'),
+                'model_breakdown': [
+                    {
+                        'estimated_cost': {'amount': float(cost[j, m]), 'currency': 'USD'},
+                        'model': MODELS[m],
+                        'tokens': {
+                            'cache_creation': int(tokens[j, m, 0]),
+                            'cache_read': int(tokens[j, m, 1]),
+                            'input': int(tokens[j, m, 2]),
+                            'output': int(tokens[j, m, 3]),
+                        }
+                    }
+                    for m in range(int(model_count[j]))
+                ],
+                'organization_id': orgs[u % n_orgs],
+                'subscription_type': 'enterprise',
+                'terminal_type': TERMINALS[u % len(TERMINALS)],
+                'tool_actions': {
+                    tool: {'accepted': int(tool_counts[j, t, 0]), 'rejected': int(tool_counts[j, t, 1])}
+                    for t, tool in enumerate(TOOLS)
+                },
+            }
+
+
+def generate_usage_data(n_records: int, path: str, seed: int = 0, company: str = 'benchco'):
+    """
+    Write a synthetic usage JSON file ({"data": [...], "metadata": {...}})
+
+    Records are written one at a time, so memory stays flat at any size.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"data": [\n')
+        for i, record in enumerate(generate_usage_records(n_records, seed=seed, company=company)):
+            if i:
+                f.write(',\n')
+            f.write(json.dumps(record))
+        f.write('\n], "has_more": false, "next_page": null, "metadata": ')
+        json.dump({
+            'total_records': n_records,
+            'date_range': {
+                'start': START_DATE.strftime('%Y-%m-%d'),
+                'end': (START_DATE + timedelta(days=HISTORY_DAYS - 1)).strftime('%Y-%m-%d')
+            },
+            'synthetic': True
+        }, f)
+        f.write('}\n')
+
+    print(f"✅ Wrote {n_records} synthetic usage records to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic JIRA and usage data for benchmarks')
+    parser.add_argument('--issues', type=int, default=10000, help='Number of JIRA issues (0 to skip)')
+    parser.add_argument('--usage', type=int, default=10000, help='Number of usage records (0 to skip)')
+    parser.add_argument('--out', default='bench_data', help='Output directory')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    if args.issues:
+        generate_jira_export(args.issues, os.path.join(args.out, f'jira_export_{args.issues}.csv'), seed=args.seed)
+    if args.usage:
+        generate_usage_data(args.usage, os.path.join(args.out, f'usage_{args.usage}.json'), seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
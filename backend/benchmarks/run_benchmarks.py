@@ -0,0 +1,260 @@
+"""
+Benchmark suite for the backend
+Times ROIAnalyzer, JiraAPIClient.export_to_csv and the Flask endpoints on
+synthetic data, and reports throughput and peak memory
+
+Usage (from backend/):
+    python benchmarks/run_benchmarks.py --sizes 10000 100000 1000000 --usage-sizes 10000 100000
+    python benchmarks/run_benchmarks.py --json results.json   # keep results to compare runs
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import app as app_module  # noqa: E402
+from data_analyzer import ROIAnalyzer, clear_dataset_cache  # noqa: E402
+from issue_store import IssueStore  # noqa: E402
+from generate_data import generate_jira_export, generate_raw_issues, generate_usage_data  # noqa: E402
+from jira_api_client import JiraAPIClient  # noqa: E402
+from store_analyzer import StoreROIAnalyzer  # noqa: E402
+from streaming_analyzer import StreamingROIAnalyzer  # noqa: E402
+
+ADOPTION_DATE = '2025-06-01'
+
+
+def measure(fn: Callable[[], Any], repeat: int, trace_memory: bool) -> Dict[str, float]:
+    """
+    Time fn (best of repeat runs) and optionally measure its peak traced memory
+
+    The code under test prints progress, so stdout is silenced while it runs.
+    """
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+
+    peak_bytes = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {'seconds': min(times), 'peak_bytes': peak_bytes}
+
+
+class BenchmarkRunner:
+    """Runs benchmarks and collects one result row per (benchmark, size)"""
+
+    def __init__(self, repeat: int, trace_memory: bool):
+        self.repeat = repeat
+        self.trace_memory = trace_memory
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self, name: str, records: int, fn: Callable[[], Any], setup: Callable[[], Any] = None):
+        """Benchmark fn; setup (if any) runs before every call and isn't timed"""
+        if setup is not None:
+            def timed():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    setup()
+                    # Only fn is inside the timed section
+                    start = time.perf_counter()
+                    fn()
+                    return time.perf_counter() - start
+
+            seconds = min(timed() for _ in range(self.repeat))
+            peak = measure(lambda: (setup(), fn()), 1, self.trace_memory)['peak_bytes']
+            result = {'seconds': seconds, 'peak_bytes': peak}
+        else:
+            result = measure(fn, self.repeat, self.trace_memory)
+
+        row = {
+            'benchmark': name,
+            'records': records,
+            'seconds': round(result['seconds'], 6),
+            'records_per_sec': round(records / result['seconds']) if result['seconds'] > 0 else None,
+            'peak_mb': round(result['peak_bytes'] / 1024 / 1024, 2) if result['peak_bytes'] is not None else None
+        }
+        self.results.append(row)
+        self._print_row(row)
+
+    @staticmethod
+    def _print_row(row: Dict[str, Any]):
+        peak = f"{row['peak_mb']:>10.2f}" if row['peak_mb'] is not None else f"{'-':>10}"
+        rate = f"{row['records_per_sec']:>14,}" if row['records_per_sec'] is not None else f"{'-':>14}"
+        print(f"  {row['benchmark']:<42} {row['records']:>10,} {row['seconds']:>10.4f} {rate} {peak}")
+
+
+def bench_analyzer(runner: BenchmarkRunner, csv_path: str, n: int):
+    """ROIAnalyzer construction and every metric method"""
+    runner.run('ROIAnalyzer() cold', n, lambda: ROIAnalyzer(csv_path, ADOPTION_DATE), setup=clear_dataset_cache)
+    runner.run('ROIAnalyzer(lean=True) cold', n, lambda: ROIAnalyzer(csv_path, ADOPTION_DATE, lean=True),
+               setup=clear_dataset_cache)
+    runner.run('ROIAnalyzer() cached dataset', n, lambda: ROIAnalyzer(csv_path, ADOPTION_DATE))
+
+    analyzer = ROIAnalyzer(csv_path, ADOPTION_DATE)
+    runner.run('get_summary_metrics', n, analyzer.get_summary_metrics)
+    runner.run('get_time_series_data', n, analyzer.get_time_series_data)
+    runner.run('get_status_breakdown', n, analyzer.get_status_breakdown)
+    runner.run('get_priority_breakdown', n, analyzer.get_priority_breakdown)
+    runner.run('analyze', n, analyzer.analyze)
+    runner.run('get_adoption_sweep (weekly)', n, lambda: analyzer.get_adoption_sweep(step_days=7))
+    runner.run('StreamingROIAnalyzer', n, lambda: StreamingROIAnalyzer(csv_path, ADOPTION_DATE))
+
+
+def bench_issue_store(runner: BenchmarkRunner, work_dir: str, csv_path: str, n: int):
+    """IssueStore writes and StoreROIAnalyzer (SQL pushdown) over the whole project and one month"""
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    store = IssueStore(os.path.join(work_dir, f'issues_{n}.sqlite3'))
+    runner.run('IssueStore.replace_partition', n, lambda: store.replace_partition('https://benchmark.invalid', 'BENCH', rows))
+    runner.run('StoreROIAnalyzer', n, lambda: StoreROIAnalyzer(store, 'https://benchmark.invalid', 'BENCH', ADOPTION_DATE))
+    runner.run('StoreROIAnalyzer (one month)', n, lambda: StoreROIAnalyzer(
+        store, 'https://benchmark.invalid', 'BENCH', ADOPTION_DATE, since='2025-06-01', until='2025-07-01'
+    ))
+
+
+def bench_export(runner: BenchmarkRunner, work_dir: str, n: int):
+    """JiraAPIClient.export_to_csv on raw API-shaped issues"""
+    issues = list(generate_raw_issues(n))
+    client = JiraAPIClient('https://benchmark.invalid', 'benchmark@example.com', 'token')
+    output_path = os.path.join(work_dir, 'export_bench.csv')
+    runner.run('JiraAPIClient.export_to_csv', n, lambda: client.export_to_csv(issues, output_path))
+
+
+def bench_endpoints(runner: BenchmarkRunner, client, csv_path: str, n: int):
+    """Analysis endpoints through the Flask test client"""
+    demo_path = os.path.join(app_module.DATA_DIR, 'fintechco_data.csv')
+    shutil.copyfile(csv_path, demo_path)
+    app_module.JIRA_EXPORT_PATH = csv_path
+
+    def cold():
+        clear_dataset_cache()
+        app_module.response_cache.clear()
+
+    def demo():
+        response = client.post('/api/fetch-demo-data',
+                               json={'claude_adoption_date': ADOPTION_DATE, 'company': 'fintechco'})
+        assert response.status_code == 200, response.status_code
+        return response
+
+    def dashboard():
+        response = client.get(f'/api/dashboard-data?claude_adoption_date={ADOPTION_DATE}')
+        assert response.status_code == 200, response.status_code
+        return response
+
+    runner.run('POST /api/fetch-demo-data cold', n, demo, setup=cold)
+    with contextlib.redirect_stdout(io.StringIO()):
+        etag = demo().headers.get('ETag')
+    runner.run('POST /api/fetch-demo-data cached', n, demo)
+    runner.run('POST /api/fetch-demo-data 304', n, lambda: client.post(
+        '/api/fetch-demo-data',
+        json={'claude_adoption_date': ADOPTION_DATE, 'company': 'fintechco'},
+        headers={'If-None-Match': etag}
+    ))
+    runner.run('GET /api/dashboard-data cold', n, dashboard, setup=cold)
+    runner.run('GET /api/dashboard-data cached', n, dashboard)
+    runner.run('GET /api/adoption-sweep (weekly)', n, lambda: client.get(
+        f'/api/adoption-sweep?claude_adoption_date={ADOPTION_DATE}&step_days=7'))
+
+
+def bench_usage_endpoints(runner: BenchmarkRunner, client, usage_path: str, n: int):
+    """Usage endpoints through the Flask test client"""
+    shutil.copyfile(usage_path, os.path.join(app_module.DATA_DIR, 'fintechco_api_usage_data.json'))
+    runner.run('GET /api/usage-data', n, lambda: client.get('/api/usage-data?company=fintechco').get_data())
+    runner.run('GET /api/usage-data (one week)', n, lambda: client.get(
+        '/api/usage-data?company=fintechco&since=2025-03-03&until=2025-03-10').get_data())
+    runner.run('GET /api/usage-data (page of 500)', n, lambda: client.get(
+        '/api/usage-data?company=fintechco&limit=500').get_data())
+    runner.run('GET /api/usage-metrics cold', n, lambda: client.get('/api/usage-metrics?company=fintechco'),
+               setup=app_module.response_cache.clear)
+    runner.run('GET /api/usage-rollups (by day)', n, lambda: client.get('/api/usage-rollups?company=fintechco&group_by=day'))
+    runner.run('GET /api/usage-models cold', n, lambda: client.get('/api/usage-models?company=fintechco'),
+               setup=app_module.response_cache.clear)
+    runner.run('GET /api/usage-leaderboard (top 10 by loc)', n,
+               lambda: client.get('/api/usage-leaderboard?company=fintechco&metric=loc&k=10'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ROI backend on synthetic data')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10000, 100000],
+                        help='JIRA export sizes (issues)')
+    parser.add_argument('--usage-sizes', type=int, nargs='*', default=[10000],
+                        help='Usage data sizes (records)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (best is reported)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak memory pass')
+    parser.add_argument('--skip-export', action='store_true', help='Skip export_to_csv (slow at large sizes)')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    parser.add_argument('--work-dir', help='Directory for generated data (default: temporary)')
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='roi-bench-')
+    os.makedirs(work_dir, exist_ok=True)
+
+    # Point the app at the benchmark data instead of backend/data
+    app_module.DATA_DIR = os.path.join(work_dir, 'app_data')
+    app_module.PROCESSED_SNAPSHOT_PATH = os.path.join(app_module.DATA_DIR, 'processed_snapshot')
+    os.makedirs(app_module.DATA_DIR, exist_ok=True)
+    app_module.usage_rollups = app_module.UsageRollups(os.path.join(app_module.DATA_DIR, 'usage_rollups.sqlite3'))
+    app_module.issue_store = IssueStore(os.path.join(app_module.DATA_DIR, 'issues.sqlite3'))
+    client = app_module.app.test_client()
+
+    runner = BenchmarkRunner(args.repeat, not args.no_memory)
+
+    print("=" * 96)
+    print(f"⏱️  ROI backend benchmarks (data in {work_dir})")
+    print("=" * 96)
+    print(f"  {'benchmark':<42} {'records':>10} {'seconds':>10} {'records/s':>14} {'peak MB':>10}")
+
+    try:
+        for n in args.sizes:
+            csv_path = os.path.join(work_dir, f'jira_export_{n}.csv')
+            if not os.path.exists(csv_path):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_jira_export(n, csv_path)
+
+            print(f"\n📊 {n:,} issues")
+            bench_analyzer(runner, csv_path, n)
+            bench_issue_store(runner, work_dir, csv_path, n)
+            if not args.skip_export:
+                bench_export(runner, work_dir, n)
+            bench_endpoints(runner, client, csv_path, n)
+
+        for n in args.usage_sizes:
+            usage_path = os.path.join(work_dir, f'usage_{n}.json')
+            if not os.path.exists(usage_path):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_usage_data(n, usage_path)
+
+            print(f"\n📊 {n:,} usage records")
+            bench_usage_endpoints(runner, client, usage_path, n)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(runner.results, f, indent=2)
+        print(f"\n✅ Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
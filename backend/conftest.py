@@ -0,0 +1,133 @@
+"""
+Shared pytest fixtures
+A fake JIRA site (an in-memory stand-in for the client's requests.Session) so
+the JIRA client, sync and streaming paths can be tested without a network
+"""
+
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import jira_api_client
+
+
+def make_issue(number: int, created: datetime, updated: Optional[datetime] = None, status: str = 'Done',
+               assignee: Optional[str] = 'Alex Smith', duration_days: int = 3) -> Dict[str, Any]:
+    """An issue shaped like the JIRA search API returns it"""
+    updated = updated or created + timedelta(days=duration_days)
+    return {
+        'id': str(10000 + number),
+        'key': f'PROJ-{number}',
+        'fields': {
+            'issuetype': {'name': 'Task'},
+            'summary': f'Issue {number}',
+            'description': f'Description of issue {number}',
+            'assignee': {'displayName': assignee, 'accountId': f'acc-{assignee}'} if assignee else None,
+            'reporter': {'displayName': 'Rita Reporter', 'accountId': 'acc-rita'},
+            'priority': {'name': ['Low', 'Medium', 'High'][number % 3]},
+            'status': {'name': status},
+            'resolution': {'name': 'Done'} if status == 'Done' else None,
+            'created': created.strftime('%Y-%m-%dT%H:%M:%S.000+0000'),
+            'updated': updated.strftime('%Y-%m-%dT%H:%M:%S.000+0000'),
+            'duedate': (created + timedelta(days=duration_days)).strftime('%Y-%m-%d'),
+            'customfield_10015': created.strftime('%Y-%m-%d'),
+        }
+    }
+
+
+def make_issues(count: int, start: datetime = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)) -> List[Dict[str, Any]]:
+    """count issues created every 7 hours from start, with varied statuses and durations"""
+    return [
+        make_issue(i, start + timedelta(hours=7 * i), status='Done' if i % 4 else 'In Progress',
+                   assignee=None if i % 10 == 0 else ['Alex Smith', 'Bo Chen', 'Cy Diaz'][i % 3],
+                   duration_days=i % 9)
+        for i in range(count)
+    ]
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.payload = payload if payload is not None else {}
+        self.headers = headers or {}
+        self.text = '' if status_code == 200 else f'error {status_code}'
+
+    def json(self) -> Dict:
+        return self.payload
+
+
+class FakeJiraSession:
+    """
+    Serves /rest/api/3/search/jql from an in-memory issue list
+
+    Understands the JQL the client writes: `created >= "day"`, `created < "day"`,
+    `updated >= "YYYY-MM-DD HH:MM"` (in the user's time zone) and ORDER BY
+    created ASC/DESC. Queue failures with fail_next (one status or exception
+    per upcoming search request, None for success) or fail every matching
+    request with fail_when.
+    """
+
+    def __init__(self, issues: List[Dict[str, Any]], time_zone: str = 'UTC'):
+        self.issues = issues
+        self.time_zone = time_zone
+        self.fail_next: List[Any] = []
+        self.fail_when = None
+        self.retry_after: Optional[str] = None
+        self.searches: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def _matches(self, jql: str) -> List[Dict[str, Any]]:
+        issues = list(self.issues)
+        for operator, day in re.findall(r'created (>=|<) "([\d-]+)"', jql):
+            issues = [i for i in issues if (i['fields']['created'][:10] >= day) == (operator == '>=')]
+
+        since = re.search(r'updated >= "([\d-]+ [\d:]+)"', jql)
+        if since:
+            bound = datetime.strptime(since.group(1), '%Y-%m-%d %H:%M').replace(tzinfo=ZoneInfo(self.time_zone))
+            issues = [i for i in issues if datetime.fromisoformat(i['fields']['updated']) >= bound]
+
+        descending = re.search(r'order by created desc', jql, flags=re.IGNORECASE) is not None
+        return sorted(issues, key=lambda i: (i['fields']['created'], int(i['id'])), reverse=descending)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+            **kwargs) -> FakeResponse:
+        if url.endswith('/myself'):
+            return FakeResponse(200, {'displayName': 'Test User', 'timeZone': self.time_zone})
+
+        with self._lock:
+            self.searches.append(dict(params))
+            status = self.fail_next.pop(0) if self.fail_next else None
+        if isinstance(status, Exception):
+            raise status
+        if status is None and self.fail_when is not None and self.fail_when(params):
+            status = 500
+        if status is not None:
+            headers = {'Retry-After': self.retry_after} if self.retry_after else {}
+            return FakeResponse(status, headers=headers)
+
+        matches = self._matches(params['jql'])
+        start = int(params.get('nextPageToken') or 0)
+        size = int(params['maxResults'])
+        page = matches[start:start + size]
+        return FakeResponse(200, {
+            'issues': page,
+            'isLast': start + size >= len(matches),
+            'nextPageToken': str(start + size)
+        })
+
+
+@pytest.fixture
+def fake_jira(monkeypatch):
+    """Factory for a FakeJiraSession that every JiraAPIClient created afterwards uses"""
+    def install(issues: List[Dict[str, Any]], time_zone: str = 'UTC') -> FakeJiraSession:
+        session = FakeJiraSession(issues, time_zone)
+        monkeypatch.setattr(jira_api_client, 'get_jira_session', lambda *args, **kwargs: session)
+        return session
+
+    # Retries back off with time.sleep; don't actually wait in tests
+    monkeypatch.setattr(jira_api_client.time, 'sleep', lambda seconds: None)
+    return install
@@ -4,9 +4,361 @@ Analyzes JIRA data to calculate productivity improvements and cost savings
 """
 
 import pandas as pd
+import numpy as np
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import json
+import os
+import threading
+
+from snapshot import is_snapshot, read_snapshot, write_snapshot, MANIFEST_FILE
+
+
+# Number of parsed datasets kept in memory (least recently used are evicted first)
+DATASET_CACHE_SIZE = int(os.getenv('DATASET_CACHE_SIZE', '8'))
+
+_dataset_cache: 'OrderedDict[Tuple[str, int, int, bool], IssueDataset]' = OrderedDict()
+_dataset_cache_lock = threading.Lock()
+
+
+def parse_date(date_str: str) -> datetime:
+    """Parse date from various formats"""
+    # Try YYYY-MM-DD format first
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d')
+    except ValueError:
+        pass
+
+    # Try dd/MMM/yy format (JIRA format)
+    try:
+        return datetime.strptime(date_str, '%d/%b/%y')
+    except ValueError:
+        pass
+
+    # Try dd/MMM/yy with time
+    try:
+        return datetime.strptime(date_str.split()[0], '%d/%b/%y')
+    except (ValueError, IndexError):
+        raise ValueError(f"Unable to parse date: {date_str}")
+
+
+class IssueDataset:
+    """
+    Parsed JIRA export with per-ticket hours and cost
+
+    Holds everything that doesn't depend on the Claude adoption date, so one
+    load can back any number of ROIAnalyzer views.
+    """
+
+    # Date formats understood by parse_date, tried in order when detecting a column's format
+    DATE_FORMATS = [
+        '%Y-%m-%d',           # ISO
+        '%d/%b/%y',           # JIRA date
+        '%d/%b/%y %I:%M %p',  # JIRA date with time
+    ]
+
+    # Raw column -> parsed column
+    DATE_COLUMNS = {
+        'Created': 'Created_dt',
+        'Due date': 'Due_date_dt',
+        'Custom field (Start date)': 'Start_date_dt',
+        'Updated': 'Updated_dt',
+    }
+
+    # Lean mode: the only raw columns the metrics read
+    LEAN_COLUMNS = ['Issue Type', 'Issue key', 'Priority', 'Status'] + list(DATE_COLUMNS)
+
+    # Columns _process_data derives per ticket
+    DERIVED_COLUMNS = ['Duration_days', 'Hours_per_ticket', 'Cost_per_ticket']
+
+    # Lean mode: low-cardinality text columns stored as categoricals
+    CATEGORICAL_COLUMNS = ['Issue Type', 'Priority', 'Status']
+
+    def __init__(self, df: pd.DataFrame, source_path: Optional[str] = None,
+                 source_rows: Optional[int] = None, processed: bool = False, lean: bool = False):
+        """
+        Args:
+            df: Raw JIRA export (columns as written by JiraAPIClient.export_to_csv)
+            source_path: File the data was read from, if any
+            source_rows: Row count of the original export (defaults to len(df))
+            processed: df already has the parsed/derived columns and invalid rows removed
+            lean: Compact the processed data (see _compact)
+        """
+        self.source_path = source_path
+        self.source_rows = len(df) if source_rows is None else source_rows
+        self.lean = lean
+        self.date_parse_fallbacks: Dict[str, int] = {}
+        self.df = df if processed else self._process_data(df)
+        if lean:
+            self.df = self._compact(self.df)
+        self.memory_bytes = int(self.df.memory_usage(deep=True).sum())
+        self._adoption_index: Optional[AdoptionIndex] = None
+
+    @property
+    def adoption_index(self) -> 'AdoptionIndex':
+        """Creation-date index used for adoption date sweeps (built on first use)"""
+        if self._adoption_index is None:
+            self._adoption_index = AdoptionIndex(self.df)
+        return self._adoption_index
+
+    @classmethod
+    def from_csv(cls, csv_path: str, lean: bool = False) -> 'IssueDataset':
+        """
+        Read and parse a JIRA export CSV
+
+        Args:
+            csv_path: Path to JIRA export CSV
+            lean: Only read the columns the metrics need and compact them
+        """
+        if lean:
+            df = pd.read_csv(csv_path, usecols=lambda column: column in cls.LEAN_COLUMNS)
+        else:
+            df = pd.read_csv(csv_path)
+        return cls(df, source_path=csv_path, lean=lean)
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path: str, mmap: bool = True, lean: bool = False) -> 'IssueDataset':
+        """
+        Load a snapshot written by ROIAnalyzer.export_processed_data (no parsing needed)
+
+        Args:
+            snapshot_path: Snapshot directory
+            mmap: Memory-map the column files (see read_snapshot)
+            lean: Only load the columns the metrics need and compact them
+        """
+        columns = None
+        if lean:
+            columns = cls.LEAN_COLUMNS + list(cls.DATE_COLUMNS.values()) + cls.DERIVED_COLUMNS
+        df, metadata = read_snapshot(snapshot_path, mmap=mmap, columns=columns)
+        return cls(df, source_path=snapshot_path, source_rows=metadata.get('source_rows'), processed=True, lean=lean)
+
+    def _detect_date_format(self, values: pd.Series) -> Optional[str]:
+        """Detect the date format of a column from its first non-null value"""
+        non_null = values.dropna()
+        if non_null.empty:
+            return None
+
+        sample = str(non_null.iloc[0]).strip()
+        for fmt in self.DATE_FORMATS:
+            try:
+                datetime.strptime(sample, fmt)
+                return fmt
+            except ValueError:
+                continue
+        return None
+
+    def _parse_date_column(self, values: pd.Series) -> Tuple[pd.Series, int]:
+        """
+        Parse a whole date column with a single pd.to_datetime call
+
+        The format is detected once per column. Values that don't match it are
+        parsed one by one with parse_date.
+
+        Returns:
+            Tuple of (datetime64 Series truncated to the day, number of fallback rows)
+        """
+        fmt = self._detect_date_format(values)
+        if fmt is not None:
+            parsed = pd.to_datetime(values, format=fmt, errors='coerce')
+        else:
+            parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+        # Rows the detected format couldn't handle go through the slow path
+        fallback_mask = values.notna() & parsed.isna()
+        fallback_count = int(fallback_mask.sum())
+        if fallback_count:
+            parsed.loc[fallback_mask] = pd.to_datetime(values[fallback_mask].map(parse_date))
+
+        # parse_date only keeps the day, so drop any time of day to match it
+        return parsed.dt.normalize(), fallback_count
+
+    def _process_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Process and clean the JIRA data"""
+        # Parse dates (one vectorized conversion per column)
+        for raw_column, parsed_column in self.DATE_COLUMNS.items():
+            df[parsed_column], fallback_count = self._parse_date_column(df[raw_column])
+            if fallback_count:
+                self.date_parse_fallbacks[raw_column] = fallback_count
+
+        if self.date_parse_fallbacks:
+            print(f"⚠️  Date values parsed row by row (format mismatch): {self.date_parse_fallbacks}")
+
+        # Calculate hours per ticket (Due Date - Start Date) * 8 hours/day
+        df['Duration_days'] = (df['Due_date_dt'] - df['Start_date_dt']).dt.days
+        df['Hours_per_ticket'] = df['Duration_days'] * ROIAnalyzer.HOURS_PER_DAY
+
+        # Calculate cost per ticket
+        df['Cost_per_ticket'] = df['Hours_per_ticket'] * ROIAnalyzer.HOURLY_RATE
+
+        # Filter out invalid rows (negative duration)
+        return df[df['Duration_days'] >= 0].copy()
+
+    def _compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shrink processed data for lean mode
+
+        Drops the raw date strings (the parsed columns replace them), stores
+        low-cardinality text as categoricals and downcasts integer columns.
+        Float columns keep full precision so sums match the regular mode.
+        """
+        df = df.drop(columns=[column for column in self.DATE_COLUMNS if column in df.columns])
+
+        for column in self.CATEGORICAL_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+
+        for column in df.select_dtypes(include='integer').columns:
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+
+        return df
+
+    def memory_footprint(self) -> Dict[str, Any]:
+        """Memory used by this dataset's DataFrame"""
+        return {
+            'source_path': self.source_path,
+            'rows': len(self.df),
+            'lean': self.lean,
+            'memory_bytes': self.memory_bytes,
+            'bytes_per_row': round(self.memory_bytes / len(self.df), 1) if len(self.df) > 0 else 0
+        }
+
+
+class AdoptionIndex:
+    """
+    Issues sorted by creation date with prefix sums of the summary inputs
+
+    Splitting the dataset at any candidate adoption date is then a binary
+    search plus a few array lookups instead of a DataFrame filter.
+    """
+
+    # Totals key -> dataset column
+    SUM_COLUMNS = {
+        'hours': 'Hours_per_ticket',
+        'days': 'Duration_days',
+        'cost': 'Cost_per_ticket',
+    }
+
+    def __init__(self, df: pd.DataFrame):
+        columns = {key: df[column].to_numpy(dtype=float) for key, column in self.SUM_COLUMNS.items()}
+        columns['completed'] = (df['Status'] == 'Done').to_numpy(dtype=np.int64)
+        columns['tasks'] = np.ones(len(df), dtype=np.int64)
+        self._index(df['Created_dt'].to_numpy(), columns)
+
+    @classmethod
+    def from_day_totals(cls, groups: pd.DataFrame) -> 'AdoptionIndex':
+        """
+        Index built from task totals per created day instead of single issues
+
+        Creation dates are whole days, so splitting per-day totals gives the
+        same pre/post totals as splitting the issues themselves.
+
+        Args:
+            groups: Rows with a Bucket_Start day (NaT for undated issues) and
+                tasks, completed, hours, days and cost totals, e.g. the
+                day-level ROIAnalyzer group totals
+        """
+        index = cls.__new__(cls)
+        days = pd.to_datetime(groups['Bucket_Start']).to_numpy()
+        columns = {key: groups[key].to_numpy(dtype=float) for key in cls.SUM_COLUMNS}
+        for key in ('completed', 'tasks'):
+            columns[key] = groups[key].to_numpy(dtype=np.int64)
+        index._index(days, columns)
+        return index
+
+    def _index(self, created: np.ndarray, columns: Dict[str, np.ndarray]):
+        dated = ~np.isnat(created)
+        order = np.argsort(created[dated], kind='stable')
+        self.created = created[dated][order]
+
+        # prefix[key][k] = total over the k earliest created entries
+        self.prefix = {
+            key: np.concatenate(([0], np.cumsum(values[dated][order])))
+            for key, values in columns.items()
+        }
+
+        # Issues without a creation date always count as Pre-Claude
+        self.undated = {key: values[~dated].sum() for key, values in columns.items()}
+
+    def split(self, adoption_date: datetime) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[pd.Timestamp]]:
+        """
+        Pre/Post-Claude totals for an adoption date in O(log n)
+
+        Returns:
+            Tuple of (pre totals, post totals, latest Post-Claude creation date)
+        """
+        n = len(self.created)
+        k = int(np.searchsorted(self.created, np.datetime64(adoption_date), side='left'))
+
+        pre = {key: self.prefix[key][k] + self.undated[key] for key in self.prefix}
+        post = {key: self.prefix[key][n] - self.prefix[key][k] for key in self.prefix}
+
+        for totals in (pre, post):
+            totals['tasks'] = int(totals['tasks'])
+            totals['completed'] = int(totals['completed'])
+
+        last_post_created = pd.Timestamp(self.created[-1]) if k < n else None
+        return pre, post, last_post_created
+
+
+def dataset_fingerprint(path: str) -> Tuple[str, int, int]:
+    """Cache key for a data file: (absolute path, mtime in ns, size in bytes)"""
+    # Snapshots are rewritten as a whole, so their manifest identifies the version
+    stat = os.stat(os.path.join(path, MANIFEST_FILE) if os.path.isdir(path) else path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def load_dataset(path: str, lean: bool = False) -> IssueDataset:
+    """
+    Load a parsed dataset, reusing the cached copy while the file is unchanged
+
+    Args:
+        path: Path to JIRA export CSV or snapshot directory
+        lean: Load a compact copy with only the columns the metrics need
+
+    Returns:
+        IssueDataset shared between callers - treat its DataFrame as read-only
+    """
+    key = dataset_fingerprint(path) + (lean,)
+
+    with _dataset_cache_lock:
+        dataset = _dataset_cache.get(key)
+        if dataset is not None:
+            _dataset_cache.move_to_end(key)
+            return dataset
+
+    if is_snapshot(path):
+        print(f"📂 Loading snapshot: {path}{' (lean)' if lean else ''}")
+        dataset = IssueDataset.from_snapshot(path, lean=lean)
+    else:
+        print(f"📂 Parsing dataset: {path}{' (lean)' if lean else ''}")
+        dataset = IssueDataset.from_csv(path, lean=lean)
+
+    print(f"   {len(dataset.df)} rows, {dataset.memory_bytes / 1024 / 1024:.2f} MB in memory")
+
+    with _dataset_cache_lock:
+        # Drop entries for older versions of the same file
+        for stale_key in [k for k in _dataset_cache if k[0] == key[0] and k[1:3] != key[1:3]]:
+            del _dataset_cache[stale_key]
+
+        _dataset_cache[key] = dataset
+        while len(_dataset_cache) > DATASET_CACHE_SIZE:
+            _dataset_cache.popitem(last=False)
+
+    return dataset
+
+
+def dataset_cache_stats() -> List[Dict[str, Any]]:
+    """Memory footprint of every cached dataset, most recently used last"""
+    with _dataset_cache_lock:
+        datasets = list(_dataset_cache.values())
+    return [dataset.memory_footprint() for dataset in datasets]
+
+
+def clear_dataset_cache():
+    """Drop all cached datasets"""
+    with _dataset_cache_lock:
+        _dataset_cache.clear()
 
 
 class ROIAnalyzer:
@@ -18,79 +370,156 @@ class ROIAnalyzer:
     WORKING_DAYS_PER_YEAR = 250
     HOURLY_RATE = ENGINEER_COST / (HOURS_PER_DAY * WORKING_DAYS_PER_YEAR)  # $50/hour
 
-    def __init__(self, csv_path: str, claude_adoption_date: str):
+    # Time series bucket size -> pandas period frequency
+    TIME_SERIES_FREQUENCIES = {'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q'}
+
+    # Groups analyze() aggregates over, and how group totals combine when merging partial results
+    GROUP_KEYS = ['Period', 'Bucket_Start', 'Status', 'Priority']
+    GROUP_AGGREGATIONS = {
+        'tasks': 'sum',
+        'keys': 'sum',
+        'completed': 'sum',
+        'hours': 'sum',
+        'days': 'sum',
+        'cost': 'sum',
+        'last_created': 'max'
+    }
+
+    def __init__(self, csv_path: str, claude_adoption_date: str, dataset: Optional[IssueDataset] = None,
+                 lean: bool = False):
         """
         Initialize analyzer with JIRA export data
 
+        The parsed CSV is cached (see load_dataset), so building a new analyzer
+        for a different adoption date only recomputes the Pre/Post split.
+
         Args:
-            csv_path: Path to JIRA export CSV
+            csv_path: Path to JIRA export CSV (or a snapshot directory)
             claude_adoption_date: Date when Claude Code was adopted (format: YYYY-MM-DD or dd/MMM/yy)
+            dataset: Already loaded dataset to use instead of csv_path
+            lean: Use the compact dataset (metric columns only, categoricals, downcast integers)
         """
-        self.df = pd.read_csv(csv_path)
+        self.dataset = dataset if dataset is not None else load_dataset(csv_path, lean=lean)
+        self.source_rows = self.dataset.source_rows
         self.claude_adoption_date = self._parse_date(claude_adoption_date)
+        self.date_parse_fallbacks = self.dataset.date_parse_fallbacks
         self._process_data()
 
     def _parse_date(self, date_str: str) -> datetime:
         """Parse date from various formats"""
-        # Try YYYY-MM-DD format first
-        try:
-            return datetime.strptime(date_str, '%Y-%m-%d')
-        except:
-            pass
-
-        # Try dd/MMM/yy format (JIRA format)
-        try:
-            return datetime.strptime(date_str, '%d/%b/%y')
-        except:
-            pass
-
-        # Try dd/MMM/yy with time
-        try:
-            return datetime.strptime(date_str.split()[0], '%d/%b/%y')
-        except:
-            raise ValueError(f"Unable to parse date: {date_str}")
+        return parse_date(date_str)
 
     def _process_data(self):
-        """Process and clean the JIRA data"""
-        # Parse dates
-        self.df['Created_dt'] = self.df['Created'].apply(lambda x: self._parse_date(x) if pd.notna(x) else None)
-        self.df['Due_date_dt'] = self.df['Due date'].apply(lambda x: self._parse_date(x) if pd.notna(x) else None)
-        self.df['Start_date_dt'] = self.df['Custom field (Start date)'].apply(lambda x: self._parse_date(x) if pd.notna(x) else None)
-        self.df['Updated_dt'] = self.df['Updated'].apply(lambda x: self._parse_date(x) if pd.notna(x) else None)
-
-        # Calculate hours per ticket (Due Date - Start Date) * 8 hours/day
-        self.df['Duration_days'] = (self.df['Due_date_dt'] - self.df['Start_date_dt']).dt.days
-        self.df['Hours_per_ticket'] = self.df['Duration_days'] * self.HOURS_PER_DAY
-
-        # Calculate cost per ticket
-        self.df['Cost_per_ticket'] = self.df['Hours_per_ticket'] * self.HOURLY_RATE
-
-        # Classify pre/post Claude adoption
-        self.df['Period'] = self.df['Created_dt'].apply(
-            lambda x: 'Post-Claude' if pd.notna(x) and x >= self.claude_adoption_date else 'Pre-Claude'
+        """Build this analyzer's view of the shared dataset"""
+        # Shallow copy: new columns stay local, the cached data is not touched
+        self.df = self.dataset.df.copy(deep=False)
+
+        # Classify pre/post Claude adoption (categories in alphabetical order, so sorting matches plain strings)
+        self.df['Period'] = pd.Categorical(
+            np.where(self.df['Created_dt'] >= self.claude_adoption_date, 'Post-Claude', 'Pre-Claude'),
+            categories=['Post-Claude', 'Pre-Claude']
         )
 
-        # Filter out invalid rows (negative duration)
-        self.df = self.df[self.df['Duration_days'] >= 0]
-
     def get_summary_metrics(self) -> Dict[str, Any]:
         """Calculate summary ROI metrics"""
 
         pre_claude = self.df[self.df['Period'] == 'Pre-Claude']
         post_claude = self.df[self.df['Period'] == 'Post-Claude']
 
-        # Calculate metrics
-        pre_avg_hours = pre_claude['Hours_per_ticket'].mean() if len(pre_claude) > 0 else 0
-        post_avg_hours = post_claude['Hours_per_ticket'].mean() if len(post_claude) > 0 else 0
+        post_dates = post_claude['Created_dt'].dropna()
+        last_post_created = post_dates.max() if len(post_dates) > 0 else None
+
+        return self._build_summary(
+            self._period_totals(pre_claude),
+            self._period_totals(post_claude),
+            last_post_created,
+            self.claude_adoption_date
+        )
+
+    def get_adoption_sweep(self, start: Optional[str] = None, end: Optional[str] = None,
+                           step_days: int = 1) -> Dict[str, Any]:
+        """
+        Summary metrics for every candidate adoption date in a range
+
+        Uses an AdoptionIndex (see _adoption_index), so each date costs a
+        binary search rather than a pass over the data.
+
+        Args:
+            start: First candidate date (defaults to the earliest created issue)
+            end: Last candidate date (defaults to the latest created issue)
+            step_days: Days between candidate dates
+
+        Returns:
+            Dict with the shared assumptions and one summary per candidate date
+        """
+        index = self._adoption_index()
+        result = {
+            'assumptions': self._assumptions(),
+            'claude_adoption_date': self.claude_adoption_date.strftime('%Y-%m-%d'),
+            'sweep': []
+        }
+        if len(index.created) == 0:
+            return result
+
+        start_date = self._parse_date(start) if start else pd.Timestamp(index.created[0]).to_pydatetime()
+        end_date = self._parse_date(end) if end else pd.Timestamp(index.created[-1]).to_pydatetime()
+        candidates = pd.date_range(start_date, end_date, freq=f'{max(int(step_days), 1)}D')
+
+        for candidate in candidates:
+            adoption_date = candidate.to_pydatetime()
+            pre, post, last_post_created = index.split(adoption_date)
+            summary = self._build_summary(pre, post, last_post_created, adoption_date)
+            del summary['assumptions']
+            result['sweep'].append(summary)
+
+        return result
+
+    def _adoption_index(self) -> AdoptionIndex:
+        """Creation-date index the adoption sweep splits (shared by analyzers of the same dataset)"""
+        return self.dataset.adoption_index
+
+    @staticmethod
+    def _period_totals(period_df: pd.DataFrame) -> Dict[str, Any]:
+        """Counts and sums that the summary metrics are derived from"""
+        return {
+            'tasks': len(period_df),
+            'completed': int((period_df['Status'] == 'Done').sum()),
+            'hours': period_df['Hours_per_ticket'].sum(),
+            'days': period_df['Duration_days'].sum(),
+            'cost': period_df['Cost_per_ticket'].sum()
+        }
+
+    def _assumptions(self) -> Dict[str, Any]:
+        """Cost assumptions reported alongside the metrics"""
+        return {
+            'engineer_annual_cost': self.ENGINEER_COST,
+            'hours_per_day': self.HOURS_PER_DAY,
+            'hourly_rate': round(self.HOURLY_RATE, 2)
+        }
+
+    def _build_summary(self, pre: Dict[str, Any], post: Dict[str, Any],
+                       last_post_created: Optional[datetime], adoption_date: datetime) -> Dict[str, Any]:
+        """
+        Build the summary metrics from per-period totals
+
+        Args:
+            pre: Pre-Claude totals (see _period_totals)
+            post: Post-Claude totals
+            last_post_created: Latest creation date among Post-Claude tasks
+            adoption_date: Claude adoption date the periods were split on
+        """
+        pre_total_tasks = pre['tasks']
+        post_total_tasks = post['tasks']
 
-        pre_avg_days = pre_claude['Duration_days'].mean() if len(pre_claude) > 0 else 0
-        post_avg_days = post_claude['Duration_days'].mean() if len(post_claude) > 0 else 0
+        # Calculate metrics
+        pre_avg_hours = pre['hours'] / pre_total_tasks if pre_total_tasks > 0 else 0
+        post_avg_hours = post['hours'] / post_total_tasks if post_total_tasks > 0 else 0
 
-        pre_total_tasks = len(pre_claude)
-        post_total_tasks = len(post_claude)
+        pre_avg_days = pre['days'] / pre_total_tasks if pre_total_tasks > 0 else 0
+        post_avg_days = post['days'] / post_total_tasks if post_total_tasks > 0 else 0
 
-        pre_completed = len(pre_claude[pre_claude['Status'] == 'Done'])
-        post_completed = len(post_claude[post_claude['Status'] == 'Done'])
+        pre_completed = pre['completed']
+        post_completed = post['completed']
 
         pre_completion_rate = (pre_completed / pre_total_tasks * 100) if pre_total_tasks > 0 else 0
         post_completion_rate = (post_completed / post_total_tasks * 100) if post_total_tasks > 0 else 0
@@ -100,40 +529,29 @@ class ROIAnalyzer:
         speed_improvement = ((pre_avg_days - post_avg_days) / pre_avg_days * 100) if pre_avg_days > 0 else 0
 
         # Calculate cost savings
-        pre_total_cost = pre_claude['Cost_per_ticket'].sum()
-        post_total_cost = post_claude['Cost_per_ticket'].sum()
+        pre_total_cost = pre['cost']
+        post_total_cost = post['cost']
 
         # Normalized cost per task
-        pre_cost_per_task = pre_claude['Cost_per_ticket'].mean() if len(pre_claude) > 0 else 0
-        post_cost_per_task = post_claude['Cost_per_ticket'].mean() if len(post_claude) > 0 else 0
+        pre_cost_per_task = pre_total_cost / pre_total_tasks if pre_total_tasks > 0 else 0
+        post_cost_per_task = post_total_cost / post_total_tasks if post_total_tasks > 0 else 0
 
         cost_savings_per_task = pre_cost_per_task - post_cost_per_task
         cost_savings_percent = ((cost_savings_per_task / pre_cost_per_task) * 100) if pre_cost_per_task > 0 else 0
 
         # Estimate annual savings
         # Assume post-Claude velocity continues
-        if post_total_tasks > 0 and len(post_claude) > 0:
+        annual_savings_estimate = 0
+        if post_total_tasks > 0 and last_post_created is not None:
             # Calculate days of data post-Claude
-            post_dates = post_claude['Created_dt'].dropna()
-            if len(post_dates) > 0:
-                days_post_claude = (post_dates.max() - self.claude_adoption_date).days
-                if days_post_claude > 0:
-                    tasks_per_day_post = post_total_tasks / days_post_claude
-                    annual_tasks_projected = tasks_per_day_post * 365
-                    annual_savings_estimate = annual_tasks_projected * cost_savings_per_task
-                else:
-                    annual_savings_estimate = 0
-            else:
-                annual_savings_estimate = 0
-        else:
-            annual_savings_estimate = 0
+            days_post_claude = (last_post_created - adoption_date).days
+            if days_post_claude > 0:
+                tasks_per_day_post = post_total_tasks / days_post_claude
+                annual_tasks_projected = tasks_per_day_post * 365
+                annual_savings_estimate = annual_tasks_projected * cost_savings_per_task
 
         return {
-            'assumptions': {
-                'engineer_annual_cost': self.ENGINEER_COST,
-                'hours_per_day': self.HOURS_PER_DAY,
-                'hourly_rate': round(self.HOURLY_RATE, 2)
-            },
+            'assumptions': self._assumptions(),
             'pre_claude': {
                 'total_tasks': int(pre_total_tasks),
                 'completed_tasks': int(pre_completed),
@@ -160,29 +578,35 @@ class ROIAnalyzer:
                 'completion_rate_improvement': round(post_completion_rate - pre_completion_rate, 1),
                 'annual_savings_estimate': round(annual_savings_estimate, 2)
             },
-            'claude_adoption_date': self.claude_adoption_date.strftime('%Y-%m-%d')
+            'claude_adoption_date': adoption_date.strftime('%Y-%m-%d')
         }
 
-    def get_time_series_data(self) -> List[Dict[str, Any]]:
-        """Get time series data for charts"""
-        # Group by week and get the week start date
-        self.df['Week_Period'] = self.df['Created_dt'].dt.to_period('W')
-        self.df['Week_Start'] = self.df['Week_Period'].apply(lambda x: x.start_time.strftime('%Y-%m-%d'))
+    def get_time_series_data(self, granularity: str = 'week') -> List[Dict[str, Any]]:
+        """
+        Get time series data for charts
 
-        weekly_stats = self.df.groupby(['Week_Start', 'Period']).agg({
+        Args:
+            granularity: Bucket size - 'day', 'week', 'month' or 'quarter'. Each record's
+                Week_Start holds its bucket's start date whatever the granularity.
+        """
+        bucket_start = self._bucket_starts(self.df['Created_dt'], granularity).rename('Week_Start')
+
+        stats = self.df.groupby([bucket_start, 'Period'], observed=True).agg({
             'Hours_per_ticket': 'mean',
             'Duration_days': 'mean',
             'Issue key': 'count',
             'Cost_per_ticket': 'mean'
         }).reset_index()
 
-        weekly_stats.columns = ['Week_Start', 'Period', 'Avg_Hours_Per_Task', 'Avg_Days', 'Task_Count', 'Avg_Cost']
+        stats.columns = ['Week_Start', 'Period', 'Avg_Hours_Per_Task', 'Avg_Days', 'Task_Count', 'Avg_Cost']
+        # Only the (few) bucket keys are formatted, not every row
+        stats['Week_Start'] = stats['Week_Start'].dt.strftime('%Y-%m-%d')
 
-        # Calculate Total_Hours for each week
-        weekly_stats['Total_Hours'] = weekly_stats['Avg_Hours_Per_Task'] * weekly_stats['Task_Count']
+        # Calculate Total_Hours for each bucket
+        stats['Total_Hours'] = stats['Avg_Hours_Per_Task'] * stats['Task_Count']
 
-        result = weekly_stats.to_dict('records')
-        print(f"\n📊 TIME SERIES DATA ({len(result)} records):")
+        result = stats.to_dict('records')
+        print(f"\n📊 TIME SERIES DATA ({len(result)} records, by {granularity}):")
         if result:
             print(f"   First record: {result[0]}")
             if len(result) > 1:
@@ -190,9 +614,74 @@ class ROIAnalyzer:
 
         return result
 
+    @classmethod
+    def _bucket_starts(cls, dates: pd.Series, granularity: str) -> pd.Series:
+        """Start of each date's time series bucket, computed column-wise (NaT stays NaT)"""
+        if granularity not in cls.TIME_SERIES_FREQUENCIES:
+            raise ValueError(
+                f"Invalid granularity: {granularity}. Must be one of {', '.join(cls.TIME_SERIES_FREQUENCIES)}"
+            )
+
+        dates = pd.to_datetime(dates)
+        if granularity == 'day':
+            return dates.dt.floor('D')
+        return dates.dt.to_period(cls.TIME_SERIES_FREQUENCIES[granularity]).dt.start_time
+
+    def get_engineer_cycle_times(self) -> pd.DataFrame:
+        """
+        Per-engineer task counts and cycle times before and after adoption
+
+        Engineers are identified by Assignee Id (or the Assignee name for rows
+        without one); unassigned issues are skipped. One hash groupby, so this
+        is linear in the number of issues.
+
+        Returns:
+            DataFrame with one row per engineer: engineer, name, then pre_ and
+            post_ tasks, completed, avg_days and avg_hours
+
+        Raises:
+            ValueError: If the data has no assignee columns (e.g. a lean dataset)
+        """
+        missing = [column for column in ('Assignee', 'Assignee Id') if column not in self.df.columns]
+        if missing:
+            raise ValueError(f"Per-engineer metrics need the {', '.join(missing)} column(s); load without lean mode")
+
+        names = self.df['Assignee'].astype(object)
+        assigned = names.notna() & (names != 'Unassigned')
+        df = self.df[assigned]
+        names = names[assigned]
+        ids = df['Assignee Id'].astype(object)
+        engineer = ids.where(ids.notna() & (ids.astype(str).str.strip() != ''), names).astype(str)
+
+        totals = pd.DataFrame({
+            'engineer': engineer,
+            'name': names,
+            'Period': df['Period'],
+            'tasks': 1,
+            'completed': (df['Status'] == 'Done').astype(int),
+            'days': df['Duration_days'],
+            'hours': df['Hours_per_ticket'],
+        }).groupby(['engineer', 'Period'], observed=True, sort=False).agg(
+            name=('name', 'first'), tasks=('tasks', 'sum'), completed=('completed', 'sum'),
+            days=('days', 'sum'), hours=('hours', 'sum')
+        )
+
+        result = pd.DataFrame({'engineer': engineer.drop_duplicates().to_numpy()})
+        result['name'] = result['engineer'].map(totals['name'].groupby(level='engineer').first())
+        for period, prefix in (('Pre-Claude', 'pre'), ('Post-Claude', 'post')):
+            period_totals = totals.xs(period, level='Period') if period in totals.index.get_level_values('Period') \
+                else totals.iloc[0:0].droplevel('Period')
+            tasks = result['engineer'].map(period_totals['tasks']).fillna(0).astype(int)
+            result[f'{prefix}_tasks'] = tasks
+            result[f'{prefix}_completed'] = result['engineer'].map(period_totals['completed']).fillna(0).astype(int)
+            for column in ('days', 'hours'):
+                sums = result['engineer'].map(period_totals[column]).fillna(0)
+                result[f'{prefix}_avg_{column}'] = (sums / tasks.where(tasks > 0)).fillna(0)
+        return result
+
     def get_status_breakdown(self) -> Dict[str, Any]:
         """Get breakdown by status for pre/post Claude"""
-        status_breakdown = self.df.groupby(['Period', 'Status']).size().unstack(fill_value=0)
+        status_breakdown = self.df.groupby(['Period', 'Status'], observed=True).size().unstack(fill_value=0)
 
         return {
             'pre_claude': status_breakdown.loc['Pre-Claude'].to_dict() if 'Pre-Claude' in status_breakdown.index else {},
@@ -201,13 +690,116 @@ class ROIAnalyzer:
 
     def get_priority_breakdown(self) -> Dict[str, Any]:
         """Get breakdown by priority for pre/post Claude"""
-        priority_breakdown = self.df.groupby(['Period', 'Priority']).size().unstack(fill_value=0)
+        priority_breakdown = self.df.groupby(['Period', 'Priority'], observed=True).size().unstack(fill_value=0)
 
         return {
             'pre_claude': priority_breakdown.loc['Pre-Claude'].to_dict() if 'Pre-Claude' in priority_breakdown.index else {},
             'post_claude': priority_breakdown.loc['Post-Claude'].to_dict() if 'Post-Claude' in priority_breakdown.index else {}
         }
 
-    def export_processed_data(self, output_path: str):
-        """Export processed DataFrame to CSV"""
-        self.df.to_csv(output_path, index=False)
+    def analyze(self, granularity: str = 'week') -> Dict[str, Any]:
+        """
+        Compute every dashboard section from one grouped aggregation
+
+        Produces the same results as get_summary_metrics, get_time_series_data,
+        get_status_breakdown and get_priority_breakdown, without re-filtering
+        the data per section or adding columns to self.df.
+
+        Args:
+            granularity: Time series bucket size ('day', 'week', 'month' or 'quarter')
+
+        Returns:
+            Dict with summary_metrics, time_series_data, status_breakdown and priority_breakdown
+        """
+        return self._sections_from_groups(self._group_totals(granularity), granularity)
+
+    def _group_totals(self, granularity: str = 'week') -> pd.DataFrame:
+        """Task totals per (Period, Bucket_Start, Status, Priority), one row per group"""
+        return pd.DataFrame({
+            'Period': self.df['Period'],
+            'Bucket_Start': self._bucket_starts(self.df['Created_dt'], granularity),
+            'Status': self.df['Status'],
+            'Priority': self.df['Priority'],
+            'tasks': 1,
+            'keys': self.df['Issue key'].notna(),
+            'completed': self.df['Status'] == 'Done',
+            'hours': self.df['Hours_per_ticket'],
+            'days': self.df['Duration_days'],
+            'cost': self.df['Cost_per_ticket'],
+            'last_created': self.df['Created_dt']
+        }).groupby(self.GROUP_KEYS, dropna=False, observed=True).agg(self.GROUP_AGGREGATIONS).reset_index()
+
+    def _sections_from_groups(self, groups: pd.DataFrame, granularity: str = 'week') -> Dict[str, Any]:
+        """
+        Build the dashboard sections from per (Period, Bucket_Start, Status, Priority) totals
+
+        Args:
+            groups: One row per group with tasks, keys (non-null issue keys), completed,
+                hours, days, cost and last_created columns
+            granularity: Time series bucket size; groups may be bucketed more finely
+                (e.g. by day) and are rolled up to it
+        """
+        # Summary
+        totals = {}
+        for period in ('Pre-Claude', 'Post-Claude'):
+            period_groups = groups[groups['Period'] == period]
+            totals[period] = {
+                'tasks': int(period_groups['tasks'].sum()),
+                'completed': int(period_groups['completed'].sum()),
+                'hours': period_groups['hours'].sum(),
+                'days': period_groups['days'].sum(),
+                'cost': period_groups['cost'].sum()
+            }
+
+        last_post_created = groups.loc[groups['Period'] == 'Post-Claude', 'last_created'].max()
+        summary_metrics = self._build_summary(
+            totals['Pre-Claude'],
+            totals['Post-Claude'],
+            last_post_created if pd.notna(last_post_created) else None,
+            self.claude_adoption_date
+        )
+
+        # Time series
+        bucket_start = self._bucket_starts(groups['Bucket_Start'], granularity)
+        buckets = groups.groupby([bucket_start, 'Period'], observed=True)[['tasks', 'keys', 'hours', 'days', 'cost']].sum().reset_index()
+        stats = pd.DataFrame({
+            'Week_Start': buckets['Bucket_Start'].dt.strftime('%Y-%m-%d'),
+            'Period': buckets['Period'],
+            'Avg_Hours_Per_Task': buckets['hours'] / buckets['tasks'],
+            'Avg_Days': buckets['days'] / buckets['tasks'],
+            'Task_Count': buckets['keys'],
+            'Avg_Cost': buckets['cost'] / buckets['tasks']
+        })
+        stats['Total_Hours'] = stats['Avg_Hours_Per_Task'] * stats['Task_Count']
+
+        return {
+            'summary_metrics': summary_metrics,
+            'time_series_data': stats.to_dict('records'),
+            'status_breakdown': self._breakdown_from_groups(groups, 'Status'),
+            'priority_breakdown': self._breakdown_from_groups(groups, 'Priority')
+        }
+
+    @staticmethod
+    def _breakdown_from_groups(groups: pd.DataFrame, column: str) -> Dict[str, Any]:
+        """Pre/post Claude task counts per value of column"""
+        breakdown = groups.groupby(['Period', column], observed=True)['tasks'].sum().unstack(fill_value=0)
+
+        return {
+            'pre_claude': breakdown.loc['Pre-Claude'].to_dict() if 'Pre-Claude' in breakdown.index else {},
+            'post_claude': breakdown.loc['Post-Claude'].to_dict() if 'Post-Claude' in breakdown.index else {}
+        }
+
+    def export_processed_data(self, output_path: str, format: str = 'csv'):
+        """
+        Export processed DataFrame
+
+        Args:
+            output_path: CSV file, or directory for format='snapshot'
+            format: 'csv' or 'snapshot' (columnar .npy arrays, reloadable with ROIAnalyzer/load_dataset)
+        """
+        if format == 'snapshot':
+            write_snapshot(self.df, output_path, metadata={'source_rows': self.dataset.source_rows})
+        elif format == 'csv':
+            self.df.to_csv(output_path, index=False)
+        else:
+            raise ValueError(f"Unknown export format: {format}")
@@ -0,0 +1,177 @@
+"""
+Per-engineer ROI
+Joins JIRA issues to Claude Code usage by engineer, so each engineer's
+pre/post adoption cycle times sit next to how heavily they used Claude Code
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Usage totals attached to each engineer (UsageRollups activity and cost columns)
+USAGE_FIELDS = ['records', 'sessions', 'commits', 'pull_requests', 'lines_added', 'lines_removed', 'cost']
+
+# Identity mappings and the (mtime, size) of the file each was read from
+_identities: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+_identities_lock = threading.Lock()
+
+
+def name_key(value: str) -> str:
+    """
+    Comparable form of a person's name or email address
+
+    'William Scott', 'william.scott@engineering.fintechco.com' and
+    'William_Scott2' all give 'william scott'.
+    """
+    value = str(value).strip().lower().split('@')[0]
+    value = re.sub(r'[._\-\s]+', ' ', value)
+    return re.sub(r'\d+', '', value).strip()
+
+
+def load_engineer_identities(path: str) -> Dict[str, str]:
+    """
+    JIRA Assignee Id or name -> usage email mapping, read once per file version
+
+    Args:
+        path: JSON file holding one object of assignee -> email pairs
+
+    Returns:
+        The mapping ({} if the file does not exist) - shared, treat as read-only
+
+    Raises:
+        ValueError: If the file does not hold a JSON object of strings
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+
+    key = os.path.abspath(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _identities_lock:
+        cached = _identities.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        identities = json.load(f)
+    if not isinstance(identities, dict) or not all(isinstance(v, str) for v in identities.values()):
+        raise ValueError(f"{path} must hold a JSON object mapping assignees to email addresses")
+
+    with _identities_lock:
+        _identities[key] = (version, identities)
+    return identities
+
+
+class EngineerUsageIndex:
+    """
+    Hash index from engineer identity to usage totals
+
+    Each usage actor is indexed by email address and by the name its email's
+    local part spells, so JIRA assignees (display name and account id) resolve
+    with constant-time lookups. Names shared by several actors are left out of
+    the name index rather than guessed.
+    """
+
+    def __init__(self, usage_totals: List[Dict[str, Any]], identities: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            usage_totals: Per-actor usage totals (UsageRollups.totals grouped by actor)
+            identities: Explicit JIRA Assignee Id or name -> usage email mapping,
+                checked before matching by email or name
+        """
+        self.by_email: Dict[str, Dict[str, Any]] = {}
+        self.by_name: Dict[str, Optional[Dict[str, Any]]] = {}
+        for totals in usage_totals:
+            email = totals['actor'].lower()
+            self.by_email[email] = totals
+
+            key = name_key(email)
+            # Two actors with the same name can't be told apart by name alone
+            self.by_name[key] = None if key in self.by_name else totals
+
+        self.identities = {key: email.lower() for key, email in (identities or {}).items()}
+
+    def __len__(self) -> int:
+        return len(self.by_email)
+
+    def lookup(self, engineer: str, name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Usage totals of a JIRA engineer, or None if they can't be matched
+
+        Args:
+            engineer: Assignee Id (or name when the export has no id)
+            name: Assignee display name
+        """
+        for key in (engineer, name):
+            if key and key in self.identities:
+                return self.by_email.get(self.identities[key])
+
+        for key in (engineer, name):
+            if key and '@' in key:
+                return self.by_email.get(key.lower())
+
+        return self.by_name.get(name_key(name)) if name else None
+
+
+def join_engineer_usage(cycle_times: pd.DataFrame, index: EngineerUsageIndex) -> Dict[str, Any]:
+    """
+    Attach usage intensity to each engineer's pre/post cycle times
+
+    One pass over the engineers with a hash lookup each, so the join is linear
+    in engineers plus usage actors (the per-issue and per-record work is done
+    by the groupbys that produced the inputs).
+
+    Args:
+        cycle_times: Per-engineer cycle times (ROIAnalyzer.get_engineer_cycle_times)
+        index: Usage totals by identity
+
+    Returns:
+        Dict with matched/unmatched counts and one entry per engineer: cycle
+        times, change in average days, usage totals (None if unmatched) and
+        usage per post-adoption task
+    """
+    engineers = []
+    matched_actors = set()
+    for row in cycle_times.itertuples(index=False):
+        usage = index.lookup(row.engineer, row.name)
+        if usage is not None:
+            matched_actors.add(usage['actor'])
+
+        change = ((row.post_avg_days - row.pre_avg_days) / row.pre_avg_days * 100) if row.pre_avg_days > 0 else None
+        engineers.append({
+            'engineer': row.engineer,
+            'name': row.name,
+            'actor': usage['actor'] if usage else None,
+            'pre_claude': {
+                'tasks': int(row.pre_tasks),
+                'completed_tasks': int(row.pre_completed),
+                'avg_days_per_task': round(row.pre_avg_days, 1),
+                'avg_hours_per_task': round(row.pre_avg_hours, 1)
+            },
+            'post_claude': {
+                'tasks': int(row.post_tasks),
+                'completed_tasks': int(row.post_completed),
+                'avg_days_per_task': round(row.post_avg_days, 1),
+                'avg_hours_per_task': round(row.post_avg_hours, 1)
+            },
+            'cycle_time_change_percent': round(change, 1) if change is not None else None,
+            'usage': {**{field: usage[field] for field in USAGE_FIELDS}, 'cost': round(usage['cost'], 2)} if usage else None,
+            'usage_per_post_task': {
+                'sessions': round(usage['sessions'] / row.post_tasks, 2),
+                'lines_added': round(usage['lines_added'] / row.post_tasks, 1),
+                'cost': round(usage['cost'] / row.post_tasks, 2)
+            } if usage and row.post_tasks > 0 else None
+        })
+
+    matched = sum(1 for engineer in engineers if engineer['actor'] is not None)
+    return {
+        'engineers': engineers,
+        'matched_engineers': matched,
+        'unmatched_engineers': len(engineers) - matched,
+        'unmatched_usage_actors': len(index) - len(matched_actors)
+    }
@@ -0,0 +1,124 @@
+"""
+HyperLogLog distinct counter
+Estimates the number of distinct values in fixed memory, with sketches that
+merge losslessly - e.g. daily active-user sketches combine into weekly or
+monthly counts without keeping the underlying user sets
+"""
+
+import hashlib
+import math
+import zlib
+from typing import Iterable
+
+import numpy as np
+
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+DEFAULT_ERROR_RATE = 0.01
+
+
+def precision_for_error(error_rate: float) -> int:
+    """
+    Smallest precision whose standard error is at most error_rate
+
+    The standard error of HyperLogLog with 2^p registers is about 1.04 / sqrt(2^p).
+    """
+    if not 0 < error_rate < 1:
+        raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+    precision = math.ceil(math.log2((1.04 / error_rate) ** 2))
+    return min(MAX_PRECISION, max(MIN_PRECISION, precision))
+
+
+def _hash64(value: str) -> int:
+    # Python's hash() is salted per process; sketches must agree across workers and restarts
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    """
+    Mergeable approximate distinct counter
+
+    Uses 64-bit hashes, so no large-range correction is needed, and linear
+    counting for small cardinalities, where it is more accurate.
+    """
+
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, error_rate: float = DEFAULT_ERROR_RATE, precision: int = None):
+        """
+        Args:
+            error_rate: Target relative standard error (ignored when precision is given)
+            precision: Number of index bits p (2^p one-byte registers)
+        """
+        self.precision = precision if precision is not None else precision_for_error(error_rate)
+        if not MIN_PRECISION <= self.precision <= MAX_PRECISION:
+            raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}")
+        self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+
+    @property
+    def error_rate(self) -> float:
+        """Relative standard error of count()"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, value: str):
+        """Add one value"""
+        self.update([value])
+
+    def update(self, values: Iterable[str]):
+        """Add many values (register updates are vectorized)"""
+        hashes = np.fromiter((_hash64(value) for value in values), dtype=np.uint64)
+        if not len(hashes):
+            return
+
+        value_bits = 64 - self.precision
+        index = (hashes >> np.uint64(value_bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << value_bits) - 1)
+
+        # Rank = position of the leftmost 1 bit in the remaining bits (value_bits + 1 when all zero)
+        bit_length = np.zeros(len(rest), dtype=np.int64)
+        remaining = rest.copy()
+        for shift in (32, 16, 8, 4, 2, 1):
+            wide = remaining >= np.uint64(1 << shift)
+            bit_length[wide] += shift
+            remaining[wide] >>= np.uint64(shift)
+        bit_length += (remaining > 0)
+        rank = (value_bits - bit_length + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Fold another sketch into this one (the result counts the union)"""
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge sketches of precision {self.precision} and {other.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def copy(self) -> 'HyperLogLog':
+        sketch = HyperLogLog(precision=self.precision)
+        sketch.registers[:] = self.registers
+        return sketch
+
+    def count(self) -> int:
+        """Estimated number of distinct values added"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def to_bytes(self) -> bytes:
+        """Serialize (precision byte + compressed registers; sparse sketches compress well)"""
+        return bytes([self.precision]) + zlib.compress(self.registers.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        """Load a sketch written by to_bytes"""
+        sketch = cls(precision=data[0])
+        sketch.registers[:] = np.frombuffer(zlib.decompress(data[1:]), dtype=np.uint8)
+        return sketch
@@ -0,0 +1,362 @@
+"""
+Local JIRA issue store
+Keeps fetched issues in SQLite, one partition per (JIRA site, project), with
+indexes on created date, status, priority and assignee, so analysis of one
+project or date range reads only its rows and aggregates them in SQL
+"""
+
+import csv
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from data_analyzer import ROIAnalyzer, parse_date
+
+# Export column (JiraAPIClient.export_to_csv) -> store column
+COLUMN_NAMES = {
+    'Issue Type': 'issue_type',
+    'Issue key': 'issue_key',
+    'Issue id': 'issue_id',
+    'Summary': 'summary',
+    'Description': 'description',
+    'Assignee': 'assignee',
+    'Assignee Id': 'assignee_id',
+    'Reporter': 'reporter',
+    'Reporter Id': 'reporter_id',
+    'Priority': 'priority',
+    'Status': 'status',
+    'Resolution': 'resolution',
+    'Created': 'created',
+    'Updated': 'updated',
+    'Due date': 'due_date',
+    'Custom field (Start date)': 'start_date',
+}
+
+# Columns derived on write: the created day (YYYY-MM-DD) and Due date - Start date in days
+DERIVED_COLUMNS = ['created_day', 'duration_days']
+
+STORE_COLUMNS = list(COLUMN_NAMES.values()) + DERIVED_COLUMNS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS issue_partitions (
+    site TEXT NOT NULL,
+    project TEXT NOT NULL,
+    issues INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0,
+    synced_at TEXT,
+    PRIMARY KEY (site, project)
+);
+CREATE TABLE IF NOT EXISTS issues (
+    site TEXT NOT NULL,
+    project TEXT NOT NULL,
+    {', '.join(f'{column} TEXT' for column in COLUMN_NAMES.values() if column != 'issue_id')},
+    issue_id TEXT NOT NULL,
+    created_day TEXT,
+    duration_days INTEGER,
+    PRIMARY KEY (site, project, issue_id)
+);
+CREATE INDEX IF NOT EXISTS issues_created ON issues (site, project, created_day);
+CREATE INDEX IF NOT EXISTS issues_status ON issues (site, project, status);
+CREATE INDEX IF NOT EXISTS issues_priority ON issues (site, project, priority);
+CREATE INDEX IF NOT EXISTS issues_assignee ON issues (site, project, assignee);
+CREATE INDEX IF NOT EXISTS issues_assignee_id ON issues (site, project, assignee_id);
+"""
+
+
+@lru_cache(maxsize=4096)
+def _parse_day(day: str) -> Optional[datetime]:
+    try:
+        return parse_date(day)
+    except ValueError:
+        return None
+
+
+def _day(value: Optional[str]) -> Optional[datetime]:
+    """Day of an export date string (any format parse_date reads), or None"""
+    # parse_date only keeps the day, so only the date part is parsed (and cached - exports repeat dates a lot)
+    return _parse_day(value.split()[0]) if value and value.strip() else None
+
+
+class IssueStore:
+    """
+    JIRA issues persisted in SQLite, partitioned by site and project
+
+    Rows hold the export columns plus the created day and duration, parsed
+    once on write. Every query is scoped to one partition and runs on its
+    indexes; group totals come back in the shape ROIAnalyzer builds its
+    dashboard sections from (see StoreROIAnalyzer).
+    """
+
+    # Filters queries accept -> condition on the issues table
+    FILTERS = {
+        'since': 'created_day >= ?',
+        'until': 'created_day < ?',
+        'status': 'status = ?',
+        'priority': 'priority = ?',
+        'assignee': '(assignee_id = ? OR assignee = ?)',
+    }
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+        """
+        self.db_path = db_path
+        # The database file and schema are created on first use, not here
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per call keeps this safe to use from Flask's worker threads
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def _values(site: str, project: str, row: Dict[str, Any]) -> Tuple:
+        """Store row for one export row (empty values become NULL, as pandas reads them from the CSV)"""
+        values = {
+            column: (str(row.get(export_column)) if row.get(export_column) not in (None, '') else None)
+            for export_column, column in COLUMN_NAMES.items()
+        }
+        created = _day(values['created'])
+        start, due = _day(values['start_date']), _day(values['due_date'])
+        values['created_day'] = created.strftime('%Y-%m-%d') if created else None
+        values['duration_days'] = (due - start).days if start and due else None
+        return (site, project, *(values[column] for column in STORE_COLUMNS))
+
+    def _write(self, conn: sqlite3.Connection, site: str, project: str, rows: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+        """Insert or replace rows by issue id; returns (added, updated)"""
+        before = conn.execute(
+            'SELECT COUNT(*) FROM issues WHERE site = ? AND project = ?', (site, project)
+        ).fetchone()[0]
+
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(self._values(site, project, row))
+            if len(batch) >= 1000:
+                written += self._write_batch(conn, batch)
+                batch = []
+        written += self._write_batch(conn, batch)
+
+        after = conn.execute(
+            'SELECT COUNT(*) FROM issues WHERE site = ? AND project = ?', (site, project)
+        ).fetchone()[0]
+        return after - before, written - (after - before)
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, batch: List[Tuple]) -> int:
+        if not batch:
+            return 0
+        conn.executemany(
+            f"""
+            INSERT INTO issues (site, project, {', '.join(STORE_COLUMNS)})
+            VALUES (?, ?, {', '.join('?' * len(STORE_COLUMNS))})
+            ON CONFLICT (site, project, issue_id) DO UPDATE SET
+                {', '.join(f'{column} = excluded.{column}' for column in STORE_COLUMNS if column != 'issue_id')}
+            """,
+            batch
+        )
+        return len(batch)
+
+    @staticmethod
+    def _save_partition(conn: sqlite3.Connection, site: str, project: str) -> int:
+        """Refresh a partition's issue count and bump its version; returns the issue count"""
+        issues = conn.execute(
+            'SELECT COUNT(*) FROM issues WHERE site = ? AND project = ?', (site, project)
+        ).fetchone()[0]
+        conn.execute(
+            """
+            INSERT INTO issue_partitions (site, project, issues, version, synced_at)
+            VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT (site, project) DO UPDATE SET
+                issues = excluded.issues, version = version + 1, synced_at = excluded.synced_at
+            """,
+            (site, project, issues, datetime.now().isoformat(timespec='seconds'))
+        )
+        return issues
+
+    def replace_partition(self, site: str, project: str, rows: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Replace a project's issues (full sync)
+
+        Args:
+            site: JIRA site base URL
+            project: Project name or key
+            rows: Export rows (as flattened by JiraAPIClient)
+
+        Returns:
+            Dict with added, updated and total issue counts
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM issues WHERE site = ? AND project = ?', (site, project))
+            added, updated = self._write(conn, site, project, rows)
+            total = self._save_partition(conn, site, project)
+
+        print(f"✅ Stored {total} issues for {project} ({site})")
+        return {'added': added, 'updated': updated, 'total': total}
+
+    def replace_partition_from_csv(self, site: str, project: str, csv_path: str) -> Dict[str, int]:
+        """
+        Replace a project's issues with a CSV export's rows, read one row at a time
+
+        Lets a streamed export be stored without holding its issues in memory.
+
+        Args:
+            site: JIRA site base URL
+            project: Project name or key
+            csv_path: CSV written by JiraAPIClient.export_to_csv or upsert_csv
+
+        Returns:
+            Dict with added, updated and total issue counts
+        """
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            return self.replace_partition(site, project, csv.DictReader(f))
+
+    def upsert(self, site: str, project: str, rows: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert or replace issues by issue id, keeping the rest of the project (incremental sync)
+
+        Args:
+            site: JIRA site base URL
+            project: Project name or key
+            rows: Export rows (as flattened by JiraAPIClient)
+
+        Returns:
+            Dict with added, updated and total issue counts
+        """
+        with closing(self._connect()) as conn, conn:
+            added, updated = self._write(conn, site, project, rows)
+            total = self._save_partition(conn, site, project)
+
+        print(f"✅ Upserted {added + updated} issues for {project} ({site}): {added} added, {updated} updated")
+        return {'added': added, 'updated': updated, 'total': total}
+
+    def partitions(self, project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Stored (site, project) partitions with issue count, version and last sync time"""
+        query = 'SELECT * FROM issue_partitions'
+        params: Tuple = ()
+        if project is not None:
+            query += ' WHERE project = ?'
+            params = (project,)
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(query + ' ORDER BY site, project', params)]
+
+    def partition(self, site: str, project: str) -> Optional[Dict[str, Any]]:
+        """State of one partition, or None if it has never been synced"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT * FROM issue_partitions WHERE site = ? AND project = ?', (site, project)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def _where(self, site: str, project: str, filters: Dict[str, Optional[str]]) -> Tuple[str, List[Any]]:
+        """WHERE clause for a partition plus any filters (see FILTERS)"""
+        conditions = ['site = ?', 'project = ?']
+        params: List[Any] = [site, project]
+        for name, value in filters.items():
+            if name not in self.FILTERS:
+                raise ValueError(f"Unknown filter: {name}. Must be one of {', '.join(self.FILTERS)}")
+            if value is None:
+                continue
+            conditions.append(self.FILTERS[name])
+            params.extend([value] * self.FILTERS[name].count('?'))
+        return ' AND '.join(conditions), params
+
+    def group_totals(self, site: str, project: str, adoption_date: str, **filters: Optional[str]) -> pd.DataFrame:
+        """
+        Task totals per (Period, created day, Status, Priority), aggregated in SQL
+
+        Same columns as ROIAnalyzer._group_totals at day granularity, over the
+        rows ROIAnalyzer keeps (due date on or after start date).
+
+        Args:
+            site: JIRA site base URL
+            project: Project name or key
+            adoption_date: Claude adoption date (YYYY-MM-DD)
+            **filters: since/until (created day, YYYY-MM-DD), status, priority, assignee
+
+        Returns:
+            DataFrame with ROIAnalyzer.GROUP_KEYS and GROUP_AGGREGATIONS columns
+        """
+        where, params = self._where(site, project, filters)
+        hours = f'duration_days * {ROIAnalyzer.HOURS_PER_DAY}'
+        query = f"""
+            SELECT
+                CASE WHEN created_day >= ? THEN 'Post-Claude' ELSE 'Pre-Claude' END AS Period,
+                created_day AS Bucket_Start,
+                status AS Status,
+                priority AS Priority,
+                COUNT(*) AS tasks,
+                COUNT(issue_key) AS keys,
+                SUM(status = 'Done') AS completed,
+                SUM({hours}) AS hours,
+                SUM(duration_days) AS days,
+                SUM({hours} * {ROIAnalyzer.HOURLY_RATE}) AS cost,
+                MAX(created_day) AS last_created
+            FROM issues
+            WHERE {where} AND duration_days >= 0
+            GROUP BY 1, 2, 3, 4
+        """
+        with closing(self._connect()) as conn:
+            groups = pd.read_sql_query(query, conn, params=[adoption_date] + params)
+
+        groups['Bucket_Start'] = pd.to_datetime(groups['Bucket_Start'])
+        groups['last_created'] = pd.to_datetime(groups['last_created'])
+        return groups.astype({'hours': float, 'days': float, 'cost': float})
+
+    def engineer_totals(self, site: str, project: str, adoption_date: str, **filters: Optional[str]) -> pd.DataFrame:
+        """
+        Task totals per (engineer, Period), aggregated in SQL
+
+        Engineers are identified like ROIAnalyzer.get_engineer_cycle_times:
+        Assignee Id, or the Assignee name for rows without one; unassigned
+        issues are skipped.
+
+        Returns:
+            DataFrame with engineer, Period, name (from the engineer's first
+            stored row), first_row, tasks, completed, days and hours
+        """
+        where, params = self._where(site, project, filters)
+        query = f"""
+            SELECT
+                COALESCE(NULLIF(TRIM(assignee_id), ''), assignee) AS engineer,
+                CASE WHEN created_day >= ? THEN 'Post-Claude' ELSE 'Pre-Claude' END AS Period,
+                MIN(rowid) AS first_row,
+                assignee AS name,
+                COUNT(*) AS tasks,
+                SUM(status = 'Done') AS completed,
+                SUM(duration_days) AS days,
+                SUM(duration_days * {ROIAnalyzer.HOURS_PER_DAY}) AS hours
+            FROM issues
+            WHERE {where} AND duration_days >= 0 AND assignee IS NOT NULL AND assignee != 'Unassigned'
+            GROUP BY 1, 2
+        """
+        # SQLite takes bare columns (name) from the row that MIN() picked
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(query, conn, params=[adoption_date] + params)
+
+    def issues_frame(self, site: str, project: str, **filters: Optional[str]) -> pd.DataFrame:
+        """
+        A partition's issues with the export's column names (e.g. for IssueDataset)
+
+        Args:
+            site: JIRA site base URL
+            project: Project name or key
+            **filters: since/until (created day, YYYY-MM-DD), status, priority, assignee
+        """
+        where, params = self._where(site, project, filters)
+        columns = ', '.join(f'{column} AS "{export_column}"' for export_column, column in COLUMN_NAMES.items())
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(f'SELECT {columns} FROM issues WHERE {where} ORDER BY rowid', conn, params=params)
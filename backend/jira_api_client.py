@@ -1,18 +1,177 @@
 # jira_api_client.py
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 import json
 import csv
-from datetime import datetime
+import hashlib
+import http.cookiejar
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import os
-from typing import List, Dict, Optional
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Tuple
+
+from issue_store import IssueStore
+
+# Keep-alive connections kept per JIRA site
+JIRA_POOL_SIZE = int(os.getenv('JIRA_POOL_SIZE', '10'))
+
+# Sessions kept open (least recently used are closed first)
+JIRA_MAX_SESSIONS = int(os.getenv('JIRA_MAX_SESSIONS', '16'))
+
+# Columns of the CSV export (matching the JIRA export template)
+EXPORT_COLUMNS = [
+    'Issue Type',
+    'Issue key',
+    'Issue id',
+    'Summary',
+    'Description',
+    'Assignee',
+    'Assignee Id',
+    'Reporter',
+    'Reporter Id',
+    'Priority',
+    'Status',
+    'Resolution',
+    'Created',
+    'Updated',
+    'Due date',
+    'Custom field (Start date)'
+]
+
+# JQL dates are read in the user's time zone; when it is unknown, widen
+# updated-since queries by the largest UTC offset so no change is missed
+UNKNOWN_ZONE_MARGIN = timedelta(hours=14)
+
+# Seconds to wait for a search page before giving up on it
+JIRA_TIMEOUT = 60
+
+# Rate-limited (429), unavailable (502-504) and timed-out searches are retried with
+# exponential backoff (base seconds, doubled per attempt) unless JIRA sends Retry-After
+JIRA_MAX_RETRIES = int(os.getenv('JIRA_MAX_RETRIES', '5'))
+JIRA_RETRY_BACKOFF = float(os.getenv('JIRA_RETRY_BACKOFF', '1'))
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+# Longest Retry-After (seconds) waited out; a longer one fails the search instead of stalling it
+JIRA_MAX_RETRY_AFTER = int(os.getenv('JIRA_MAX_RETRY_AFTER', str(JIRA_TIMEOUT)))
+
+# Shared sessions and their pool sizes, keyed by (site URL, credential hash)
+_jira_sessions: 'OrderedDict[Tuple[str, str], Tuple[requests.Session, int]]' = OrderedDict()
+_jira_sessions_lock = threading.Lock()
+
+
+class JiraFetchError(Exception):
+    """A search page could not be fetched, so the query's result would be incomplete"""
+
+
+def _credential_hash(email: str, api_token: str) -> str:
+    """Registry key for a credential pair (the token itself is not used as a key)"""
+    return hashlib.sha256(f'{email}:{api_token}'.encode('utf-8')).hexdigest()
+
+
+def get_jira_session(jira_url: str, email: str, api_token: str, pool_size: Optional[int] = None) -> requests.Session:
+    """
+    Pooled keep-alive session for a JIRA site and credentials
+
+    Sessions are shared by every client built for the same site and
+    credentials, so repeated fetches from different Flask requests reuse open
+    TCP/TLS connections instead of handshaking for each call. A shared
+    session refuses cookies (every request authenticates with basic auth), so
+    its cookie jar stays empty and nothing about it changes after creation;
+    the only state requests touch is urllib3's connection pool, which is
+    thread-safe. At most JIRA_MAX_SESSIONS are kept; the least recently used
+    is closed when another is needed.
+
+    Args:
+        jira_url: JIRA instance URL
+        email: JIRA account email
+        api_token: JIRA API token
+        pool_size: Connections kept open to the site (defaults to JIRA_POOL_SIZE;
+            only applies when the session is first created)
+    """
+    key = (jira_url.rstrip('/'), _credential_hash(email, api_token))
+    with _jira_sessions_lock:
+        if key in _jira_sessions:
+            _jira_sessions.move_to_end(key)
+        else:
+            pool_size = pool_size or JIRA_POOL_SIZE
+            session = requests.Session()
+            session.auth = HTTPBasicAuth(email, api_token)
+            # No cookie is ever stored, so concurrent requests never share or race on the jar
+            session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            session.headers.update({
+                'Accept': 'application/json',
+                'Content-Type': 'application/json'
+            })
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _jira_sessions[key] = (session, pool_size)
+
+            while len(_jira_sessions) > JIRA_MAX_SESSIONS:
+                # A client still holding an evicted session keeps working: its
+                # next request just opens a new connection
+                _, (evicted, _) = _jira_sessions.popitem(last=False)
+                evicted.close()
+        return _jira_sessions[key][0]
+
+
+def jira_session_stats() -> List[Dict[str, Any]]:
+    """Pooled JIRA sessions (site and pool size, no credentials)"""
+    with _jira_sessions_lock:
+        return [
+            {'jira_url': jira_url, 'pool_size': pool_size}
+            for (jira_url, _), (_, pool_size) in _jira_sessions.items()
+        ]
+
+
+def close_jira_sessions():
+    """Close every pooled session and its connections"""
+    with _jira_sessions_lock:
+        for session, _ in _jira_sessions.values():
+            session.close()
+        _jira_sessions.clear()
+
+
+class IssueStream:
+    """
+    Single-pass iterator over a query's issues, fetched one page at a time
+
+    Counts the issues and pages it has yielded and tracks the latest `updated`
+    time, so a sync can record its size and watermark without keeping the
+    issues (see JiraAPIClient.stream_issues).
+    """
+
+    def __init__(self, pages: Iterator[List[Dict]]):
+        """
+        Args:
+            pages: Pages of issues (e.g. JiraAPIClient.iter_issue_pages)
+        """
+        self.pages = pages
+        self.issues = 0
+        self.page_count = 0
+        self.latest_updated: Optional[datetime] = None
+
+    def __iter__(self) -> Iterator[Dict]:
+        for page in self.pages:
+            self.page_count += 1
+            self.issues += len(page)
+            latest = JiraAPIClient.latest_updated(page)
+            if latest is not None and (self.latest_updated is None or latest > self.latest_updated):
+                self.latest_updated = latest
+            yield from page
+
 
 class JiraAPIClient:
     """
     JIRA API Client for pulling task data from JIRA Cloud or Server
     """
 
-    def __init__(self, jira_url: str, email: str, api_token: str):
+    def __init__(self, jira_url: str, email: str, api_token: str, pool_size: Optional[int] = None):
         """
         Initialize JIRA API client
 
@@ -20,25 +179,22 @@ class JiraAPIClient:
             jira_url: Your JIRA instance URL (e.g., 'https://yourcompany.atlassian.net')
             email: Your JIRA account email
             api_token: Your JIRA API token (generate from: Account Settings > Security > API Tokens)
+            pool_size: Connections kept open to the site (see get_jira_session)
         """
         self.jira_url = jira_url.rstrip('/')
-        self.auth = HTTPBasicAuth(email, api_token)
-        self.headers = {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        }
+        # Requests go through the site's shared session (auth and headers are set on it)
+        self.session = get_jira_session(self.jira_url, email, api_token, pool_size)
+        # IANA time zone of the JIRA user (set by test_connection), used to write JQL dates
+        self.time_zone = None
 
     def test_connection(self) -> bool:
         """Test the connection to JIRA"""
         try:
             test_url = f'{self.jira_url}/rest/api/3/myself'
             print(f"\n🔍 Testing connection to: {test_url}")
-            print(f"   Auth: {self.auth.username}")
 
-            response = requests.get(
+            response = self.session.get(
                 test_url,
-                headers=self.headers,
-                auth=self.auth,
                 timeout=10
             )
 
@@ -46,6 +202,7 @@ class JiraAPIClient:
 
             if response.status_code == 200:
                 user_data = response.json()
+                self.time_zone = user_data.get('timeZone')
                 print(f"✅ Connected to JIRA as: {user_data.get('displayName', 'Unknown')}")
                 return True
             else:
@@ -61,10 +218,8 @@ class JiraAPIClient:
     def get_projects(self) -> List[Dict]:
         """Retrieve all accessible projects"""
         try:
-            response = requests.get(
-                f'{self.jira_url}/rest/api/3/project',
-                headers=self.headers,
-                auth=self.auth
+            response = self.session.get(
+                f'{self.jira_url}/rest/api/3/project'
             )
 
             if response.status_code == 200:
@@ -91,48 +246,111 @@ class JiraAPIClient:
 
         Returns:
             Dict containing issues and metadata
+
+        Raises:
+            JiraFetchError: If the page can't be fetched
         """
-        try:
-            # Use GET with search/jql endpoint (correct API v3 format)
-            params = {
-                'jql': jql,
-                'startAt': start_at,
-                'maxResults': max_results,
-                'fields': 'issuetype,summary,description,assignee,reporter,priority,status,resolution,created,updated,duedate,customfield_10015'
-            }
-
-            response = requests.get(
-                f'{self.jira_url}/rest/api/3/search/jql',
-                headers=self.headers,
-                auth=self.auth,
-                params=params
-            )
+        # Use GET with search/jql endpoint (correct API v3 format)
+        return self._search({
+            'jql': jql,
+            'startAt': start_at,
+            'maxResults': max_results,
+            'fields': 'issuetype,summary,description,assignee,reporter,priority,status,resolution,created,updated,duedate,customfield_10015'
+        })
+
+    def _search(self, params: Dict[str, Any]) -> Dict:
+        """
+        Fetch one search page, retrying rate limits and transient failures
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"❌ Search failed: {response.status_code} - {response.text}")
-                return {'issues': [], 'total': 0}
-        except Exception as e:
-            print(f"❌ Search error: {str(e)}")
-            return {'issues': [], 'total': 0}
+        Failures raise instead of returning an empty page: an empty page ends
+        pagination, so a failed request would silently truncate the result.
 
-    def get_all_issues(self, jql: str, max_total: Optional[int] = None) -> List[Dict]:
+        Raises:
+            JiraFetchError: On a request error or a non-200 response (after retries)
+        """
+        for attempt in range(JIRA_MAX_RETRIES + 1):
+            retry_after = None
+            try:
+                response = self.session.get(
+                    f'{self.jira_url}/rest/api/3/search/jql',
+                    params=params,
+                    timeout=JIRA_TIMEOUT
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = f"{type(e).__name__}: {e}"
+            except requests.RequestException as e:
+                print(f"❌ Search error: {type(e).__name__}: {str(e)}")
+                raise JiraFetchError(f"JIRA search failed: {type(e).__name__}: {e}") from e
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                error = f"{response.status_code} - {response.text[:200]}"
+                if response.status_code not in RETRYABLE_STATUSES:
+                    print(f"❌ Search failed: {response.status_code} - {response.text[:500]}")
+                    raise JiraFetchError(f"JIRA search failed: {error}")
+                retry_after = response.headers.get('Retry-After')
+
+            if attempt == JIRA_MAX_RETRIES:
+                break
+            delay = JIRA_RETRY_BACKOFF * 2 ** attempt
+            if retry_after and retry_after.strip().isdigit():
+                delay = int(retry_after)
+                if delay > JIRA_MAX_RETRY_AFTER:
+                    print(f"❌ Search failed ({error}); JIRA asked to retry in {delay}s")
+                    raise JiraFetchError(f"JIRA search failed: {error} (retry requested in {delay}s, "
+                                         f"more than JIRA_MAX_RETRY_AFTER={JIRA_MAX_RETRY_AFTER}s)")
+            print(f"⏳ Search failed ({error}); retrying in {delay:g}s ({attempt + 1}/{JIRA_MAX_RETRIES})")
+            time.sleep(delay)
+
+        print(f"❌ Search failed after {JIRA_MAX_RETRIES} retries: {error}")
+        raise JiraFetchError(f"JIRA search failed after {JIRA_MAX_RETRIES} retries: {error}")
+
+    def get_all_issues(self, jql: str, max_total: Optional[int] = None, workers: int = 1) -> List[Dict]:
         """
         Retrieve all issues matching a JQL query (handles pagination with nextPageToken)
 
         Args:
             jql: JQL query string
             max_total: Maximum total issues to retrieve (None for all)
+            workers: Page chains fetched concurrently; above 1 the query is split
+                into created-date windows (see get_all_issues_parallel)
 
         Returns:
             List of all issues
+
+        Raises:
+            JiraFetchError: If any page can't be fetched (no partial result is returned)
         """
-        all_issues = []
-        next_page_token = None
-        batch_size = 100
+        if workers > 1:
+            return self.get_all_issues_parallel(jql, workers=workers, max_total=max_total)
 
         print(f"\n🔍 Searching JIRA with query: {jql}")
+        all_issues = self._fetch_page_chain(jql, max_total)
+        print(f"✅ Total issues retrieved: {len(all_issues)}")
+        return all_issues
+
+    def _fetch_page_chain(self, jql: str, max_total: Optional[int] = None) -> List[Dict]:
+        """Follow one query's nextPageToken chain and collect every page"""
+        return [issue for page in self.iter_issue_pages(jql, max_total) for issue in page]
+
+    def iter_issue_pages(self, jql: str, max_total: Optional[int] = None) -> Iterator[List[Dict]]:
+        """
+        Yield the issues matching a JQL query one page at a time (follows nextPageToken)
+
+        The next page is only requested once the caller is done with the current
+        one, so a caller that writes each page out holds one page in memory
+        whatever the project size.
+
+        Args:
+            jql: JQL query string
+            max_total: Maximum total issues to yield (None for all)
+
+        Raises:
+            JiraFetchError: If a page can't be fetched (after the pages already yielded)
+        """
+        retrieved = 0
+        next_page_token = None
+        batch_size = 100
 
         while True:
             # Use nextPageToken for pagination if available
@@ -148,20 +366,183 @@ class JiraAPIClient:
             if not issues:
                 break
 
-            all_issues.extend(issues)
-            print(f"  Retrieved {len(all_issues)} issues... (isLast: {is_last})")
+            if max_total and retrieved + len(issues) > max_total:
+                issues = issues[:max_total - retrieved]
+            retrieved += len(issues)
+            print(f"  Retrieved {retrieved} issues... (isLast: {is_last})")
+            yield issues
 
             # Check if this is the last page
             if is_last or not next_page_token:
                 break
 
-            if max_total and len(all_issues) >= max_total:
-                all_issues = all_issues[:max_total]
+            if max_total and retrieved >= max_total:
                 break
 
+    def stream_issues(self, jql: str, max_total: Optional[int] = None) -> 'IssueStream':
+        """
+        Issues matching a JQL query as a single-pass stream, fetched page by page
+
+        Pass the stream to export_to_csv or upsert_csv to flatten and write each
+        page as it arrives instead of collecting the project first.
+
+        Args:
+            jql: JQL query string
+            max_total: Maximum total issues to retrieve (None for all)
+
+        Returns:
+            IssueStream (iterate it once; it counts issues and pages as it goes). Iterating
+            raises JiraFetchError if a page can't be fetched, so writers must not
+            keep what they wrote before the error (export_to_csv and upsert_csv don't)
+        """
+        print(f"\n🔍 Streaming JIRA issues with query: {jql}")
+        return IssueStream(self.iter_issue_pages(jql, max_total))
+
+    def get_all_issues_parallel(self, jql: str, workers: int = 4, partitions: Optional[int] = None,
+                                max_total: Optional[int] = None) -> List[Dict]:
+        """
+        Retrieve all issues matching a JQL query, fetching created-date windows concurrently
+
+        The query is split into disjoint, contiguous created-date windows (the
+        first and last are open-ended, so every issue falls in exactly one
+        whatever the site's time zone), and each window's page chain is fetched
+        on a bounded thread pool sharing the client's pooled session. Windows
+        are merged in date order and de-duplicated by issue id, so the result
+        holds the same issues as the serial path, in the same order when the
+        query is ordered by created ascending.
+
+        Args:
+            jql: JQL query string (an ORDER BY clause is applied within each window)
+            workers: Windows fetched at once (keep at or below the session's pool size)
+            partitions: Number of windows (defaults to workers)
+            max_total: Maximum total issues to return (None for all)
+
+        Returns:
+            List of all issues
+
+        Raises:
+            JiraFetchError: If the date range or any window's page can't be fetched
+        """
+        base_jql, order_by = self._split_order_by(jql)
+        windows = self._created_windows(base_jql, partitions or workers)
+        print(f"\n🔍 Searching JIRA with query: {jql} ({len(windows)} created-date windows, {workers} workers)")
+
+        window_queries = []
+        for start, end in windows:
+            clauses = [f'({base_jql})'] if base_jql.strip() else []
+            if start:
+                clauses.append(f'created >= "{start}"')
+            if end:
+                clauses.append(f'created < "{end}"')
+            window_queries.append(' AND '.join(clauses) + order_by)
+
+        # The first failed window raises out of map; windows not yet started are cancelled
+        executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        try:
+            results = list(executor.map(self._fetch_page_chain, window_queries))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        all_issues = []
+        seen = set()
+        for issues in results:
+            for issue in issues:
+                issue_id = issue.get('id')
+                if issue_id not in seen:
+                    seen.add(issue_id)
+                    all_issues.append(issue)
+
+        if max_total:
+            all_issues = all_issues[:max_total]
+
         print(f"✅ Total issues retrieved: {len(all_issues)}")
         return all_issues
 
+    @staticmethod
+    def _split_order_by(jql: str) -> Tuple[str, str]:
+        """Split a JQL query into its filter and its ORDER BY clause ('' if none)"""
+        match = re.search(r'\s+order\s+by\s+.*$', jql, flags=re.IGNORECASE | re.DOTALL)
+        return (jql[:match.start()], match.group(0)) if match else (jql, '')
+
+    def updated_since_jql(self, jql: str, watermark: datetime) -> str:
+        """
+        Restrict a JQL query to issues updated at or after a point in time
+
+        JQL only takes minute precision in the user's time zone, so the bound is
+        rounded down (re-fetching an issue or two is harmless when upserting).
+
+        Args:
+            jql: JQL query string (its ORDER BY clause is kept)
+            watermark: Time zone aware datetime, e.g. from latest_updated
+
+        Returns:
+            JQL query string
+        """
+        try:
+            zone = ZoneInfo(self.time_zone) if self.time_zone else None
+        except (ZoneInfoNotFoundError, ValueError):
+            zone = None
+        if zone is None:
+            since = (watermark - UNKNOWN_ZONE_MARGIN).astimezone(timezone.utc)
+        else:
+            since = watermark.astimezone(zone)
+
+        base_jql, order_by = self._split_order_by(jql)
+        clause = f'updated >= "{since.strftime("%Y-%m-%d %H:%M")}"'
+        return (f'({base_jql}) AND {clause}' if base_jql.strip() else clause) + order_by
+
+    @staticmethod
+    def latest_updated(issues: List[Dict]) -> Optional[datetime]:
+        """Most recent `updated` time (time zone aware) among issues, or None"""
+        latest = None
+        for issue in issues:
+            value = issue.get('fields', {}).get('updated')
+            if not value:
+                continue
+            try:
+                updated = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            if updated.tzinfo is None:
+                updated = updated.replace(tzinfo=timezone.utc)
+            if latest is None or updated > latest:
+                latest = updated
+        return latest
+
+    def _created_bounds(self, jql: str) -> Tuple[Optional[str], Optional[str]]:
+        """Created date (YYYY-MM-DD) of the oldest and newest issue matching a query"""
+        bounds = []
+        for direction in ('ASC', 'DESC'):
+            issues = self._search(
+                {'jql': f'{jql} ORDER BY created {direction}', 'maxResults': 1, 'fields': 'created'}
+            ).get('issues', [])
+            created = issues[0].get('fields', {}).get('created', '') if issues else ''
+            bounds.append(created[:10] or None)
+        return bounds[0], bounds[1]
+
+    def _created_windows(self, jql: str, partitions: int) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Contiguous created-date windows [start, end) covering a query
+
+        The first window has no start and the last no end; with one window (or
+        when the query matches no issues) the query is not split at all.
+
+        Raises:
+            JiraFetchError: If the date range can't be fetched
+        """
+        first, last = self._created_bounds(jql)
+        if partitions <= 1 or not first or not last:
+            return [(None, None)]
+
+        first_day = datetime.strptime(first, '%Y-%m-%d')
+        span_days = (datetime.strptime(last, '%Y-%m-%d') - first_day).days + 1
+        boundaries = sorted({
+            (first_day + timedelta(days=span_days * i // partitions)).strftime('%Y-%m-%d')
+            for i in range(1, partitions)
+        })
+        edges = [None] + boundaries + [None]
+        return list(zip(edges[:-1], edges[1:]))
+
     def search_issues_with_token(self, jql: str, max_results: int = 100, page_token: str = None) -> Dict:
         """
         Search for issues using nextPageToken for pagination
@@ -173,127 +554,172 @@ class JiraAPIClient:
 
         Returns:
             Dict containing issues and metadata
+
+        Raises:
+            JiraFetchError: If the page can't be fetched
         """
-        try:
-            params = {
-                'jql': jql,
-                'maxResults': max_results,
-                'fields': 'issuetype,summary,description,assignee,reporter,priority,status,resolution,created,updated,duedate,customfield_10015'
-            }
-
-            if page_token:
-                params['nextPageToken'] = page_token
-
-            response = requests.get(
-                f'{self.jira_url}/rest/api/3/search/jql',
-                headers=self.headers,
-                auth=self.auth,
-                params=params
-            )
+        params = {
+            'jql': jql,
+            'maxResults': max_results,
+            'fields': 'issuetype,summary,description,assignee,reporter,priority,status,resolution,created,updated,duedate,customfield_10015'
+        }
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"❌ Search failed: {response.status_code} - {response.text}")
-                return {'issues': [], 'isLast': True}
-        except Exception as e:
-            print(f"❌ Search error: {str(e)}")
-            return {'issues': [], 'isLast': True}
+        if page_token:
+            params['nextPageToken'] = page_token
+
+        return self._search(params)
+
+    def _issue_to_row(self, issue: Dict) -> Dict[str, str]:
+        """Flatten one JIRA issue into a CSV export row (EXPORT_COLUMNS)"""
+        fields = issue.get('fields', {})
+
+        # Extract assignee info
+        assignee = fields.get('assignee', {}) or {}
+        assignee_name = assignee.get('displayName', 'Unassigned')
+        assignee_id = assignee.get('accountId', '')
+
+        # Extract reporter info
+        reporter = fields.get('reporter', {}) or {}
+        reporter_name = reporter.get('displayName', '')
+        reporter_id = reporter.get('accountId', '')
+
+        # Format dates
+        created = fields.get('created', '')
+        if created:
+            created = self._format_jira_date(created)
+
+        updated = fields.get('updated', '')
+        if updated:
+            updated = self._format_jira_date(updated)
+
+        due_date = fields.get('duedate', '')
+        if due_date:
+            due_date = self._format_jira_date(due_date, include_time=True)
+
+        # Look for custom start date field (customfield_10015 for this JIRA instance)
+        start_date = ''
+        start_date_value = fields.get('customfield_10015', '')
+        if start_date_value:
+            start_date = self._format_jira_date(start_date_value, include_time=True)
+
+        return {
+            'Issue Type': fields.get('issuetype', {}).get('name', ''),
+            'Issue key': issue.get('key', ''),
+            'Issue id': issue.get('id', ''),
+            'Summary': fields.get('summary', ''),
+            'Description': fields.get('description', ''),
+            'Assignee': assignee_name,
+            'Assignee Id': assignee_id,
+            'Reporter': reporter_name,
+            'Reporter Id': reporter_id,
+            'Priority': fields.get('priority', {}).get('name', ''),
+            'Status': fields.get('status', {}).get('name', ''),
+            'Resolution': fields.get('resolution', {}).get('name', '') if fields.get('resolution') else '',
+            'Created': created,
+            'Updated': updated,
+            'Due date': due_date,
+            'Custom field (Start date)': start_date
+        }
 
-    def export_to_csv(self, issues: List[Dict], filename: str = 'jira_export.csv'):
+    def export_to_csv(self, issues: Iterable[Dict], filename: str = 'jira_export.csv') -> int:
         """
         Export issues to CSV format
 
+        Issues are flattened and written one row at a time, so exporting an
+        IssueStream keeps only its current page in memory. The file is written
+        under a temporary name and moved into place once complete.
+
         Args:
-            issues: List of JIRA issues
+            issues: JIRA issues (a list, or an IssueStream to write pages as they arrive)
             filename: Output CSV filename
+
+        Returns:
+            Number of issues exported
         """
-        if not issues:
+        temp_filename = f'{filename}.tmp'
+        exported = 0
+        try:
+            with open(temp_filename, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+                writer.writeheader()
+                for issue in issues:
+                    writer.writerow(self._issue_to_row(issue))
+                    exported += 1
+        except Exception:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+
+        if not exported:
+            os.remove(temp_filename)
             print("❌ No issues to export")
-            return
-
-        # Define CSV columns (matching your template)
-        columns = [
-            'Issue Type',
-            'Issue key',
-            'Issue id',
-            'Summary',
-            'Description',
-            'Assignee',
-            'Assignee Id',
-            'Reporter',
-            'Reporter Id',
-            'Priority',
-            'Status',
-            'Resolution',
-            'Created',
-            'Updated',
-            'Due date',
-            'Custom field (Start date)'
-        ]
+            return 0
+
+        os.replace(temp_filename, filename)
+        print(f"✅ Exported {exported} issues to {filename}")
+        return exported
 
-        rows = []
+    def upsert_csv(self, issues: Iterable[Dict], filename: str = 'jira_export.csv') -> Dict[str, int]:
+        """
+        Insert or replace issues in an existing CSV export, matched by Issue id
 
+        Changed issues are rewritten in place, new ones appended and all other
+        rows kept as they are. The file is replaced atomically, so readers never
+        see a partial export.
+
+        Args:
+            issues: JIRA issues (e.g. those updated since the last sync; a list or an IssueStream)
+            filename: CSV export to update (created if missing)
+
+        Returns:
+            Dict with added, updated and total issue counts
+        """
+        rows = {}
+        if os.path.exists(filename):
+            with open(filename, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    rows[row['Issue id']] = row
+
+        added = updated = 0
         for issue in issues:
-            fields = issue.get('fields', {})
-
-            # Extract assignee info
-            assignee = fields.get('assignee', {}) or {}
-            assignee_name = assignee.get('displayName', 'Unassigned')
-            assignee_id = assignee.get('accountId', '')
-
-            # Extract reporter info
-            reporter = fields.get('reporter', {}) or {}
-            reporter_name = reporter.get('displayName', '')
-            reporter_id = reporter.get('accountId', '')
-
-            # Format dates
-            created = fields.get('created', '')
-            if created:
-                created = self._format_jira_date(created)
-
-            updated = fields.get('updated', '')
-            if updated:
-                updated = self._format_jira_date(updated)
-
-            due_date = fields.get('duedate', '')
-            if due_date:
-                due_date = self._format_jira_date(due_date, include_time=True)
-
-            # Look for custom start date field (customfield_10015 for this JIRA instance)
-            start_date = ''
-            start_date_value = fields.get('customfield_10015', '')
-            if start_date_value:
-                start_date = self._format_jira_date(start_date_value, include_time=True)
-
-            row = {
-                'Issue Type': fields.get('issuetype', {}).get('name', ''),
-                'Issue key': issue.get('key', ''),
-                'Issue id': issue.get('id', ''),
-                'Summary': fields.get('summary', ''),
-                'Description': fields.get('description', ''),
-                'Assignee': assignee_name,
-                'Assignee Id': assignee_id,
-                'Reporter': reporter_name,
-                'Reporter Id': reporter_id,
-                'Priority': fields.get('priority', {}).get('name', ''),
-                'Status': fields.get('status', {}).get('name', ''),
-                'Resolution': fields.get('resolution', {}).get('name', '') if fields.get('resolution') else '',
-                'Created': created,
-                'Updated': updated,
-                'Due date': due_date,
-                'Custom field (Start date)': start_date
-            }
-
-            rows.append(row)
-
-        # Write to CSV
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=columns)
-            writer.writeheader()
-            writer.writerows(rows)
-
-        print(f"✅ Exported {len(rows)} issues to {filename}")
+            row = self._issue_to_row(issue)
+            issue_id = str(row['Issue id'])
+            if issue_id in rows:
+                updated += 1
+            else:
+                added += 1
+            rows[issue_id] = row
+
+        if added or updated:
+            temp_filename = f'{filename}.tmp'
+            with open(temp_filename, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(rows.values())
+            os.replace(temp_filename, filename)
+
+        print(f"✅ Upserted {added + updated} issues into {filename} ({added} added, {updated} updated, {len(rows)} total)")
+        return {'added': added, 'updated': updated, 'total': len(rows)}
+
+    def export_to_store(self, issues: List[Dict], store: IssueStore, project: str,
+                        replace: bool = True) -> Dict[str, int]:
+        """
+        Write issues into this site's partition of an issue store for a project
+
+        Args:
+            issues: List of JIRA issues (flattened like export_to_csv)
+            store: Issue store to write to
+            project: Project name or key
+            replace: Replace the project's stored issues (full sync); otherwise
+                insert or replace by Issue id (incremental sync)
+
+        Returns:
+            Dict with added, updated and total issue counts
+        """
+        rows = (self._issue_to_row(issue) for issue in issues)
+        if replace:
+            return store.replace_partition(self.jira_url, project, rows)
+        return store.upsert(self.jira_url, project, rows)
 
     def _format_jira_date(self, date_string: str, include_time: bool = True) -> str:
         """Format JIRA date to dd/MMM/yy h:mm a format"""
@@ -311,10 +737,8 @@ class JiraAPIClient:
     def get_custom_fields(self) -> List[Dict]:
         """Get all custom fields in JIRA"""
         try:
-            response = requests.get(
-                f'{self.jira_url}/rest/api/3/field',
-                headers=self.headers,
-                auth=self.auth
+            response = self.session.get(
+                f'{self.jira_url}/rest/api/3/field'
             )
 
             if response.status_code == 200:
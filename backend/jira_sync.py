@@ -0,0 +1,94 @@
+"""
+JIRA sync state
+Per-project watermarks for incremental fetches: the latest `updated` time
+already in the local export, so the next sync only asks JIRA for issues that
+changed since then
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from data_analyzer import dataset_fingerprint
+
+
+class JiraSyncState:
+    """
+    Watermarks persisted as JSON, keyed by (site URL, project)
+
+    Each watermark records the export file it was written with, by path, mtime
+    and size. A watermark only applies while that file is unchanged - if the
+    export has since been overwritten (say by a full fetch of another project)
+    an incremental sync would upsert into the wrong dataset, so the caller
+    falls back to a full fetch.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: JSON file holding the watermarks (created on first sync)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(jira_url: str, project: str) -> str:
+        return f"{jira_url.rstrip('/')}|{project}"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable JIRA sync state {self.path}: {e}")
+            return {}
+
+    def watermark(self, jira_url: str, project: str, export_path: str) -> Optional[datetime]:
+        """
+        Latest synced `updated` time of a project, if the export still holds its data
+
+        Args:
+            jira_url: JIRA site base URL
+            project: Project name or key
+            export_path: CSV export the incremental sync would update
+
+        Returns:
+            Time zone aware datetime, or None when a full sync is needed
+        """
+        with self._lock:
+            entry = self._load().get(self._key(jira_url, project))
+
+        if not entry or not os.path.exists(export_path):
+            return None
+        if list(dataset_fingerprint(export_path)) != entry.get('export'):
+            return None
+        return datetime.fromisoformat(entry['watermark'])
+
+    def record(self, jira_url: str, project: str, export_path: str, watermark: datetime, issues: int):
+        """
+        Store a project's watermark after its export has been written
+
+        Args:
+            jira_url: JIRA site base URL
+            project: Project name or key
+            export_path: CSV export that now holds the project's issues
+            watermark: Latest `updated` time in the export (time zone aware)
+            issues: Number of issues in the export
+        """
+        with self._lock:
+            state = self._load()
+            state[self._key(jira_url, project)] = {
+                'watermark': watermark.isoformat(),
+                'export': list(dataset_fingerprint(export_path)),
+                'issues': issues,
+                'synced_at': datetime.now().isoformat(timespec='seconds')
+            }
+
+            temp_path = f'{self.path}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2)
+            os.replace(temp_path, self.path)
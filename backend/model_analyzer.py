@@ -0,0 +1,146 @@
+"""
+Model Analyzer for Claude Code API usage data
+Token and cost analytics from the records' model_breakdown entries, reduced by
+model, day and organization with NumPy over the UsageStore's flat model table
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from usage_store import UsageStore
+
+TOKEN_COLUMNS = ['cache_creation_tokens', 'cache_read_tokens', 'input_tokens', 'output_tokens']
+ACTIVITY_COLUMNS = ['lines_added', 'commits', 'pull_requests']
+
+
+class ModelUsageAnalyzer:
+    """
+    Per-model token and cost analytics
+
+    The store keeps every model breakdown entry as one row of flat arrays with
+    a pointer back to its record, so each grouping is a bincount over integer
+    codes - one vectorized pass, no per-record Python loops.
+    """
+
+    def __init__(self, store: UsageStore, start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """
+        Args:
+            store: Usage records (UsageStore)
+            start_date: Only include records on or after this date (YYYY-MM-DD)
+            end_date: Only include records before this date (YYYY-MM-DD)
+        """
+        self.store = store
+        dates = store.records['date']
+        mask = np.ones(len(dates), dtype=bool)
+        if start_date:
+            mask &= dates >= np.datetime64(start_date, 'ns')
+        if end_date:
+            mask &= dates < np.datetime64(end_date, 'ns')
+        self.record_mask = mask
+
+        # Model rows whose record is in range
+        model_records = store.model_breakdown['record']
+        self.model_mask = mask[model_records] if len(model_records) else np.zeros(0, dtype=bool)
+
+        # Day codes shared by records and model rows
+        self.days, self.record_days = np.unique(dates[mask], return_inverse=True)
+
+    def _model_sums(self, codes: np.ndarray, size: int) -> Dict[str, np.ndarray]:
+        """Cost and token totals per code (codes index the selected model rows)"""
+        m = self.store.model_breakdown
+        return {
+            column: np.bincount(codes, weights=m[column][self.model_mask], minlength=size)
+            for column in ['cost'] + TOKEN_COLUMNS
+        }
+
+    def _activity_sums(self, codes: np.ndarray, size: int) -> Dict[str, np.ndarray]:
+        """Lines added, commits and PRs per code (codes index the selected records)"""
+        r = self.store.records
+        return {
+            column: np.bincount(codes, weights=r[column][self.record_mask], minlength=size)
+            for column in ACTIVITY_COLUMNS
+        }
+
+    @staticmethod
+    def _ratio(numerator: float, denominator: float, digits: int = 4) -> Optional[float]:
+        return round(float(numerator) / float(denominator), digits) if denominator else None
+
+    def _entry(self, sums: Dict[str, np.ndarray], i: int, activity: Optional[Dict[str, np.ndarray]] = None,
+               total_cost: Optional[float] = None) -> Dict[str, Any]:
+        """Metrics of one group: cost, tokens, cache hit ratio and, with activity, cost per LOC/commit/PR"""
+        cost = float(sums['cost'][i])
+        tokens = {column: int(sums[column][i]) for column in TOKEN_COLUMNS}
+        prompt_tokens = tokens['cache_read_tokens'] + tokens['cache_creation_tokens'] + tokens['input_tokens']
+
+        entry = {
+            'cost': round(cost, 4),
+            **tokens,
+            'total_tokens': prompt_tokens + tokens['output_tokens'],
+            # Share of prompt tokens served from the cache
+            'cache_hit_ratio': self._ratio(tokens['cache_read_tokens'], prompt_tokens),
+        }
+        if total_cost is not None:
+            entry['cost_share'] = self._ratio(cost, total_cost)
+        if activity is not None:
+            for column, label in (('lines_added', 'loc'), ('commits', 'commit'), ('pull_requests', 'pr')):
+                entry[column] = int(activity[column][i])
+                entry[f'cost_per_{label}'] = self._ratio(cost, activity[column][i], digits=6)
+        return entry
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Totals over the whole period"""
+        model_rows = int(self.model_mask.sum())
+        sums = self._model_sums(np.zeros(model_rows, dtype=np.intp), 1)
+        activity = self._activity_sums(np.zeros(int(self.record_mask.sum()), dtype=np.intp), 1)
+        return {'records': int(self.record_mask.sum()), 'model_entries': model_rows, **self._entry(sums, 0, activity)}
+
+    def get_by_model(self) -> List[Dict[str, Any]]:
+        """Cost, tokens, cache hit ratio and cost share per model, most expensive first"""
+        models = self.store.models.values
+        sums = self._model_sums(self.store.model_breakdown['model'][self.model_mask], len(models))
+        total_cost = float(sums['cost'].sum())
+        used = np.flatnonzero(np.bincount(self.store.model_breakdown['model'][self.model_mask], minlength=len(models)))
+
+        result = [{'model': models[i], **self._entry(sums, i, total_cost=total_cost)} for i in used]
+        return sorted(result, key=lambda entry: entry['cost'], reverse=True)
+
+    def get_by_day(self) -> List[Dict[str, Any]]:
+        """Per-day cost, tokens, cache hit ratio and cost per LOC/commit/PR"""
+        # Day of each selected model row, via its record's position among the selected records
+        position = np.cumsum(self.record_mask) - 1
+        model_days = self.record_days[position[self.store.model_breakdown['record'][self.model_mask]]]
+
+        sums = self._model_sums(model_days, len(self.days))
+        activity = self._activity_sums(self.record_days, len(self.days))
+        labels = pd.DatetimeIndex(self.days).strftime('%Y-%m-%d')
+        return [{'date': labels[i], **self._entry(sums, i, activity)} for i in range(len(self.days))]
+
+    def get_by_organization(self) -> List[Dict[str, Any]]:
+        """Per-organization cost, tokens, cache hit ratio and cost per LOC/commit/PR"""
+        organizations = self.store.organizations.values
+        record_orgs = self.store.records['organization']
+        model_orgs = record_orgs[self.store.model_breakdown['record'][self.model_mask]]
+
+        sums = self._model_sums(model_orgs, len(organizations))
+        activity = self._activity_sums(record_orgs[self.record_mask], len(organizations))
+        used = np.flatnonzero(np.bincount(record_orgs[self.record_mask], minlength=len(organizations)))
+        return [{'organization_id': organizations[i], **self._entry(sums, i, activity)} for i in used]
+
+    def analyze(self) -> Dict[str, Any]:
+        """
+        Compute every model analytics section
+
+        Returns:
+            Dict with summary, by_model, by_day and by_organization
+        """
+        print(f"🤖 Analyzing {int(self.model_mask.sum())} model usage entries "
+              f"from {int(self.record_mask.sum())} usage records")
+
+        return {
+            'summary': self.get_summary(),
+            'by_model': self.get_by_model(),
+            'by_day': self.get_by_day(),
+            'by_organization': self.get_by_organization()
+        }
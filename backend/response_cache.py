@@ -0,0 +1,218 @@
+"""
+Response cache for analysis endpoints
+Keeps serialized JSON payloads, along with their gzip (and, when the brotli
+package is installed, brotli) encodings, in a size-bounded LRU; serves the
+encoding the client accepts and answers If-None-Match requests with 304 Not
+Modified. Also provides an orjson-backed JSON provider for dynamic responses.
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+from flask import Response, current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+# Optional: brotli encodings are only kept when the package is installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Optional: FastJSONProvider needs orjson
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bodies smaller than this are sent as-is (compression wouldn't pay for its headers)
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+
+
+def compress_body(body: bytes) -> Dict[str, bytes]:
+    """Content-Encoding -> encoded body, for each supported encoding worth using"""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return {}
+
+    # mtime=0 keeps the gzip bytes (and so their ETag) the same for the same body
+    encodings = {'gzip': gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        encodings['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return encodings
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a streamed body chunk by chunk (for responses too large to keep)"""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class CachedPayload:
+    """A serialized JSON response body, its compressed encodings and its strong ETag"""
+
+    __slots__ = ('body', 'etag', 'encodings')
+
+    # Preferred encoding first, when the client accepts several equally
+    ENCODING_PREFERENCE = ('br', 'gzip')
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()
+        self.encodings = compress_body(body)
+
+    @property
+    def size(self) -> int:
+        """Bytes held for this payload, encodings included"""
+        return len(self.body) + sum(len(encoded) for encoded in self.encodings.values())
+
+    def select(self, accept_encodings) -> Tuple[Optional[str], bytes, str]:
+        """
+        Representation to send for a request's Accept-Encoding
+
+        Returns:
+            Tuple of (content encoding or None for identity, body, ETag). Each
+            encoding has its own ETag, since its bytes differ.
+        """
+        best, best_quality = None, 0
+        for encoding in self.ENCODING_PREFERENCE:
+            quality = accept_encodings.quality(encoding) if encoding in self.encodings else 0
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+
+        if best is None:
+            return None, self.body, self.etag
+        return best, self.encodings[best], f'{self.etag}-{best}'
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized responses, bounded by total body size
+
+    Keys should identify everything the payload depends on, e.g.
+    (dataset fingerprint, company, adoption date), so entries never need
+    explicit invalidation - a changed data file simply produces a new key.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Total body size kept before least recently used entries are evicted
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, CachedPayload]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedPayload]:
+        """Look up a cached payload"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+    def put(self, key: Hashable, payload: Dict[str, Any]) -> CachedPayload:
+        """Serialize a payload and cache it (must be called inside a Flask app context)"""
+        return self.put_body(key, current_app.json.dumps(payload).encode('utf-8'))
+
+    def put_body(self, key: Hashable, body: bytes) -> CachedPayload:
+        """Cache an already serialized JSON body (compressed once here, not per request)"""
+        cached = CachedPayload(body)
+
+        # Payloads larger than the whole cache are served but not kept
+        if cached.size > self.max_bytes:
+            return cached
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous.size
+
+            self._entries[key] = cached
+            self.total_bytes += cached.size
+
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.size
+
+        return cached
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit counts"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'encodings': ['gzip'] + (['br'] if brotli is not None else [])
+            }
+
+
+def cached_json_response(cached: CachedPayload) -> Response:
+    """
+    Build the response for a cached payload
+
+    Sends the best pre-compressed encoding the client's Accept-Encoding
+    allows. Returns 304 with an empty body when a GET or HEAD request's
+    If-None-Match already has that representation's ETag, otherwise the body
+    with the ETag attached. If-None-Match is ignored on other methods (e.g. a
+    POST that computes the analysis always gets its body).
+    """
+    encoding, body, etag = cached.select(request.accept_encodings)
+
+    if request.method in ('GET', 'HEAD') and request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    if cached.encodings:
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson
+
+    Output matches the default provider's (sorted keys; dates, decimals and
+    dataclasses through its default()) except that it is compact and NaN
+    becomes null. NumPy scalars and arrays are serialized directly.
+    """
+
+    available = orjson is not None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
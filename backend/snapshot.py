@@ -0,0 +1,111 @@
+"""
+Columnar snapshots of processed JIRA data
+Stores a DataFrame as a directory of .npy column arrays plus a JSON manifest,
+so parsed dates and numbers reload without going through CSV text
+"""
+
+import json
+import os
+import shutil
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_FILE = 'manifest.json'
+SNAPSHOT_FORMAT = 'roi-snapshot'
+SNAPSHOT_VERSION = 1
+
+
+def is_snapshot(path: str) -> bool:
+    """Check whether path is a snapshot directory"""
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def write_snapshot(df: pd.DataFrame, path: str, metadata: Dict[str, Any] = None):
+    """
+    Write a DataFrame as a snapshot directory
+
+    Numeric, boolean and datetime64 columns are saved as-is. Every other
+    column is stored as categorical codes, with the category labels (as
+    strings) kept in the manifest.
+
+    Args:
+        df: DataFrame to save
+        path: Snapshot directory (replaced if it already exists)
+        metadata: Extra JSON-serializable values to keep in the manifest
+    """
+    tmp_path = f'{path}.tmp'
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        values = df[name]
+        filename = f'{i:03d}.npy'
+        column = {'name': str(name), 'file': filename}
+
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_dtype(values):
+            column['kind'] = 'array'
+            array = values.to_numpy()
+        else:
+            column['kind'] = 'categorical'
+            categorical = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+            column['categories'] = [str(c) for c in categorical.cat.categories]
+            array = categorical.cat.codes.to_numpy()
+
+        np.save(os.path.join(tmp_path, filename), np.ascontiguousarray(array), allow_pickle=False)
+        columns.append(column)
+
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'rows': len(df),
+        'columns': columns,
+        'metadata': metadata or {}
+    }
+    with open(os.path.join(tmp_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+
+    print(f"✅ Wrote snapshot of {len(df)} rows to {path}")
+
+
+def read_snapshot(path: str, mmap: bool = True,
+                  columns: Optional[Iterable[str]] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Load a snapshot directory
+
+    Args:
+        path: Snapshot directory
+        mmap: Memory-map the column files; the DataFrame then reads straight
+            from the page cache without copying (columns are read-only)
+        columns: Only load these columns (others' files are never opened)
+
+    Returns:
+        Tuple of (DataFrame, manifest metadata)
+    """
+    with open(os.path.join(path, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != SNAPSHOT_FORMAT or manifest.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot format in {path}")
+
+    wanted = set(columns) if columns is not None else None
+    data = {}
+    for column in manifest['columns']:
+        if wanted is not None and column['name'] not in wanted:
+            continue
+        array = np.load(os.path.join(path, column['file']), mmap_mode='r' if mmap else None, allow_pickle=False)
+
+        if column['kind'] == 'categorical':
+            data[column['name']] = pd.Categorical.from_codes(array, categories=column['categories'])
+        else:
+            data[column['name']] = array
+
+    df = pd.DataFrame(data, copy=False)
+    return df, manifest.get('metadata', {})
@@ -0,0 +1,87 @@
+"""
+ROI Analyzer over the local issue store
+Filters and pre/post aggregation run in SQLite on one (site, project)
+partition; only the group totals are loaded into pandas
+"""
+
+import pandas as pd
+from typing import Dict, Any, Optional
+
+from data_analyzer import AdoptionIndex, IssueDataset, ROIAnalyzer
+from issue_store import IssueStore
+from streaming_analyzer import StreamingROIAnalyzer
+
+
+class StoreROIAnalyzer(StreamingROIAnalyzer):
+    """
+    ROIAnalyzer view of one project in an IssueStore
+
+    The store returns task totals per (Period, day, Status, Priority), the
+    same groups StreamingROIAnalyzer folds from a CSV, so every dashboard
+    section, and the adoption sweep, is built by the shared ROIAnalyzer code
+    and matches ROIAnalyzer on the same issues. Date range and
+    status/priority/assignee filters are WHERE clauses on the store's indexes.
+    """
+
+    def __init__(self, store: IssueStore, site: str, project: str, claude_adoption_date: str,
+                 **filters: Optional[str]):
+        """
+        Initialize analyzer and aggregate the project's issues in SQL
+
+        Args:
+            store: Issue store to read from
+            site: JIRA site base URL
+            project: Project name or key
+            claude_adoption_date: Date when Claude Code was adopted (format: YYYY-MM-DD or dd/MMM/yy)
+            **filters: since/until (created day, YYYY-MM-DD), status, priority, assignee
+        """
+        self.store = store
+        self.site = site
+        self.project = project
+        self.filters = filters
+        self.claude_adoption_date = self._parse_date(claude_adoption_date)
+        self.date_parse_fallbacks: Dict[str, int] = {}
+
+        self.groups = store.group_totals(site, project, self.claude_adoption_date.strftime('%Y-%m-%d'), **filters)
+        self.source_rows = int(self.groups['tasks'].sum())
+        self._sections: Dict[str, Dict[str, Any]] = {}
+        self._day_index: Optional[AdoptionIndex] = None
+
+    def get_engineer_cycle_times(self) -> pd.DataFrame:
+        """
+        Per-engineer task counts and cycle times before and after adoption
+
+        Same result as ROIAnalyzer.get_engineer_cycle_times, from per
+        (engineer, Period) totals aggregated in SQL.
+        """
+        totals = self.store.engineer_totals(
+            self.site, self.project, self.claude_adoption_date.strftime('%Y-%m-%d'), **self.filters
+        )
+
+        # Engineers in order of first appearance, named from their first row
+        first = totals.sort_values('first_row').drop_duplicates('engineer')
+        result = pd.DataFrame({'engineer': first['engineer'].to_numpy(), 'name': first['name'].to_numpy()})
+        for period, prefix in (('Pre-Claude', 'pre'), ('Post-Claude', 'post')):
+            period_totals = totals[totals['Period'] == period].set_index('engineer')
+            tasks = result['engineer'].map(period_totals['tasks']).fillna(0).astype(int)
+            result[f'{prefix}_tasks'] = tasks
+            result[f'{prefix}_completed'] = result['engineer'].map(period_totals['completed']).fillna(0).astype(int)
+            for column in ('days', 'hours'):
+                sums = result['engineer'].map(period_totals[column]).fillna(0)
+                result[f'{prefix}_avg_{column}'] = (sums / tasks.where(tasks > 0)).fillna(0)
+        return result
+
+    def export_processed_data(self, output_path: str, format: str = 'csv'):
+        """
+        Export the project's processed issues (after filters), as ROIAnalyzer would
+
+        The only method that reads the partition's rows into memory.
+
+        Args:
+            output_path: CSV file, or directory for format='snapshot'
+            format: 'csv' or 'snapshot'
+        """
+        frame = self.store.issues_frame(self.site, self.project, **self.filters)
+        dataset = IssueDataset(frame, source_path=self.store.db_path)
+        analyzer = ROIAnalyzer(self.store.db_path, self.claude_adoption_date.strftime('%Y-%m-%d'), dataset=dataset)
+        analyzer.export_processed_data(output_path, format=format)
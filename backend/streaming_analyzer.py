@@ -0,0 +1,161 @@
+"""
+Streaming ROI Analyzer for JIRA exports that don't fit in memory
+Reads the CSV in chunks and folds each chunk into mergeable group totals
+"""
+
+import os
+
+import pandas as pd
+from typing import Dict, Iterator, List, Any, Optional
+
+from data_analyzer import AdoptionIndex, IssueDataset, ROIAnalyzer
+
+
+class StreamingROIAnalyzer(ROIAnalyzer):
+    """
+    Out-of-core variant of ROIAnalyzer
+
+    Each chunk is parsed like a lean IssueDataset and reduced to task totals
+    per (Period, day, Status, Priority). Those totals are merged as the file is
+    read, so memory is bounded by the chunk size plus the number of groups, and
+    the results match ROIAnalyzer on the same file. Day-level totals roll up to
+    any time series granularity, and split at any adoption date for the
+    adoption sweep, without another pass over the file.
+    """
+
+    DEFAULT_CHUNK_SIZE = 100000
+
+    def __init__(self, csv_path: str, claude_adoption_date: str, chunksize: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize analyzer and stream through the export once
+
+        Args:
+            csv_path: Path to JIRA export CSV
+            claude_adoption_date: Date when Claude Code was adopted (format: YYYY-MM-DD or dd/MMM/yy)
+            chunksize: Rows read per chunk
+        """
+        self.csv_path = csv_path
+        self.claude_adoption_date = self._parse_date(claude_adoption_date)
+        self.chunksize = chunksize
+        self.source_rows = 0
+        self.chunks_read = 0
+        self.date_parse_fallbacks: Dict[str, int] = {}
+
+        self.groups = self._fold_chunks(claude_adoption_date)
+        self._sections: Dict[str, Dict[str, Any]] = {}
+        self._day_index: Optional[AdoptionIndex] = None
+
+    def _fold_chunks(self, claude_adoption_date: str) -> pd.DataFrame:
+        """Read the CSV chunk by chunk, merging each chunk's group totals into the running totals"""
+        totals: Optional[pd.DataFrame] = None
+
+        for dataset in self._iter_chunks():
+            self.source_rows += dataset.source_rows
+            self.chunks_read += 1
+            for column, count in dataset.date_parse_fallbacks.items():
+                self.date_parse_fallbacks[column] = self.date_parse_fallbacks.get(column, 0) + count
+
+            chunk_groups = ROIAnalyzer(self.csv_path, claude_adoption_date, dataset=dataset)._group_totals('day')
+            totals = self._merge_groups(totals, chunk_groups)
+
+        print(f"✅ Streamed {self.source_rows} rows in {self.chunks_read} chunks into {len(totals) if totals is not None else 0} groups")
+
+        if totals is None:
+            columns = self.GROUP_KEYS + list(self.GROUP_AGGREGATIONS)
+            return pd.DataFrame(columns=columns)
+        return totals
+
+    @classmethod
+    def _merge_groups(cls, totals: Optional[pd.DataFrame], chunk_groups: pd.DataFrame) -> pd.DataFrame:
+        """Combine two sets of group totals"""
+        # Each chunk has its own categories, so merge on plain values
+        chunk_groups = chunk_groups.astype({key: object for key in cls.GROUP_KEYS})
+        if totals is None:
+            return chunk_groups
+
+        combined = pd.concat([totals, chunk_groups], ignore_index=True)
+        return combined.groupby(cls.GROUP_KEYS, dropna=False).agg(cls.GROUP_AGGREGATIONS).reset_index()
+
+    def _sections_for(self, granularity: str = 'week') -> Dict[str, Any]:
+        """Dashboard sections rolled up to a granularity (computed once per granularity)"""
+        if granularity not in self._sections:
+            self._sections[granularity] = self._sections_from_groups(self.groups, granularity)
+        return self._sections[granularity]
+
+    def analyze(self, granularity: str = 'week') -> Dict[str, Any]:
+        """All dashboard sections (same structure as ROIAnalyzer.analyze)"""
+        return dict(self._sections_for(granularity))
+
+    def get_summary_metrics(self) -> Dict[str, Any]:
+        """Calculate summary ROI metrics"""
+        return self._sections_for()['summary_metrics']
+
+    def get_time_series_data(self, granularity: str = 'week') -> List[Dict[str, Any]]:
+        """Get time series data for charts"""
+        return self._sections_for(granularity)['time_series_data']
+
+    def get_status_breakdown(self) -> Dict[str, Any]:
+        """Get breakdown by status for pre/post Claude"""
+        return self._sections_for()['status_breakdown']
+
+    def get_priority_breakdown(self) -> Dict[str, Any]:
+        """Get breakdown by priority for pre/post Claude"""
+        return self._sections_for()['priority_breakdown']
+
+    def _adoption_index(self) -> AdoptionIndex:
+        """Adoption sweep index over the day-level group totals (no row data needed)"""
+        if self._day_index is None:
+            self._day_index = AdoptionIndex.from_day_totals(self.groups)
+        return self._day_index
+
+    def get_engineer_cycle_times(self) -> pd.DataFrame:
+        """
+        Per-engineer metrics need the assignee columns, which streaming (like lean mode) doesn't read
+
+        Raises:
+            ValueError: Always; use ROIAnalyzer without lean mode
+        """
+        raise ValueError("Per-engineer metrics need the Assignee, Assignee Id column(s); load without lean mode")
+
+    def _iter_chunks(self) -> Iterator[IssueDataset]:
+        """Parse the CSV one lean chunk at a time"""
+        reader = pd.read_csv(
+            self.csv_path,
+            chunksize=self.chunksize,
+            usecols=lambda column: column in IssueDataset.LEAN_COLUMNS
+        )
+        for chunk in reader:
+            yield IssueDataset(chunk, source_path=self.csv_path, lean=True)
+
+    def export_processed_data(self, output_path: str, format: str = 'csv'):
+        """
+        Export processed data, re-reading the CSV chunk by chunk
+
+        Writes the same rows and columns as a lean ROIAnalyzer's export.
+
+        Args:
+            output_path: CSV file
+            format: 'csv' (snapshots are written from a whole in-memory DataFrame; use ROIAnalyzer)
+
+        Raises:
+            ValueError: For any format other than 'csv'
+        """
+        if format != 'csv':
+            raise ValueError(f"Streaming analysis exports CSV only, not {format}; use ROIAnalyzer for snapshots")
+
+        temp_path = f'{output_path}.tmp'
+        rows = 0
+        try:
+            for dataset in self._iter_chunks():
+                chunk = ROIAnalyzer(self.csv_path, self.claude_adoption_date.strftime('%Y-%m-%d'), dataset=dataset).df
+                chunk.to_csv(temp_path, mode='w' if rows == 0 else 'a', header=(rows == 0), index=False)
+                rows += len(chunk)
+            if not os.path.exists(temp_path):
+                open(temp_path, 'w').close()
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        os.replace(temp_path, output_path)
+        print(f"✅ Exported {rows} processed rows to {output_path}")
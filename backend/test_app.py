@@ -0,0 +1,139 @@
+"""
+Regression tests for API request validation
+
+Bad query parameters and JSON bodies must be rejected with a 400 and an
+error message, never reach the analysis as a 500; every supported
+granularity is accepted by the POST endpoints.
+Run with: python -m pytest backend/test_app.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import app as backend
+from conftest import make_issues
+from data_analyzer import ROIAnalyzer
+from issue_store import IssueStore
+from jira_sync import JiraSyncState
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+SITE = 'https://example.atlassian.net'
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = IssueStore(str(tmp_path / 'issues.sqlite3'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        store.replace_partition_from_csv(SITE, 'DEMO', os.path.join(DATA_DIR, 'demo_data.csv'))
+    monkeypatch.setattr(backend, 'issue_store', store)
+    monkeypatch.setattr(backend, 'JIRA_EXPORT_PATH', str(tmp_path / 'jira_export.csv'))
+    monkeypatch.setattr(backend, 'PROCESSED_DATA_PATH', str(tmp_path / 'processed_data.csv'))
+    monkeypatch.setattr(backend, 'PROCESSED_SNAPSHOT_PATH', str(tmp_path / 'processed_snapshot'))
+    monkeypatch.setattr(backend, 'jira_sync_state', JiraSyncState(str(tmp_path / 'jira_sync_state.json')))
+    return backend.app.test_client()
+
+
+def _jira_body(**fields):
+    return {
+        'jira_url': SITE, 'email': 'me@example.com', 'api_token': 'token',
+        'project_key': 'PROJ', 'claude_adoption_date': '2025-02-01', **fields
+    }
+
+
+@pytest.mark.parametrize('granularity,frequency', [('day', 'D'), ('Quarter ', 'Q')])
+def test_demo_data_granularity(client, granularity, frequency):
+    response = client.post('/api/fetch-demo-data', json={
+        'claude_adoption_date': '2025-08-25', 'company': 'pharmaco', 'granularity': granularity
+    })
+
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['granularity'] == granularity.strip().lower()
+    expected = ROIAnalyzer(os.path.join(DATA_DIR, 'pharmaco_data.csv'), '2025-08-25').analyze(result['granularity'])
+    assert result['time_series_data'] == json.loads(backend.app.json.dumps(expected['time_series_data']))
+
+    starts = pd.to_datetime([row['Week_Start'] for row in result['time_series_data']])
+    assert (starts == starts.to_period(frequency).start_time).all()
+
+
+@pytest.mark.parametrize('granularity', ['day', 'quarter'])
+def test_jira_data_granularity(client, fake_jira, granularity):
+    fake_jira(make_issues(120))
+
+    response = client.post('/api/fetch-jira', json=_jira_body(granularity=granularity))
+
+    assert response.status_code == 200
+    assert response.get_json()['granularity'] == granularity
+
+
+def test_large_jira_export_is_streamed(client, fake_jira, monkeypatch):
+    fake_jira(make_issues(120))
+    in_memory = client.post('/api/fetch-jira', json=_jira_body()).get_json()
+    assert os.path.isdir(backend.PROCESSED_SNAPSHOT_PATH)
+
+    monkeypatch.setattr(backend, 'STREAMING_THRESHOLD_BYTES', 0)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        response = client.post('/api/fetch-jira', json=_jira_body())
+
+    assert response.status_code == 200
+    assert 'Streaming large export' in output.getvalue()
+    streamed = response.get_json()
+    assert {key: streamed[key] for key in in_memory if key != 'sync'} == \
+        {key: in_memory[key] for key in in_memory if key != 'sync'}
+    assert backend.jira_data_path() == backend.JIRA_EXPORT_PATH
+
+
+@pytest.mark.parametrize('granularity', ['fortnight', '', 7, None, ['week'], {'unit': 'week'}])
+@pytest.mark.parametrize('endpoint', ['/api/fetch-demo-data', '/api/fetch-jira'])
+def test_invalid_granularity_is_rejected(client, endpoint, granularity):
+    body = _jira_body(granularity=granularity) if endpoint == '/api/fetch-jira' else {
+        'claude_adoption_date': '2025-08-25', 'company': 'pharmaco', 'granularity': granularity
+    }
+
+    response = client.post(endpoint, json=body)
+
+    assert response.status_code == 400
+    assert 'Invalid granularity' in response.get_json()['error']
+
+
+def test_project_analysis(client):
+    response = client.get('/api/project-analysis', query_string={
+        'project': 'DEMO', 'claude_adoption_date': '2025-08-25', 'since': '2025-06-01'
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()['filters'] == {'since': '2025-06-01'}
+
+
+@pytest.mark.parametrize('params', [
+    {'claude_adoption_date': 'not-a-date'},
+    {'claude_adoption_date': '2025-13-01'},
+    {'claude_adoption_date': '2025-08-25', 'since': 'yesterday'},
+    {'claude_adoption_date': '2025-08-25', 'until': '31/02/25'},
+])
+def test_project_analysis_rejects_invalid_dates(client, params):
+    response = client.get('/api/project-analysis', query_string={'project': 'DEMO', **params})
+
+    assert response.status_code == 400
+    assert 'Unable to parse date' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('claude_adoption_date', ['bogus', '2025-02-30'])
+def test_dashboards_reject_invalid_adoption_dates(client, claude_adoption_date):
+    shutil.copy(os.path.join(DATA_DIR, 'demo_data.csv'), backend.JIRA_EXPORT_PATH)
+
+    responses = [
+        client.post('/api/fetch-demo-data', json={'claude_adoption_date': claude_adoption_date, 'company': 'pharmaco'}),
+        client.get('/api/dashboard-data', query_string={'claude_adoption_date': claude_adoption_date}),
+    ]
+
+    for response in responses:
+        assert response.status_code == 400
+        assert 'Unable to parse date' in response.get_json()['error']
@@ -0,0 +1,104 @@
+"""
+Regression tests for ROIAnalyzer.analyze() and the adoption sweep
+
+analyze() must return exactly what the four per-section methods return, and
+every point of the adoption sweep must match get_summary_metrics() for an
+analyzer built with that adoption date.
+Run with: python -m pytest backend/test_data_analyzer.py
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analyzer import ROIAnalyzer
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+DATASETS = ['fintechco_data.csv', 'pharmaco_data.csv', 'demo_data.csv', 'jira_export.csv']
+ADOPTION_DATES = ['2025-06-01', '2025-08-25', '01/Sep/25', '2026-01-01']
+
+
+def _as_json(value):
+    return json.dumps(value, sort_keys=True, default=float)
+
+
+def _rounded(value):
+    """JSON-ready copy with floats rounded (prefix sums add in a different order than a filter)"""
+    if isinstance(value, dict):
+        return {key: _rounded(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rounded(item) for item in value]
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else round(float(value), 6)
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+@pytest.mark.parametrize('adoption_date', ADOPTION_DATES)
+@pytest.mark.parametrize('lean', [False, True])
+def test_analyze_matches_section_methods(dataset, adoption_date, lean):
+    csv_path = os.path.join(DATA_DIR, dataset)
+
+    result = ROIAnalyzer(csv_path, adoption_date, lean=lean).analyze()
+
+    reference = ROIAnalyzer(csv_path, adoption_date)
+    expected = {
+        'summary_metrics': reference.get_summary_metrics(),
+        'time_series_data': reference.get_time_series_data(),
+        'status_breakdown': reference.get_status_breakdown(),
+        'priority_breakdown': reference.get_priority_breakdown()
+    }
+
+    assert _as_json(result) == _as_json(expected)
+
+
+def test_analyze_does_not_modify_dataframe():
+    analyzer = ROIAnalyzer(os.path.join(DATA_DIR, 'fintechco_data.csv'), '2025-08-25')
+    columns_before = list(analyzer.df.columns)
+
+    analyzer.analyze()
+
+    assert list(analyzer.df.columns) == columns_before
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+def test_adoption_sweep_matches_summary_per_date(dataset):
+    csv_path = os.path.join(DATA_DIR, dataset)
+
+    # Candidates from before the first issue to after the last one
+    sweep = ROIAnalyzer(csv_path, '2025-08-25').get_adoption_sweep('2025-06-28', '2025-10-09', step_days=3)['sweep']
+
+    assert len(sweep) == 35
+    for point in sweep:
+        expected = ROIAnalyzer(csv_path, point['claude_adoption_date']).get_summary_metrics()
+        del expected['assumptions']
+        assert _rounded(point) == _rounded(expected), point['claude_adoption_date']
+
+
+@pytest.mark.parametrize('start,end', [('2024-01-01', '2024-01-03'), ('2025-09-01', '2025-09-01'),
+                                       ('2027-01-01', '2027-01-02')])
+def test_adoption_sweep_daily_points(start, end):
+    csv_path = os.path.join(DATA_DIR, 'fintechco_data.csv')
+
+    sweep = ROIAnalyzer(csv_path, '2025-08-25').get_adoption_sweep(start, end)['sweep']
+
+    expected = []
+    for day in pd.date_range(start, end):
+        summary = ROIAnalyzer(csv_path, day.strftime('%Y-%m-%d')).get_summary_metrics()
+        del summary['assumptions']
+        expected.append(summary)
+    assert _rounded(sweep) == _rounded(expected)
+
+
+def test_adoption_sweep_defaults_to_data_range():
+    sweep = ROIAnalyzer(os.path.join(DATA_DIR, 'fintechco_data.csv'), '2025-08-25').get_adoption_sweep()['sweep']
+
+    dates = [point['claude_adoption_date'] for point in sweep]
+    assert dates == [day.strftime('%Y-%m-%d') for day in pd.date_range('2025-07-01', '2025-09-29')]
@@ -0,0 +1,194 @@
+"""
+Regression tests for per-engineer ROI
+
+/api/engineer-roi must give each assignee the cycle times and usage a
+record-by-record scan finds, matched by identity mapping, email or name.
+The identities mapping is read once per file version, and the demo source
+(whose CSVs have no assignees) is rejected instead of returning an empty join.
+Run with: python -m pytest backend/test_engineer_roi.py
+"""
+
+import json
+import os
+import shutil
+from collections import defaultdict
+
+import pandas as pd
+import pytest
+
+import app as backend
+import engineer_roi
+from data_analyzer import ROIAnalyzer
+from engineer_roi import load_engineer_identities, name_key
+from usage_rollups import UsageRollups
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+ADOPTION_DATE = '2025-08-25'
+
+
+def _write(path, identities):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(identities, f)
+
+
+def test_identities_are_read_once_per_file_version(tmp_path, monkeypatch):
+    path = str(tmp_path / 'engineer_identities.json')
+    _write(path, {'acc-1': 'a@example.com'})
+    loads = []
+    json_load = json.load
+    monkeypatch.setattr(engineer_roi.json, 'load', lambda f: loads.append(f.name) or json_load(f))
+
+    assert load_engineer_identities(path) == {'acc-1': 'a@example.com'}
+    assert load_engineer_identities(path) == {'acc-1': 'a@example.com'}
+    assert len(loads) == 1
+
+    _write(path, {'acc-1': 'a@example.com', 'acc-2': 'b@example.com'})
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert load_engineer_identities(path) == {'acc-1': 'a@example.com', 'acc-2': 'b@example.com'}
+    assert len(loads) == 2
+
+
+def test_missing_identities_file_is_empty(tmp_path):
+    assert load_engineer_identities(str(tmp_path / 'engineer_identities.json')) == {}
+
+
+@pytest.mark.parametrize('identities', [['a@example.com'], {'acc-1': 7}])
+def test_malformed_identities_are_rejected(tmp_path, identities):
+    path = str(tmp_path / 'engineer_identities.json')
+    _write(path, identities)
+
+    with pytest.raises(ValueError):
+        load_engineer_identities(path)
+
+
+@pytest.mark.parametrize('source,error', [('demo', 'no assignees'), ('csv', 'Invalid source')])
+def test_engineer_roi_rejects_sources_without_assignees(source, error):
+    response = backend.app.test_client().get('/api/engineer-roi', query_string={
+        'claude_adoption_date': '2025-08-25', 'company': 'fintechco', 'source': source
+    })
+
+    assert response.status_code == 400
+    assert error in response.get_json()['error']
+
+
+def _assignees(actors):
+    """(Assignee, Assignee Id) pairs matching by name, by email, through the identities file, or not at all"""
+    by_name = [(' '.join(part.title() for part in actor.split('@')[0].split('.')), None) for actor in actors[:12]]
+    by_email = [('Someone Else', actor.upper()) for actor in actors[12:15]]
+    return by_name + by_email + [
+        ('Mapped Person', 'acc-mapped'), ('Nobody Known', None), ('Nobody Known', 'acc-nobody'),
+        ('Unassigned', None), (None, None)
+    ]
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(DATA_DIR, 'fintechco_api_usage_data.json'), tmp_path)
+    with open(tmp_path / 'fintechco_api_usage_data.json', encoding='utf-8') as f:
+        records = json.load(f)['data']
+    actors = sorted({record['actor']['email_address'] for record in records})
+
+    # The fintechco issues, handed out round-robin to the assignees
+    assignees = _assignees(actors)
+    issues = pd.read_csv(os.path.join(DATA_DIR, 'fintechco_data.csv'))
+    issues['Assignee'] = [assignees[i % len(assignees)][0] for i in range(len(issues))]
+    issues['Assignee Id'] = [assignees[i % len(assignees)][1] for i in range(len(issues))]
+    issues.to_csv(tmp_path / 'jira_export.csv', index=False)
+
+    identities = {'acc-mapped': actors[20]}
+    _write(str(tmp_path / 'engineer_identities.json'), identities)
+
+    monkeypatch.setattr(backend, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(backend, 'JIRA_EXPORT_PATH', str(tmp_path / 'jira_export.csv'))
+    monkeypatch.setattr(backend, 'ENGINEER_IDENTITIES_PATH', str(tmp_path / 'engineer_identities.json'))
+    monkeypatch.setattr(backend, 'usage_rollups', UsageRollups(str(tmp_path / 'usage_rollups.sqlite3')))
+    monkeypatch.setattr(backend, '_synced_usage_versions', {})
+    return backend.app.test_client(), records, identities
+
+
+def _cycle_times_by_scan(df):
+    """Per-engineer pre/post task counts and averages, one issue at a time"""
+    engineers = {}
+    rows = zip(df['Assignee'], df['Assignee Id'], df['Period'], df['Status'], df['Duration_days'], df['Hours_per_ticket'])
+    for name, assignee_id, period, status, days, hours in rows:
+        if pd.isna(name) or name == 'Unassigned':
+            continue
+        engineer = assignee_id if isinstance(assignee_id, str) and assignee_id.strip() else name
+        entry = engineers.setdefault(engineer, {'name': name, 'Pre-Claude': defaultdict(float),
+                                                'Post-Claude': defaultdict(float)})
+        totals = entry[period]
+        totals['tasks'] += 1
+        totals['completed'] += status == 'Done'
+        totals['days'] += days
+        totals['hours'] += hours
+
+    def period(totals):
+        tasks = int(totals['tasks'])
+        return {
+            'tasks': tasks, 'completed_tasks': int(totals['completed']),
+            'avg_days_per_task': round(totals['days'] / tasks, 1) if tasks else 0.0,
+            'avg_hours_per_task': round(totals['hours'] / tasks, 1) if tasks else 0.0
+        }
+    return {engineer: (entry['name'], period(entry['Pre-Claude']), period(entry['Post-Claude']))
+            for engineer, entry in engineers.items()}
+
+
+def _match_by_scan(engineer, name, actors, identities):
+    """Usage actor of an engineer (among actors with usage), found by trying every actor in turn"""
+    for key in (engineer, name):
+        if key in identities:
+            return identities[key].lower() if identities[key].lower() in actors else None
+    for key in (engineer, name):
+        if '@' in key:
+            return key.lower() if key.lower() in actors else None
+    named = [actor for actor in actors if name_key(actor) == name_key(name)]
+    return named[0] if len(named) == 1 else None
+
+
+def _usage_by_scan(records, since):
+    usage = defaultdict(lambda: defaultdict(float))
+    for record in records:
+        if record['date'][:10] < since:
+            continue
+        totals = usage[record['actor']['email_address']]
+        metrics = record['core_metrics']
+        totals['records'] += 1
+        totals['sessions'] += metrics['num_sessions']
+        totals['commits'] += metrics['commits_by_claude_code']
+        totals['pull_requests'] += metrics['pull_requests_by_claude_code']
+        totals['lines_added'] += metrics['lines_of_code']['added']
+        totals['lines_removed'] += metrics['lines_of_code']['removed']
+        totals['cost'] += sum(model['estimated_cost']['amount'] for model in record['model_breakdown'])
+    return usage
+
+
+def test_engineer_roi_matches_scan(api):
+    client, records, identities = api
+
+    response = client.get('/api/engineer-roi', query_string={'claude_adoption_date': ADOPTION_DATE, 'company': 'fintechco'})
+
+    assert response.status_code == 200
+    result = response.get_json()
+    cycle_times = _cycle_times_by_scan(ROIAnalyzer(backend.JIRA_EXPORT_PATH, ADOPTION_DATE).df)
+    usage = _usage_by_scan(records, ADOPTION_DATE)
+    actors = set(usage)
+
+    assert sorted(entry['engineer'] for entry in result['engineers']) == sorted(cycle_times)
+    matched = set()
+    for entry in result['engineers']:
+        name, pre, post = cycle_times[entry['engineer']]
+        actor = _match_by_scan(entry['engineer'], name, actors, identities)
+        assert (entry['name'], entry['pre_claude'], entry['post_claude'], entry['actor']) == (name, pre, post, actor)
+
+        if actor is None:
+            assert entry['usage'] is None
+            continue
+        matched.add(actor)
+        totals = usage[actor]
+        assert entry['usage'] == {**{field: int(totals[field]) for field in engineer_roi.USAGE_FIELDS if field != 'cost'},
+                                  'cost': pytest.approx(round(totals['cost'], 2), abs=0.011)}
+
+    assert result['matched_engineers'] == 16
+    assert result['unmatched_engineers'] == len(cycle_times) - 16
+    assert result['unmatched_usage_actors'] == len(usage) - len(matched)
@@ -0,0 +1,91 @@
+"""
+Regression tests for HyperLogLog
+
+The vectorized register update must match a value-at-a-time reference,
+estimates must stay within a few standard errors of the exact distinct
+count, and merging sketches must give the sketch of the union.
+Run with: python -m pytest backend/test_hyperloglog.py
+"""
+
+import pytest
+
+from hyperloglog import MAX_PRECISION, MIN_PRECISION, HyperLogLog, _hash64, precision_for_error
+
+
+def _values(count, prefix='user'):
+    return [f'{prefix}{i}@example.com' for i in range(count)]
+
+
+def _reference_registers(values, precision):
+    """Registers filled one value at a time with Python integers"""
+    registers = [0] * (1 << precision)
+    value_bits = 64 - precision
+    for value in values:
+        hashed = _hash64(value)
+        index = hashed >> value_bits
+        rest = hashed & ((1 << value_bits) - 1)
+        registers[index] = max(registers[index], value_bits - rest.bit_length() + 1)
+    return registers
+
+
+@pytest.mark.parametrize('precision', [MIN_PRECISION, 10, 14, MAX_PRECISION])
+def test_registers_match_reference(precision):
+    values = _values(3000)
+    sketch = HyperLogLog(precision=precision)
+
+    sketch.update(values)
+
+    assert sketch.registers.tolist() == _reference_registers(values, precision)
+
+
+@pytest.mark.parametrize('count', [0, 1, 2, 17, 250, 4000, 60000])
+@pytest.mark.parametrize('precision', [10, 14])
+def test_count_is_within_error(count, precision):
+    sketch = HyperLogLog(precision=precision)
+
+    # Every value twice: repeats must not be counted
+    sketch.update(_values(count))
+    sketch.update(_values(count))
+
+    assert abs(sketch.count() - count) <= max(1, 4 * sketch.error_rate * count)
+
+
+def test_merge_counts_the_union():
+    left, right, union = (HyperLogLog(precision=12) for _ in range(3))
+    left.update(_values(5000))
+    right.update(_values(8000)[3000:] + _values(100, prefix='other'))
+    union.update(_values(8000) + _values(100, prefix='other'))
+
+    merged = left.copy().merge(right)
+
+    assert merged.registers.tolist() == union.registers.tolist()
+    assert right.copy().merge(left).registers.tolist() == union.registers.tolist()
+    assert left.count() <= merged.count()
+
+
+def test_serialization_round_trip():
+    sketch = HyperLogLog(precision=11)
+    sketch.update(_values(700))
+
+    loaded = HyperLogLog.from_bytes(sketch.to_bytes())
+
+    assert loaded.precision == 11
+    assert loaded.registers.tolist() == sketch.registers.tolist()
+    assert loaded.count() == sketch.count()
+
+
+def test_merging_different_precisions_raises():
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=10).merge(HyperLogLog(precision=11))
+
+
+@pytest.mark.parametrize('error_rate,precision', [(0.5, MIN_PRECISION), (0.01, 14), (0.0065, 15), (0.0001, MAX_PRECISION)])
+def test_precision_for_error(error_rate, precision):
+    assert precision_for_error(error_rate) == precision
+    assert HyperLogLog(error_rate).precision == precision
+
+
+@pytest.mark.parametrize('error_rate', [0, 1, -0.1])
+def test_invalid_error_rate_raises(error_rate):
+    with pytest.raises(ValueError):
+        precision_for_error(error_rate)
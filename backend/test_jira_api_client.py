@@ -0,0 +1,203 @@
+"""
+Regression tests for JiraAPIClient fetching
+
+Parallel created-date windows must return exactly the serial page chain,
+rate limits and transient failures are retried, and anything that still
+fails raises instead of truncating the result. Shared sessions refuse
+cookies and only a bounded number of them stay open.
+Run with: python -m pytest backend/test_jira_api_client.py
+"""
+
+import http.server
+import json
+import threading
+
+import pytest
+import requests
+
+import jira_api_client
+from conftest import make_issues
+from jira_api_client import JIRA_MAX_RETRIES, JiraAPIClient, JiraFetchError
+
+SITE = 'https://example.atlassian.net'
+JQL = 'project = PROJ ORDER BY created ASC'
+
+
+def _client():
+    return JiraAPIClient(SITE, 'me@example.com', 'token')
+
+
+def _ids(issues):
+    return [issue['id'] for issue in issues]
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(jira_api_client.time, 'sleep', delays.append)
+    return delays
+
+
+@pytest.mark.parametrize('count', [0, 1, 99, 537])
+@pytest.mark.parametrize('workers,partitions', [(2, None), (4, None), (3, 7), (4, 1), (8, 40)])
+def test_parallel_windows_match_serial_fetch(fake_jira, count, workers, partitions):
+    fake_jira(make_issues(count))
+    client = _client()
+
+    serial = client.get_all_issues(JQL)
+    parallel = client.get_all_issues_parallel(JQL, workers=workers, partitions=partitions)
+
+    assert len(serial) == count
+    assert _ids(parallel) == _ids(serial)
+
+
+def test_parallel_windows_match_serial_fetch_descending(fake_jira):
+    fake_jira(make_issues(300))
+    client = _client()
+    jql = 'project = PROJ ORDER BY created DESC'
+
+    assert sorted(_ids(client.get_all_issues_parallel(jql, workers=4))) == sorted(_ids(client.get_all_issues(jql)))
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_transient_failures_are_retried(fake_jira, sleeps, workers):
+    session = fake_jira(make_issues(250))
+    session.fail_next = [429, 503, requests.Timeout('read timed out'), None, 502]
+
+    issues = _client().get_all_issues(JQL, workers=workers)
+
+    assert len(issues) == 250
+    assert sleeps[:3] == [1, 2, 4]
+
+
+def test_retry_after_is_honoured(fake_jira, sleeps):
+    session = fake_jira(make_issues(10))
+    session.fail_next = [429]
+    session.retry_after = '7'
+
+    assert len(_client().get_all_issues(JQL)) == 10
+    assert sleeps == [7]
+
+
+def test_long_retry_after_raises_instead_of_waiting(fake_jira, sleeps):
+    session = fake_jira(make_issues(10))
+    session.fail_next = [429]
+    session.retry_after = '86400'
+
+    with pytest.raises(JiraFetchError, match='retry requested in 86400s'):
+        _client().get_all_issues(JQL)
+    assert sleeps == []
+    assert len(session.searches) == 1
+
+
+def test_exhausted_retries_raise(fake_jira, sleeps):
+    session = fake_jira(make_issues(250))
+    session.fail_next = [None, 429] + [503] * JIRA_MAX_RETRIES
+
+    with pytest.raises(JiraFetchError, match='503'):
+        _client().get_all_issues(JQL)
+    assert len(session.searches) == JIRA_MAX_RETRIES + 2
+    assert len(sleeps) == JIRA_MAX_RETRIES
+
+
+def test_exhausted_retries_raise_from_parallel_windows(fake_jira, sleeps):
+    session = fake_jira(make_issues(250))
+    # The two date-range queries succeed, then every window is rate limited
+    session.fail_next = [None, None] + [429] * (4 * (JIRA_MAX_RETRIES + 1))
+
+    with pytest.raises(JiraFetchError, match='429'):
+        _client().get_all_issues(JQL, workers=4)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_failed_page_raises(fake_jira, sleeps, workers):
+    session = fake_jira(make_issues(500))
+    # Second pages fail for good (500s are not retried)
+    session.fail_when = lambda params: params.get('nextPageToken') == '100'
+
+    with pytest.raises(JiraFetchError, match='500'):
+        _client().get_all_issues(JQL, workers=workers)
+    assert sleeps == []
+
+
+def test_failed_bounds_query_raises(fake_jira):
+    session = fake_jira(make_issues(300))
+    session.fail_next = [500]
+
+    with pytest.raises(JiraFetchError):
+        _client().get_all_issues(JQL, workers=4)
+    assert len(session.searches) == 1
+
+
+def test_stream_raises_after_yielding_fetched_pages(fake_jira):
+    session = fake_jira(make_issues(250))
+    session.fail_when = lambda params: params.get('nextPageToken') == '200'
+
+    streamed = []
+    with pytest.raises(JiraFetchError):
+        for issue in _client().stream_issues(JQL):
+            streamed.append(issue)
+    assert len(streamed) == 200
+
+
+def test_failed_stream_leaves_export_untouched(fake_jira, tmp_path):
+    session = fake_jira(make_issues(250))
+    export_path = tmp_path / 'jira_export.csv'
+    export_path.write_text('previous export\n')
+    session.fail_when = lambda params: params.get('nextPageToken') == '200'
+    client = _client()
+
+    with pytest.raises(JiraFetchError):
+        client.export_to_csv(client.stream_issues(JQL), str(export_path))
+    assert export_path.read_text() == 'previous export\n'
+    assert [path.name for path in tmp_path.iterdir()] == ['jira_export.csv']
+
+
+@pytest.fixture
+def cookie_site():
+    """Local HTTP site that sets a cookie on every response"""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps({'cookie': self.headers.get('Cookie')}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Set-Cookie', f'JSESSIONID={self.path}; Path=/')
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+    jira_api_client.close_jira_sessions()
+
+
+def test_shared_sessions_refuse_cookies(cookie_site):
+    session = jira_api_client.get_jira_session(cookie_site, 'me@example.com', 'token')
+
+    assert session.get(f'{cookie_site}/first').json() == {'cookie': None}
+    assert session.get(f'{cookie_site}/second').json() == {'cookie': None}
+    assert len(session.cookies) == 0
+
+
+def test_least_recently_used_sessions_are_closed(cookie_site, monkeypatch):
+    monkeypatch.setattr(jira_api_client, 'JIRA_MAX_SESSIONS', 2)
+    closed = []
+    sessions = [jira_api_client.get_jira_session(cookie_site, f'user{i}@example.com', 'token') for i in range(2)]
+    for session in sessions:
+        monkeypatch.setattr(session, 'close', lambda session=session: closed.append(session) or requests.Session.close(session))
+
+    # Using the first session makes the second the least recently used
+    assert jira_api_client.get_jira_session(cookie_site, 'user0@example.com', 'token') is sessions[0]
+    jira_api_client.get_jira_session(cookie_site, 'user2@example.com', 'token')
+
+    assert closed == [sessions[1]]
+    assert len(jira_api_client.jira_session_stats()) == 2
+    # A client still holding the evicted session can keep using it
+    assert sessions[1].get(f'{cookie_site}/after').json() == {'cookie': None}
@@ -0,0 +1,107 @@
+"""
+Regression tests for /api/fetch-jira syncs
+
+An incremental sync must leave the export and the issue store exactly as a
+full fetch would, and a sync whose fetch fails part way must save nothing:
+the export, the stored issues and the watermark stay as they were.
+Run with: python -m pytest backend/test_jira_sync.py
+"""
+
+import csv
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app as backend
+from conftest import make_issue, make_issues
+from issue_store import IssueStore
+from jira_sync import JiraSyncState
+
+SITE = 'https://example.atlassian.net'
+PROJECT = 'PROJ'
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, 'JIRA_EXPORT_PATH', str(tmp_path / 'jira_export.csv'))
+    monkeypatch.setattr(backend, 'PROCESSED_DATA_PATH', str(tmp_path / 'processed_data.csv'))
+    monkeypatch.setattr(backend, 'PROCESSED_SNAPSHOT_PATH', str(tmp_path / 'processed_snapshot'))
+    monkeypatch.setattr(backend, 'jira_sync_state', JiraSyncState(str(tmp_path / 'jira_sync_state.json')))
+    monkeypatch.setattr(backend, 'issue_store', IssueStore(str(tmp_path / 'issues.sqlite3')))
+    return backend.app.test_client()
+
+
+def _fetch(client, **options):
+    body = {
+        'jira_url': SITE, 'email': 'me@example.com', 'api_token': 'token',
+        'project_key': PROJECT, 'claude_adoption_date': '2025-02-01', **options
+    }
+    return client.post('/api/fetch-jira', json=body)
+
+
+def _export_rows():
+    with open(backend.JIRA_EXPORT_PATH, newline='', encoding='utf-8') as f:
+        return sorted(tuple(row.items()) for row in csv.DictReader(f))
+
+
+def _stored_rows():
+    return sorted(map(tuple, backend.issue_store.issues_frame(SITE, PROJECT).astype(str).values.tolist()))
+
+
+def _saved_state():
+    with open(backend.JIRA_EXPORT_PATH, 'rb') as f:
+        export = f.read()
+    return export, backend.jira_sync_state.watermark(SITE, PROJECT, backend.JIRA_EXPORT_PATH), _stored_rows()
+
+
+def _edit(issues, numbers, days):
+    """Move the given issues to Done, updated `days` after their last update"""
+    for number in numbers:
+        fields = issues[number]['fields']
+        fields['status'] = {'name': 'Done'}
+        fields['updated'] = (datetime.fromisoformat(fields['updated']) + timedelta(days=days)) \
+            .strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+
+
+def _create(issues, count):
+    """Add count issues created after every existing update, as new issues would be"""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    issues.extend(make_issue(len(issues) + i, start + timedelta(hours=5 * i)) for i in range(count))
+
+
+@pytest.mark.parametrize('time_zone', ['UTC', 'America/Los_Angeles'])
+def test_incremental_sync_matches_full_fetch(client, fake_jira, time_zone):
+    issues = make_issues(250)
+    fake_jira(issues, time_zone)
+    assert _fetch(client).status_code == 200
+
+    _edit(issues, [4, 8, 120], days=200)
+    _create(issues, 30)
+    response = _fetch(client, sync='incremental')
+    assert response.status_code == 200
+    assert response.get_json()['sync']['mode'] == 'incremental'
+    incremental = _export_rows(), _stored_rows()
+
+    assert _fetch(client).status_code == 200
+    assert (_export_rows(), _stored_rows()) == incremental
+
+
+@pytest.mark.parametrize('options', [{}, {'stream': True}, {'workers': 3}, {'sync': 'incremental'}])
+def test_failed_page_saves_nothing(client, fake_jira, options):
+    issues = make_issues(250)
+    session = fake_jira(issues)
+    assert _fetch(client).status_code == 200
+    before = _saved_state()
+
+    _edit(issues, [4, 8], days=200)
+    _create(issues, 150)
+    # The second page of every search fails, after the first has been written
+    session.fail_when = lambda params: params.get('nextPageToken') == '100'
+
+    response = _fetch(client, **options)
+
+    assert response.status_code == 502
+    assert 'nothing was saved' in response.get_json()['error']
+    assert _saved_state() == before
+    assert not os.path.exists(f'{backend.JIRA_EXPORT_PATH}.tmp')
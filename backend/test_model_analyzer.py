@@ -0,0 +1,139 @@
+"""
+Regression tests for ModelUsageAnalyzer
+
+Every section (summary, by model, by day, by organization) must match
+totals accumulated record by record from the raw JSON, with and without
+a date range.
+Run with: python -m pytest backend/test_model_analyzer.py
+"""
+
+import json
+import math
+import os
+from collections import defaultdict
+
+import pytest
+
+from model_analyzer import TOKEN_COLUMNS, ModelUsageAnalyzer
+from usage_store import UsageStore
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+USAGE_FILES = ['fintechco_api_usage_data.json', 'pharmaco_api_usage_data.json']
+DATE_RANGES = [(None, None), ('2025-08-01', None), (None, '2025-07-15'), ('2025-07-20', '2025-07-27'),
+               ('2030-01-01', None)]
+
+# Token field of each model breakdown -> ModelUsageAnalyzer column
+TOKEN_FIELDS = dict(zip(['cache_creation', 'cache_read', 'input', 'output'], TOKEN_COLUMNS))
+
+
+def _ratio(numerator, denominator, digits=4):
+    return round(numerator / denominator, digits) if denominator else None
+
+
+def _scan(records, key, start_date, end_date):
+    """Cost, token and activity totals per group key, one record at a time"""
+    groups = defaultdict(lambda: defaultdict(float))
+    for record in records:
+        day = record['date'][:10]
+        if (start_date and day < start_date) or (end_date and day >= end_date):
+            continue
+        totals = groups[key(record)]
+        metrics = record['core_metrics']
+        totals['records'] += 1
+        totals['lines_added'] += metrics['lines_of_code']['added']
+        totals['commits'] += metrics['commits_by_claude_code']
+        totals['pull_requests'] += metrics['pull_requests_by_claude_code']
+        for breakdown in record['model_breakdown']:
+            totals['model_entries'] += 1
+            totals['cost'] += breakdown['estimated_cost']['amount']
+            for field, column in TOKEN_FIELDS.items():
+                totals[column] += breakdown['tokens'][field]
+    return groups
+
+
+def _entry(totals, activity=True, total_cost=None):
+    prompt_tokens = totals['cache_read_tokens'] + totals['cache_creation_tokens'] + totals['input_tokens']
+    entry = {
+        'cost': round(totals['cost'], 4),
+        **{column: int(totals[column]) for column in TOKEN_COLUMNS},
+        'total_tokens': int(prompt_tokens + totals['output_tokens']),
+        'cache_hit_ratio': _ratio(totals['cache_read_tokens'], prompt_tokens),
+    }
+    if total_cost is not None:
+        entry['cost_share'] = _ratio(totals['cost'], total_cost)
+    if activity:
+        for column, label in (('lines_added', 'loc'), ('commits', 'commit'), ('pull_requests', 'pr')):
+            entry[column] = int(totals[column])
+            entry[f'cost_per_{label}'] = _ratio(totals['cost'], totals[column], digits=6)
+    return entry
+
+
+def _model_scan(records, start_date, end_date):
+    """by_model totals: each model breakdown is its own group"""
+    split = [
+        {**record, 'model_breakdown': [breakdown]}
+        for record in records for breakdown in record['model_breakdown']
+    ]
+    return _scan(split, lambda record: record['model_breakdown'][0]['model'], start_date, end_date)
+
+
+def _assert_close(actual, expected):
+    """Equal, except floats may differ in the last digits (sums run in a different order)"""
+    if isinstance(expected, float) and isinstance(actual, float):
+        assert math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-4), (actual, expected)
+    elif isinstance(expected, dict):
+        assert isinstance(actual, dict) and actual.keys() == expected.keys(), (actual, expected)
+        for key in expected:
+            _assert_close(actual[key], expected[key])
+    elif isinstance(expected, list):
+        assert isinstance(actual, list) and len(actual) == len(expected), (actual, expected)
+        for a, e in zip(actual, expected):
+            _assert_close(a, e)
+    else:
+        assert actual == expected
+
+
+@pytest.fixture(scope='module', params=USAGE_FILES)
+def usage(request):
+    path = os.path.join(DATA_DIR, request.param)
+    with open(path, encoding='utf-8') as f:
+        records = json.load(f)['data']
+    return UsageStore.from_file(path), records
+
+
+@pytest.mark.parametrize('start_date,end_date', DATE_RANGES)
+def test_sections_match_scan(usage, start_date, end_date):
+    store, records = usage
+
+    result = ModelUsageAnalyzer(store, start_date, end_date).analyze()
+
+    summary = _scan(records, lambda record: None, start_date, end_date).get(None, defaultdict(float))
+    _assert_close(result['summary'], {
+        'records': int(summary['records']), 'model_entries': int(summary['model_entries']), **_entry(summary)
+    })
+
+    by_model = _model_scan(records, start_date, end_date)
+    total_cost = sum(totals['cost'] for totals in by_model.values())
+    _assert_close(sorted(result['by_model'], key=lambda entry: entry['model']), [
+        {'model': model, **_entry(by_model[model], activity=False, total_cost=total_cost)}
+        for model in sorted(by_model)
+    ])
+    costs = [entry['cost'] for entry in result['by_model']]
+    assert costs == sorted(costs, reverse=True)
+
+    by_day = _scan(records, lambda record: record['date'][:10], start_date, end_date)
+    _assert_close(result['by_day'], [{'date': day, **_entry(by_day[day])} for day in sorted(by_day)])
+
+    by_organization = _scan(records, lambda record: record['organization_id'], start_date, end_date)
+    _assert_close(sorted(result['by_organization'], key=lambda entry: entry['organization_id']), [
+        {'organization_id': organization_id, **_entry(by_organization[organization_id])}
+        for organization_id in sorted(by_organization)
+    ])
+
+
+def test_empty_store():
+    result = ModelUsageAnalyzer(UsageStore.from_records([])).analyze()
+
+    assert result['summary']['records'] == 0
+    assert result['summary']['cache_hit_ratio'] is None
+    assert result['by_model'] == result['by_day'] == result['by_organization'] == []
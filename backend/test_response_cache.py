@@ -0,0 +1,191 @@
+"""
+Regression tests for the response cache
+
+Cached payloads get a strong ETag per representation, conditional GETs are
+answered with 304 (and only GET/HEAD ever are), the best accepted encoding
+is served, and the LRU evicts by total bytes held. Streamed gzip and the
+orjson provider must produce what gzip and Flask's default provider do.
+Run with: python -m pytest backend/test_response_cache.py
+"""
+
+import dataclasses
+import gzip
+import hashlib
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import app as backend
+from response_cache import (MIN_COMPRESS_BYTES, CachedPayload, FastJSONProvider, ResponseCache,
+                            cached_json_response, gzip_chunks)
+
+LARGE_BODY = json.dumps({'rows': list(range(2000))}).encode('utf-8')
+SMALL_BODY = b'{"ok":true}'
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.route('/payload/<size>', methods=['GET', 'POST'])
+    def payload(size):
+        return cached_json_response(CachedPayload(LARGE_BODY if size == 'large' else SMALL_BODY))
+
+    return app.test_client()
+
+
+def test_etag_is_per_representation():
+    cached = CachedPayload(LARGE_BODY)
+
+    assert cached.etag == hashlib.sha256(LARGE_BODY).hexdigest()
+    assert CachedPayload(LARGE_BODY).etag == cached.etag
+    assert gzip.decompress(cached.encodings['gzip']) == LARGE_BODY
+    assert CachedPayload(SMALL_BODY).encodings == {}
+    assert len(SMALL_BODY) < MIN_COMPRESS_BYTES
+
+
+def test_serves_accepted_encoding(client):
+    identity = client.get('/payload/large')
+    compressed = client.get('/payload/large', headers={'Accept-Encoding': 'gzip'})
+    small = client.get('/payload/small', headers={'Accept-Encoding': 'gzip'})
+
+    assert identity.data == LARGE_BODY and 'Content-Encoding' not in identity.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == LARGE_BODY
+    assert compressed.headers['ETag'] == f'"{identity.headers["ETag"][1:-1]}-gzip"'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert 'Content-Encoding' not in small.headers and 'Vary' not in small.headers
+
+
+@pytest.mark.parametrize('method', ['GET', 'HEAD'])
+@pytest.mark.parametrize('encoding', [None, 'gzip'])
+def test_conditional_get_returns_304(client, method, encoding):
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    etag = client.get('/payload/large', headers=headers).headers['ETag']
+
+    matched = client.open('/payload/large', method=method, headers={**headers, 'If-None-Match': etag})
+    stale = client.open('/payload/large', method=method, headers={**headers, 'If-None-Match': '"stale"'})
+
+    assert matched.status_code == 304 and matched.data == b''
+    assert matched.headers['ETag'] == etag
+    assert stale.status_code == 200
+
+
+def test_other_representation_etag_does_not_match(client):
+    identity_etag = client.get('/payload/large').headers['ETag']
+
+    response = client.get('/payload/large', headers={'Accept-Encoding': 'gzip', 'If-None-Match': identity_etag})
+
+    assert response.status_code == 200
+
+
+def test_post_ignores_if_none_match(client):
+    etag = client.get('/payload/large').headers['ETag']
+
+    response = client.post('/payload/large', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.data == LARGE_BODY
+
+
+def test_demo_data_post_ignores_if_none_match():
+    client = backend.app.test_client()
+    body = {'claude_adoption_date': '2025-08-25', 'company': 'pharmaco'}
+    first = client.post('/api/fetch-demo-data', json=body)
+
+    repeat = client.post('/api/fetch-demo-data', json=body, headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.status_code == 200
+    assert repeat.status_code == 200 and repeat.data == first.data
+
+
+def _body(size, fill=b'x'):
+    return b'"' + fill * (size - 2) + b'"'
+
+
+def test_lru_eviction_and_byte_accounting():
+    cache = ResponseCache(max_bytes=1000)
+    for key in 'abc':
+        cache.put_body(key, _body(300))
+    assert cache.total_bytes == 900
+
+    # Reading 'a' makes 'b' the least recently used, so it goes first
+    assert cache.get('a') is not None
+    cache.put_body('d', _body(300))
+    assert cache.get('b') is None
+    assert [key for key in 'acd' if cache.get(key) is not None] == ['a', 'c', 'd']
+    assert cache.total_bytes == 900
+
+    # Replacing an entry only counts its new size
+    cache.put_body('a', _body(100))
+    assert cache.total_bytes == 700
+
+    stats = cache.stats()
+    assert stats['entries'] == 3 and stats['total_bytes'] == 700
+    assert stats['hits'] == 4 and stats['misses'] == 1
+
+
+def test_compressed_encodings_count_towards_size():
+    cache = ResponseCache(max_bytes=10 ** 6)
+    cached = cache.put_body('large', LARGE_BODY)
+
+    assert cached.size == len(LARGE_BODY) + len(cached.encodings['gzip'])
+    assert cache.total_bytes == cached.size
+
+
+def test_oversized_payload_is_served_but_not_kept():
+    cache = ResponseCache(max_bytes=500)
+    cache.put_body('kept', _body(400))
+
+    cached = cache.put_body('huge', _body(600))
+
+    assert cached.body == _body(600)
+    assert cache.get('huge') is None
+    assert cache.get('kept') is not None
+    assert cache.total_bytes == 400
+
+    cache.clear()
+    assert cache.total_bytes == 0 and cache.stats()['entries'] == 0
+
+
+@pytest.mark.parametrize('chunks', [[], [b''], [LARGE_BODY], [b'', LARGE_BODY[:7], b'', LARGE_BODY[7:]],
+                                    [LARGE_BODY[i:i + 100] for i in range(0, len(LARGE_BODY), 100)]])
+def test_gzip_chunks_decompress_to_body(chunks):
+    compressed = b''.join(gzip_chunks(iter(chunks)))
+
+    assert gzip.decompress(compressed) == b''.join(chunks)
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    label: str
+
+
+@pytest.mark.skipif(not FastJSONProvider.available, reason='orjson is not installed')
+def test_fast_json_provider_matches_default():
+    app = Flask(__name__)
+    fast, default = FastJSONProvider(app), DefaultJSONProvider(app)
+    payload = {
+        'b': [1, 2.5, None, True, 'zoë'], 'a': {'nested': {'z': 1, 'y': [{}]}},
+        'when': datetime(2025, 8, 25, 12, 30, tzinfo=timezone.utc), 'day': date(2025, 8, 25),
+        'amount': Decimal('12.50'), 'id': uuid.UUID(int=7), 'point': Point(3, 'p')
+    }
+
+    assert json.loads(fast.dumps(payload)) == json.loads(default.dumps(payload))
+    assert list(json.loads(fast.dumps(payload))) == sorted(payload)
+
+
+@pytest.mark.skipif(not FastJSONProvider.available, reason='orjson is not installed')
+def test_fast_json_provider_serializes_numpy_and_nan():
+    fast = FastJSONProvider(Flask(__name__))
+
+    assert json.loads(fast.dumps({
+        'int': np.int64(3), 'float': np.float32(0.5), 'array': np.arange(3), 'nan': float('nan')
+    })) == {'int': 3, 'float': 0.5, 'array': [0, 1, 2], 'nan': None}
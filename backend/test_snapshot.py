@@ -0,0 +1,86 @@
+"""
+Regression tests for processed-data snapshots
+
+A snapshot written by ROIAnalyzer.export_processed_data must reload into
+the same analysis as the CSV it came from, and a lean load must only read
+the columns the metrics need.
+Run with: python -m pytest backend/test_snapshot.py
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from data_analyzer import IssueDataset, ROIAnalyzer, clear_dataset_cache, load_dataset
+from snapshot import read_snapshot, write_snapshot
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+DATASETS = ['fintechco_data.csv', 'pharmaco_data.csv', 'demo_data.csv', 'jira_export.csv']
+
+
+def _as_json(value):
+    return json.dumps(value, sort_keys=True, default=float)
+
+
+@pytest.fixture
+def snapshot_of(tmp_path):
+    def write(dataset):
+        path = str(tmp_path / 'snapshot')
+        ROIAnalyzer(os.path.join(DATA_DIR, dataset), '2025-08-25').export_processed_data(path, format='snapshot')
+        return path
+    yield write
+    clear_dataset_cache()
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+@pytest.mark.parametrize('lean', [False, True])
+def test_snapshot_analysis_matches_csv(snapshot_of, dataset, lean):
+    csv_path = os.path.join(DATA_DIR, dataset)
+    snapshot_path = snapshot_of(dataset)
+
+    for adoption_date in ('2025-06-01', '2025-08-25'):
+        reference = ROIAnalyzer(csv_path, adoption_date)
+        snapshot = ROIAnalyzer(snapshot_path, adoption_date, lean=lean)
+
+        assert snapshot.source_rows == reference.source_rows
+        for granularity in ROIAnalyzer.TIME_SERIES_FREQUENCIES:
+            assert _as_json(snapshot.analyze(granularity)) == _as_json(reference.analyze(granularity))
+        assert _as_json(snapshot.get_adoption_sweep(step_days=7)) == _as_json(reference.get_adoption_sweep(step_days=7))
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+def test_lean_snapshot_skips_unused_columns(snapshot_of, dataset):
+    snapshot_path = snapshot_of(dataset)
+
+    full = load_dataset(snapshot_path)
+    lean = load_dataset(snapshot_path, lean=True)
+
+    assert lean is not full and lean.lean
+    assert {'Summary', 'Description', 'Assignee', 'Created'} <= set(full.df.columns)
+    assert not {'Summary', 'Description', 'Assignee', 'Created'} & set(lean.df.columns)
+    assert set(lean.df.columns) == set(IssueDataset.from_csv(os.path.join(DATA_DIR, dataset), lean=True).df.columns)
+    assert lean.memory_bytes < full.memory_bytes
+
+
+def test_snapshot_round_trips_column_types(tmp_path):
+    df = pd.DataFrame({
+        'count': [3, 1, 2],
+        'ratio': [0.5, float('nan'), 2.25],
+        'flag': [True, False, True],
+        'when': pd.to_datetime(['2025-01-02', None, '2025-03-04']),
+        'label': ['b', None, 'a'],
+        'kind': pd.Categorical(['x', 'y', 'x']),
+    })
+    write_snapshot(df, str(tmp_path / 'snapshot'), metadata={'source_rows': 5})
+
+    loaded, metadata = read_snapshot(str(tmp_path / 'snapshot'), mmap=False)
+    subset, _ = read_snapshot(str(tmp_path / 'snapshot'), columns=['when', 'count'])
+
+    assert metadata == {'source_rows': 5}
+    pd.testing.assert_frame_equal(loaded.drop(columns='label'), df.drop(columns='label'))
+    assert loaded['label'].astype(object).where(loaded['label'].notna(), None).tolist() == ['b', None, 'a']
+    assert list(subset.columns) == ['count', 'when']
+    assert not os.path.exists(tmp_path / 'snapshot.tmp')
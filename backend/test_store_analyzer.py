@@ -0,0 +1,103 @@
+"""
+Regression tests for StoreROIAnalyzer
+
+Aggregating a project in SQLite must give what ROIAnalyzer gives on the
+same export: every dashboard section at every granularity, the adoption
+sweep, engineer cycle times, filtered analysis and the processed export.
+Run with: python -m pytest backend/test_store_analyzer.py
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analyzer import IssueDataset, ROIAnalyzer
+from issue_store import IssueStore
+from store_analyzer import StoreROIAnalyzer
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+SITE = 'https://example.atlassian.net'
+DATASETS = ['fintechco_data.csv', 'pharmaco_data.csv', 'demo_data.csv', 'jira_export.csv']
+ADOPTION_DATES = ['2025-06-01', '01/Sep/25', '2026-01-01']
+
+
+def _as_json(value):
+    """JSON with floats rounded (SQLite sums in a different order than pandas)"""
+    def normalize(value):
+        if isinstance(value, dict):
+            return {key: normalize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [normalize(item) for item in value]
+        if isinstance(value, (float, np.floating)):
+            return None if math.isnan(value) else round(float(value), 6)
+        if isinstance(value, np.integer):
+            return int(value)
+        return value
+    return json.dumps(normalize(value), sort_keys=True)
+
+
+def test_database_is_created_on_first_use(tmp_path):
+    store = IssueStore(str(tmp_path / 'issues.sqlite3'))
+    assert not os.path.exists(tmp_path / 'issues.sqlite3')
+
+    assert store.partitions() == []
+    assert os.path.exists(tmp_path / 'issues.sqlite3')
+
+
+@pytest.fixture(scope='module')
+def store(tmp_path_factory):
+    store = IssueStore(str(tmp_path_factory.mktemp('store') / 'issues.sqlite3'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for dataset in DATASETS:
+            store.replace_partition_from_csv(SITE, dataset, os.path.join(DATA_DIR, dataset))
+    return store
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+@pytest.mark.parametrize('adoption_date', ADOPTION_DATES)
+def test_store_analysis_matches_in_memory(store, dataset, adoption_date):
+    stored = StoreROIAnalyzer(store, SITE, dataset, adoption_date)
+    reference = ROIAnalyzer(os.path.join(DATA_DIR, dataset), adoption_date)
+
+    assert stored.source_rows == len(reference.df)
+    for granularity in ROIAnalyzer.TIME_SERIES_FREQUENCIES:
+        assert _as_json(stored.analyze(granularity)) == _as_json(reference.analyze(granularity))
+    assert _as_json(stored.get_adoption_sweep(step_days=3)) == _as_json(reference.get_adoption_sweep(step_days=3))
+    assert _as_json(stored.get_engineer_cycle_times().to_dict('records')) == \
+        _as_json(reference.get_engineer_cycle_times().to_dict('records'))
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+def test_filtered_store_analysis_matches_in_memory(store, dataset):
+    csv_path = os.path.join(DATA_DIR, dataset)
+    df = IssueDataset(pd.read_csv(csv_path)).df
+    kept = df[(df['Created_dt'] >= '2025-07-01') & (df['Created_dt'] < '2025-09-01') & (df['Status'] == 'Done')]
+    raw = pd.read_csv(csv_path)
+    reference = ROIAnalyzer(csv_path, '2025-08-01', dataset=IssueDataset(raw[raw.index.isin(kept.index)].copy()))
+
+    stored = StoreROIAnalyzer(store, SITE, dataset, '2025-08-01', since='2025-07-01', until='2025-09-01', status='Done')
+
+    assert _as_json(stored.analyze('month')) == _as_json(reference.analyze('month'))
+    assert _as_json(stored.get_adoption_sweep()) == _as_json(reference.get_adoption_sweep())
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+def test_store_export_matches_in_memory(store, dataset, tmp_path):
+    stored = StoreROIAnalyzer(store, SITE, dataset, '2025-08-25')
+    reference = ROIAnalyzer(os.path.join(DATA_DIR, dataset), '2025-08-25')
+
+    stored.export_processed_data(str(tmp_path / 'stored.csv'))
+    reference.export_processed_data(str(tmp_path / 'in_memory.csv'))
+    stored.export_processed_data(str(tmp_path / 'snapshot'), format='snapshot')
+
+    assert (tmp_path / 'stored.csv').read_bytes() == (tmp_path / 'in_memory.csv').read_bytes()
+    snapshot = ROIAnalyzer(str(tmp_path / 'snapshot'), '2025-08-25')
+    assert _as_json(snapshot.analyze()) == _as_json(reference.analyze())
+
@@ -0,0 +1,70 @@
+"""
+Regression tests for StreamingROIAnalyzer
+
+Folding the CSV in small chunks must give exactly what the in-memory
+ROIAnalyzer gives on the whole file: every dashboard section at every
+granularity, the adoption sweep and the processed-data export.
+Run with: python -m pytest backend/test_streaming_analyzer.py
+"""
+
+import json
+import os
+
+import pytest
+
+from data_analyzer import ROIAnalyzer
+from streaming_analyzer import StreamingROIAnalyzer
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+DATASETS = ['fintechco_data.csv', 'pharmaco_data.csv', 'demo_data.csv', 'jira_export.csv']
+ADOPTION_DATES = ['2025-06-01', '01/Sep/25', '2026-01-01']
+
+
+def _as_json(value):
+    return json.dumps(value, sort_keys=True, default=float)
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+@pytest.mark.parametrize('adoption_date', ADOPTION_DATES)
+@pytest.mark.parametrize('chunksize', [41, 1000])
+def test_streaming_matches_in_memory(dataset, adoption_date, chunksize):
+    csv_path = os.path.join(DATA_DIR, dataset)
+
+    streaming = StreamingROIAnalyzer(csv_path, adoption_date, chunksize=chunksize)
+    reference = ROIAnalyzer(csv_path, adoption_date, lean=True)
+
+    assert streaming.source_rows == reference.source_rows
+    for granularity in ROIAnalyzer.TIME_SERIES_FREQUENCIES:
+        assert _as_json(streaming.analyze(granularity)) == _as_json(reference.analyze(granularity))
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+@pytest.mark.parametrize('sweep', [{}, {'step_days': 5}, {'start': '2025-07-01', 'end': '2025-10-15', 'step_days': 2}])
+def test_streaming_adoption_sweep_matches_in_memory(dataset, sweep):
+    csv_path = os.path.join(DATA_DIR, dataset)
+
+    streaming = StreamingROIAnalyzer(csv_path, '2025-08-25', chunksize=97)
+    reference = ROIAnalyzer(csv_path, '2025-08-25', lean=True)
+
+    assert _as_json(streaming.get_adoption_sweep(**sweep)) == _as_json(reference.get_adoption_sweep(**sweep))
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+def test_streaming_export_matches_in_memory(dataset, tmp_path):
+    csv_path = os.path.join(DATA_DIR, dataset)
+
+    StreamingROIAnalyzer(csv_path, '2025-08-25', chunksize=97).export_processed_data(str(tmp_path / 'streamed.csv'))
+    ROIAnalyzer(csv_path, '2025-08-25', lean=True).export_processed_data(str(tmp_path / 'in_memory.csv'))
+
+    assert (tmp_path / 'streamed.csv').read_bytes() == (tmp_path / 'in_memory.csv').read_bytes()
+
+
+def test_streaming_rejects_row_level_operations(tmp_path):
+    analyzer = StreamingROIAnalyzer(os.path.join(DATA_DIR, 'demo_data.csv'), '2025-08-25', chunksize=97)
+
+    with pytest.raises(ValueError):
+        analyzer.export_processed_data(str(tmp_path / 'snapshot'), format='snapshot')
+    with pytest.raises(ValueError):
+        analyzer.get_engineer_cycle_times()
+    assert not os.path.exists(tmp_path / 'snapshot')
@@ -0,0 +1,118 @@
+"""
+Regression tests for UsageAnalyzer
+
+Analyzing the daily rollups must give exactly what analyzing the raw usage
+records gives, and approximate mode must take its distinct-user counts from
+the rollups' stored sketches.
+Run with: python -m pytest backend/test_usage_analyzer.py
+"""
+
+import contextlib
+import io
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from usage_analyzer import UsageAnalyzer
+from usage_rollups import UsageRollups
+from usage_store import UsageStore
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+SOURCES = {'fintechco': 'fintechco_api_usage_data.json', 'pharmaco': 'pharmaco_api_usage_data.json'}
+DATE_RANGES = [(None, None), ('2025-09-01', None), ('2025-08-25', '2025-10-01')]
+
+
+def _as_json(value):
+    return json.dumps(value, sort_keys=True, default=float)
+
+
+@pytest.fixture(scope='module')
+def rollups(tmp_path_factory):
+    rollups = UsageRollups(str(tmp_path_factory.mktemp('rollups') / 'usage_rollups.sqlite3'), sketch_error_rate=0.01)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for source, filename in SOURCES.items():
+            rollups.sync(source, UsageStore.from_file(os.path.join(DATA_DIR, filename)))
+    return rollups
+
+
+@pytest.mark.parametrize('source', SOURCES)
+@pytest.mark.parametrize('start_date,end_date', DATE_RANGES)
+def test_rollup_analysis_matches_records(rollups, source, start_date, end_date):
+    path = os.path.join(DATA_DIR, SOURCES[source])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from_records = UsageAnalyzer.from_file(path, start_date, end_date).analyze()
+        from_rollups = UsageAnalyzer.from_rollups(rollups, source, start_date, end_date).analyze()
+
+    assert _as_json(from_rollups) == _as_json(from_records)
+
+
+@pytest.mark.parametrize('source', SOURCES)
+@pytest.mark.parametrize('start_date,end_date', DATE_RANGES)
+def test_approximate_counts_come_from_stored_sketches(rollups, source, start_date, end_date):
+    with contextlib.redirect_stdout(io.StringIO()):
+        exact = UsageAnalyzer.from_rollups(rollups, source, start_date, end_date).analyze()
+        approximate = UsageAnalyzer.from_rollups(rollups, source, start_date, end_date, approximate=True).analyze()
+
+    assert approximate['summary']['unique_users'] == \
+        rollups.distinct_actors(source, start_date, end_date, approximate=True)
+    assert approximate['summary']['unique_users'] == pytest.approx(exact['summary']['unique_users'], rel=0.05)
+
+    exact_days = {day['date']: day['active_users'] for day in exact['active_users_time_series']}
+    approximate_days = {day['date']: day['active_users'] for day in approximate['active_users_time_series']}
+    assert approximate_days.keys() == exact_days.keys()
+    for date, count in approximate_days.items():
+        assert count == pytest.approx(exact_days[date], rel=0.05, abs=1)
+
+    # Everything that isn't a distinct-user estimate is unchanged
+    for section in ('loc_time_series', 'pr_commit_time_series', 'org_penetration', 'top_users'):
+        assert _as_json(approximate[section]) == _as_json(exact[section])
+
+
+def test_distinct_actors_matches_active_users(rollups):
+    for source in SOURCES:
+        months = rollups.active_users(source, 'month', since='2025-09-01', until='2025-10-01')
+        assert rollups.distinct_actors(source, since='2025-09-01', until='2025-10-01') == months[0]['active_users']
+        assert rollups.distinct_actors(source, since='2030-01-01') == 0
+        assert rollups.distinct_actors(source, since='2030-01-01', approximate=True) == 0
+
+
+@pytest.mark.parametrize('limit', [1, 3, 10, 50])
+def test_top_users_match_full_sort(limit):
+    # Many session ties, so first-seen order decides between users
+    emails = [f'user{i % 23}@engineering.example.com' for i in range(400)]
+    day = pd.Timestamp('2025-09-01', tz='UTC')
+    df = pd.DataFrame({
+        'email': emails,
+        'date': day,
+        'day': day,
+        'sessions': [(i * 7) % 5 for i in range(400)],
+        'lines_of_code': range(400),
+        'commits': 1,
+        'prs': 0,
+    })
+
+    top = UsageAnalyzer(df).get_top_users(limit)
+
+    totals = df.groupby('email', sort=False)[['sessions', 'lines_of_code', 'commits', 'prs']].sum()
+    expected = sorted(totals.reset_index().to_dict('records'), key=lambda user: -user['sessions'])[:limit]
+    assert [user['email'] for user in top] == [user['email'] for user in expected]
+    assert [user['sessions'] for user in top] == [user['sessions'] for user in expected]
+
+
+def test_records_without_email_count_as_other():
+    records = [
+        {'date': '2025-09-01T00:00:00Z', 'actor': {'email_address': email},
+         'core_metrics': {'num_sessions': 2, 'lines_of_code': {'added': 5}}}
+        for email in ['dev@engineering.example.com', '', None, 'no-domain']
+    ] + [{'date': '2025-09-01T00:00:00Z', 'core_metrics': {'num_sessions': 1}}]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = UsageAnalyzer.from_records(records).analyze()
+
+    organizations = {user['email']: user['organization'] for user in result['top_users']}
+    assert organizations[''] == organizations['no-domain'] == 'Other'
+    assert sum(entry['active_users'] for entry in result['org_penetration']) == 3
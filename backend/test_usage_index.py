@@ -0,0 +1,173 @@
+"""
+Regression tests for UsageIndex and /api/usage-data
+
+Filtered, paged queries must return exactly the records a linear scan of
+the file finds, in date order. Records are read by the byte spans of the
+indexed file version, so a file that changes under a reader must stop the
+read (or be refused before the response starts) instead of serving bytes
+from the wrong version.
+Run with: python -m pytest backend/test_usage_index.py
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+
+import pytest
+
+import app as backend
+from usage_index import UsageFileChangedError, UsageIndex
+from usage_store import UsageStore
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+USAGE_FILE = 'pharmaco_api_usage_data.json'
+
+
+def _in_date_order(records):
+    return sorted(records, key=lambda record: datetime.fromisoformat(record['date'].replace('Z', '+00:00')))
+
+
+def _touch(path):
+    """Give the file a new version without changing its contents"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def usage_path(tmp_path):
+    shutil.copy(os.path.join(DATA_DIR, USAGE_FILE), tmp_path)
+    return str(tmp_path / USAGE_FILE)
+
+
+def test_reading_stops_when_file_changes(usage_path):
+    index = UsageIndex(UsageStore.from_file(usage_path))
+    rows = index.select()
+
+    with index.open_file() as f:
+        records = index.iter_raw(rows, f)
+        next(records)
+        _touch(usage_path)
+        with pytest.raises(UsageFileChangedError):
+            list(records)
+
+    with pytest.raises(UsageFileChangedError):
+        index.open_file()
+
+
+@pytest.fixture(scope='module')
+def scanned():
+    path = os.path.join(DATA_DIR, 'fintechco_api_usage_data.json')
+    with open(path, encoding='utf-8') as f:
+        records = _in_date_order(json.load(f)['data'])
+    return UsageIndex(UsageStore.from_file(path)), records
+
+
+def _filters(records):
+    """Filter combinations that hit, straddle and miss the data"""
+    actors = sorted({record['actor']['email_address'] for record in records})
+    organizations = sorted({record['organization_id'] for record in records})
+    dates = sorted({record['date'][:10] for record in records})
+    combinations = []
+    for since, until in [(None, None), (dates[3], None), (None, dates[-5]), (dates[10], dates[20]),
+                         (dates[5], dates[5]), ('2020-01-01', '2020-02-01')]:
+        for actor in [None, actors[0], actors[-1], 'nobody@example.com']:
+            for organization_id in [None, organizations[0], organizations[-1]]:
+                combinations.append((since, until, actor, organization_id))
+    return combinations
+
+
+def test_select_matches_linear_scan(scanned):
+    index, records = scanned
+
+    for since, until, actor, organization_id in _filters(records):
+        expected = [
+            record for record in records
+            if (since is None or record['date'][:10] >= since) and (until is None or record['date'][:10] < until)
+            and (actor is None or record['actor']['email_address'] == actor)
+            and (organization_id is None or record['organization_id'] == organization_id)
+        ]
+        rows = index.select(since, until, actor, organization_id)
+        assert list(index.iter_records(rows)) == expected, (since, until, actor, organization_id)
+
+
+@pytest.mark.parametrize('limit', [1, 7, 250, 100000])
+def test_pages_cover_selection_once(scanned, limit):
+    index, records = scanned
+    actor = records[0]['actor']['email_address']
+    rows = index.select(actor=actor)
+
+    pages, cursor = [], None
+    while True:
+        page_rows, cursor = index.page(rows, cursor, limit)
+        assert len(page_rows) <= limit
+        pages.extend(page_rows.tolist())
+        if cursor is None:
+            break
+
+    assert pages == rows.tolist()
+
+
+def test_cursor_from_another_version_is_rejected(usage_path):
+    before = UsageIndex(UsageStore.from_file(usage_path))
+    _touch(usage_path)
+    after = UsageIndex(UsageStore.from_file(usage_path))
+
+    assert after.decode_cursor(after.encode_cursor(3)) == 3
+    for cursor in [before.encode_cursor(3), 'not-a-cursor']:
+        with pytest.raises(ValueError):
+            after.decode_cursor(cursor)
+
+
+@pytest.fixture
+def api(usage_path, monkeypatch):
+    monkeypatch.setattr(backend, 'DATA_DIR', os.path.dirname(usage_path))
+    monkeypatch.setattr(backend, 'response_cache', backend.ResponseCache(max_bytes=0))
+    return backend.app.test_client()
+
+
+def test_changed_file_is_refused_before_response(api, usage_path, monkeypatch):
+    stale = UsageIndex(UsageStore.from_file(usage_path))
+    _touch(usage_path)
+    monkeypatch.setattr(backend, 'load_usage_index', lambda path: stale)
+
+    response = api.get('/api/usage-data?company=pharmaco&limit=10')
+
+    assert response.status_code == 409
+    assert 'please retry' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('cache_bytes', [0, 1 << 30])
+def test_usage_data_pages(api, cache_bytes, monkeypatch):
+    monkeypatch.setattr(backend, 'USAGE_DATA_CACHE_BYTES', cache_bytes)
+    with open(os.path.join(DATA_DIR, USAGE_FILE), encoding='utf-8') as f:
+        expected = _in_date_order(json.load(f)['data'])
+
+    served, cursor = [], None
+    while True:
+        response = api.get('/api/usage-data?company=pharmaco&limit=700' + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        page = json.loads(response.get_data())
+        served += page['data']
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert page['total_matching'] == len(expected)
+    assert served == expected
+
+
+def test_streamed_body_is_cut_off_when_file_changes(api, usage_path, monkeypatch):
+    monkeypatch.setattr(backend, 'USAGE_DATA_CACHE_BYTES', 0)
+    monkeypatch.setattr('usage_index.VERSION_CHECK_INTERVAL', 10)
+
+    response = api.get('/api/usage-data?company=pharmaco', headers={'Accept-Encoding': 'identity'},
+                       buffered=False)
+    assert response.status_code == 200
+    chunks = iter(response.response)
+    next(chunks)
+    _touch(usage_path)
+
+    with pytest.raises(UsageFileChangedError):
+        b''.join(chunks)
+    response.close()
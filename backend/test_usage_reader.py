@@ -0,0 +1,114 @@
+"""
+Regression tests for UsageFileReader
+
+Reading a usage file incrementally must give exactly what json.load gives -
+records, metadata and each record's byte span - whatever the chunk size,
+and NDJSON conversion must round-trip.
+Run with: python -m pytest backend/test_usage_reader.py
+"""
+
+import json
+import os
+
+import pytest
+
+from usage_reader import UsageFileReader, convert_to_ndjson, read_record_at
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+USAGE_FILES = ['fintechco_api_usage_data.json', 'pharmaco_api_usage_data.json']
+
+# Non-ASCII text, \r\n line endings, numbers of every shape and extras on both sides of the records
+AWKWARD_FILE = (
+    '{"has_more": false,\r\n "data": [\r\n'
+    '  {"actor": {"email_address": "zoë@example.com"}, "n": 12345678901234567890, "x": -1.5e-7},\r\n'
+    '  {"actor": {"email_address": "名前@example.com"}, "n": 0, "x": 1E+3, "tags": ["√", "\\u00e9", "\\"q\\""]},\r\n'
+    '  {"actor": null, "n": -42, "x": 3.25, "nested": {"a": [[], {}], "b": true}}\r\n'
+    '], "next_page": null,\r\n "metadata": {"company": "Ünïcode Co", "records": 3}}\r\n'
+)
+
+
+def _read_spans(path, **options):
+    reader = UsageFileReader(path, **options)
+    spans = list(reader.iter_spans())
+    return reader, spans
+
+
+def _check_spans(path, spans):
+    with open(path, 'rb') as f:
+        for record, offset, length in spans:
+            assert read_record_at(f, offset, length) == record
+
+
+@pytest.mark.parametrize('usage_file', USAGE_FILES)
+def test_records_match_json_load(usage_file):
+    path = os.path.join(DATA_DIR, usage_file)
+    with open(path, encoding='utf-8') as f:
+        expected = json.load(f)
+
+    reader, spans = _read_spans(path)
+
+    assert [record for record, _, _ in spans] == expected['data']
+    assert reader.extras == {key: value for key, value in expected.items() if key != 'data'}
+    assert reader.records_read == len(expected['data'])
+    _check_spans(path, spans)
+
+
+@pytest.mark.parametrize('chunk_chars', [1, 2, 3, 5, 8, 13, 64, 1 << 16])
+def test_any_chunk_size_reads_the_same(tmp_path, chunk_chars):
+    path = str(tmp_path / 'usage.json')
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(AWKWARD_FILE)
+    expected = json.loads(AWKWARD_FILE)
+
+    reader, spans = _read_spans(path, chunk_chars=chunk_chars)
+
+    assert [record for record, _, _ in spans] == expected['data']
+    assert reader.metadata == expected['metadata']
+    assert reader.extras == {key: value for key, value in expected.items() if key != 'data'}
+    _check_spans(path, spans)
+
+
+@pytest.mark.parametrize('chunk_chars', [97, 1000])
+def test_small_chunks_read_the_same(chunk_chars):
+    path = os.path.join(DATA_DIR, 'pharmaco_api_usage_data.json')
+    with open(path, encoding='utf-8') as f:
+        expected = json.load(f)['data']
+
+    reader, spans = _read_spans(path, chunk_chars=chunk_chars)
+
+    assert [record for record, _, _ in spans] == expected
+    _check_spans(path, spans)
+
+
+@pytest.mark.parametrize('content,records', [('{}', []), ('{"data": []}', []), (' {"data" : [ ] , "metadata": {}} ', [])])
+def test_empty_files(tmp_path, content, records):
+    path = str(tmp_path / 'usage.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    assert list(UsageFileReader(path)) == records
+
+
+@pytest.mark.parametrize('content', ['[]', '{"data": [{"a": 1} {"a": 2}]}', '{"data": [{"a": 1}'])
+def test_malformed_files_raise(tmp_path, content):
+    path = str(tmp_path / 'usage.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    with pytest.raises(ValueError):
+        list(UsageFileReader(path))
+
+
+@pytest.mark.parametrize('usage_file', USAGE_FILES)
+def test_ndjson_round_trip(tmp_path, usage_file):
+    json_path = os.path.join(DATA_DIR, usage_file)
+    ndjson_path = str(tmp_path / usage_file.replace('.json', '.ndjson'))
+    with open(json_path, encoding='utf-8') as f:
+        expected = json.load(f)
+
+    assert convert_to_ndjson(json_path, ndjson_path) == len(expected['data'])
+    reader, spans = _read_spans(ndjson_path)
+
+    assert [record for record, _, _ in spans] == expected['data']
+    assert reader.metadata == expected['metadata']
+    _check_spans(ndjson_path, spans)
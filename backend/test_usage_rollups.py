@@ -0,0 +1,192 @@
+"""
+Regression tests for UsageRollups
+
+An incremental sync of a grown usage file, and appending its new records,
+must leave exactly the tables a full rebuild writes; the leaderboard must
+rank what summing the raw records per actor gives. The rollups database is
+only created when first used, and the API syncs a usage file into it once
+per file version rather than on every request.
+Run with: python -m pytest backend/test_usage_rollups.py
+"""
+
+import json
+import os
+import shutil
+from collections import defaultdict
+from contextlib import closing
+
+import pytest
+
+import app as backend
+from usage_rollups import UsageRollups
+from usage_store import UsageStore
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def _load(usage_file):
+    with open(os.path.join(DATA_DIR, usage_file), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write(path, content, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({**content, 'data': records}, f)
+    # Successive writes can land within the file system's timestamp resolution
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9 * len(records)))
+
+
+def _tables(rollups, source):
+    """Every rollup row of a source, in key order"""
+    with closing(rollups._connect()) as conn:
+        return {
+            table: sorted(tuple(row)[1:] for row in conn.execute(f'SELECT * FROM {table} WHERE source = ?', (source,)))
+            for table in ('usage_daily', 'usage_daily_models', 'usage_daily_sketches')
+        }
+
+
+def _full_rebuild(tmp_path, path):
+    """Tables of a fresh database synced from the file's current version in one go"""
+    rollups = UsageRollups(str(tmp_path / f'full-{os.stat(path).st_mtime_ns}.sqlite3'))
+    rollups.sync('acme', UsageStore.from_file(path))
+    return _tables(rollups, 'acme')
+
+
+@pytest.mark.parametrize('usage_file', ['fintechco_api_usage_data.json', 'pharmaco_api_usage_data.json'])
+def test_incremental_sync_matches_full_rebuild(tmp_path, usage_file):
+    content = _load(usage_file)
+    records = content['data']
+    path = str(tmp_path / usage_file)
+    rollups = UsageRollups(str(tmp_path / 'incremental.sqlite3'))
+
+    _write(path, content, records[:len(records) // 3])
+    rollups.sync('acme', UsageStore.from_file(path))
+
+    # The file grows by a few records part way through a day, then by whole days
+    for end in [len(records) // 3 + 4, 2 * len(records) // 3, len(records)]:
+        _write(path, content, records[:end])
+        result = rollups.sync('acme', UsageStore.from_file(path))
+
+        assert result['records_aggregated'] < end
+        assert _tables(rollups, 'acme') == _full_rebuild(tmp_path, path)
+        assert rollups.is_current('acme', path)
+
+
+def test_rewritten_file_is_rebuilt(tmp_path):
+    content = _load('pharmaco_api_usage_data.json')
+    path = str(tmp_path / 'usage.json')
+    rollups = UsageRollups(str(tmp_path / 'usage_rollups.sqlite3'))
+    _write(path, content, content['data'])
+    rollups.sync('acme', UsageStore.from_file(path))
+
+    # Fewer records than were ingested: the file was rewritten, not appended to
+    _write(path, content, content['data'][100:])
+    assert rollups.sync('acme', UsageStore.from_file(path))['records_aggregated'] == len(content['data']) - 100
+    assert _tables(rollups, 'acme') == _full_rebuild(tmp_path, path)
+
+
+def test_append_matches_sync(tmp_path):
+    content = _load('pharmaco_api_usage_data.json')
+    records = content['data']
+    path = str(tmp_path / 'usage.json')
+    _write(path, content, records)
+    rollups = UsageRollups(str(tmp_path / 'usage_rollups.sqlite3'))
+
+    # A day's records can arrive in more than one batch
+    for start in range(0, len(records), 97):
+        rollups.append('acme', records[start:start + 97])
+
+    assert _tables(rollups, 'acme') == _full_rebuild(tmp_path, path)
+    assert rollups.source_state('acme')['records'] == len(records)
+
+
+def _leaderboard_by_scan(records, metric, k, since=None, until=None, organization_id=None):
+    totals = defaultdict(lambda: defaultdict(float))
+    for record in records:
+        day = record['date'][:10]
+        if (since and day < since) or (until and day >= until) or \
+                (organization_id and record['organization_id'] != organization_id):
+            continue
+        metrics = record['core_metrics']
+        actor = totals[record['actor']['email_address']]
+        actor['records'] += 1
+        actor['sessions'] += metrics['num_sessions']
+        actor['commits'] += metrics['commits_by_claude_code']
+        actor['pull_requests'] += metrics['pull_requests_by_claude_code']
+        actor['lines_added'] += metrics['lines_of_code']['added']
+        actor['lines_removed'] += metrics['lines_of_code']['removed']
+        actor['cost'] += sum(model['estimated_cost']['amount'] for model in record['model_breakdown'])
+
+    column = UsageRollups.LEADERBOARD_METRICS[metric]
+    ranked = sorted(totals, key=lambda actor: (-totals[actor][column], actor))[:k]
+    return len(totals), [(actor, round(totals[actor][column], 6)) for actor in ranked]
+
+
+@pytest.fixture(scope='module')
+def synced(tmp_path_factory):
+    path = os.path.join(DATA_DIR, 'fintechco_api_usage_data.json')
+    rollups = UsageRollups(str(tmp_path_factory.mktemp('rollups') / 'usage_rollups.sqlite3'))
+    rollups.sync('fintechco', UsageStore.from_file(path))
+    return rollups, _load('fintechco_api_usage_data.json')['data']
+
+
+@pytest.mark.parametrize('metric', list(UsageRollups.LEADERBOARD_METRICS))
+@pytest.mark.parametrize('k', [1, 5, 10000])
+def test_leaderboard_matches_scan(synced, metric, k):
+    rollups, records = synced
+    organization_id = records[0]['organization_id']
+
+    for filters in [{}, {'since': '2025-08-01'}, {'since': '2025-07-10', 'until': '2025-07-20'},
+                    {'organization_id': organization_id}, {'since': '2030-01-01'}]:
+        result = rollups.leaderboard('fintechco', metric, k, **filters)
+
+        actors_ranked, expected = _leaderboard_by_scan(records, metric, k, **filters)
+        assert result['actors_ranked'] == actors_ranked
+        assert [(leader['actor'], round(leader['value'], 6)) for leader in result['leaders']] == expected
+        assert [leader['rank'] for leader in result['leaders']] == list(range(1, len(expected) + 1))
+
+
+def test_database_is_created_on_first_use(tmp_path):
+    rollups = UsageRollups(str(tmp_path / 'usage_rollups.sqlite3'))
+    assert not os.path.exists(tmp_path / 'usage_rollups.sqlite3')
+
+    assert rollups.source_state('fintechco') is None
+    assert os.path.exists(tmp_path / 'usage_rollups.sqlite3')
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(DATA_DIR, 'pharmaco_api_usage_data.json'), tmp_path)
+    rollups = UsageRollups(str(tmp_path / 'usage_rollups.sqlite3'))
+    calls = {'is_current': 0, 'sync': 0}
+    for name in calls:
+        method = getattr(rollups, name)
+
+        def counted(*args, method=method, name=name, **kwargs):
+            calls[name] += 1
+            return method(*args, **kwargs)
+        monkeypatch.setattr(rollups, name, counted)
+
+    monkeypatch.setattr(backend, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(backend, 'usage_rollups', rollups)
+    monkeypatch.setattr(backend, '_synced_usage_versions', {})
+    return backend.app.test_client(), calls, tmp_path / 'pharmaco_api_usage_data.json'
+
+
+def test_requests_sync_once_per_file_version(api):
+    client, calls, usage_path = api
+    endpoints = ['/api/usage-leaderboard?company=pharmaco', '/api/usage-active-users?company=pharmaco',
+                 '/api/usage-rollups?company=pharmaco&group_by=day']
+
+    first = [client.get(endpoint).get_json() for endpoint in endpoints]
+    again = [client.get(endpoint).get_json() for endpoint in endpoints]
+    assert calls == {'is_current': 1, 'sync': 1}
+    assert again == first
+
+    # A changed file is synced on the next request
+    stat = os.stat(usage_path)
+    os.utime(usage_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    client.get(endpoints[0])
+    client.get(endpoints[1])
+    assert calls == {'is_current': 2, 'sync': 2}
@@ -0,0 +1,156 @@
+"""
+Regression tests for UsageStore
+
+The columnar tables must hold exactly the fields of the parsed records
+(checked against a plain-Python flattening of the JSON), whether built
+from records or from the file, and a store is rebuilt only when its file
+changes.
+Run with: python -m pytest backend/test_usage_store.py
+"""
+
+import json
+import os
+import shutil
+import threading
+
+import pandas as pd
+import pytest
+
+from usage_store import UsageStore, load_usage_store, usage_store_stats
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+USAGE_FILES = ['fintechco_api_usage_data.json', 'pharmaco_api_usage_data.json']
+
+
+def _load(usage_file):
+    with open(os.path.join(DATA_DIR, usage_file), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _expected_tables(records):
+    """Record, model breakdown and tool action rows, flattened one record at a time"""
+    record_rows, model_rows, tool_rows = [], [], []
+    for i, record in enumerate(records):
+        metrics = record.get('core_metrics') or {}
+        lines = metrics.get('lines_of_code') or {}
+        record_rows.append((
+            pd.Timestamp(record['date']),
+            (record.get('actor') or {}).get('email_address') or '',
+            record.get('organization_id') or '',
+            record.get('terminal_type') or '',
+            metrics.get('num_sessions', 0), lines.get('added', 0), lines.get('removed', 0),
+            metrics.get('commits_by_claude_code', 0), metrics.get('pull_requests_by_claude_code', 0)
+        ))
+        for breakdown in record.get('model_breakdown') or []:
+            tokens = breakdown.get('tokens') or {}
+            model_rows.append((
+                i, breakdown.get('model') or '', (breakdown.get('estimated_cost') or {}).get('amount', 0.0),
+                tokens.get('cache_creation', 0), tokens.get('cache_read', 0),
+                tokens.get('input', 0), tokens.get('output', 0)
+            ))
+        for tool, decisions in (record.get('tool_actions') or {}).items():
+            tool_rows.append((i, tool, decisions.get('accepted', 0), decisions.get('rejected', 0)))
+    return record_rows, model_rows, tool_rows
+
+
+def _tables(store):
+    def rows(frame):
+        return [tuple(row) for row in frame.astype(object).itertuples(index=False)]
+    return rows(store.records_frame()), rows(store.model_breakdown_frame()), rows(store.tool_actions_frame())
+
+
+@pytest.mark.parametrize('usage_file', USAGE_FILES)
+def test_tables_match_records(usage_file):
+    content = _load(usage_file)
+
+    from_file = UsageStore.from_file(os.path.join(DATA_DIR, usage_file))
+    from_records = UsageStore.from_records(content['data'])
+
+    expected = _expected_tables(content['data'])
+    assert _tables(from_file) == expected
+    assert _tables(from_records) == expected
+    assert from_file.metadata == content['metadata']
+    assert len(from_file.spans['offset']) == len(content['data'])
+    assert from_records.spans == {}
+
+
+def test_interned_strings_are_shared():
+    content = _load('pharmaco_api_usage_data.json')
+
+    store = UsageStore.from_records(content['data'])
+
+    emails = {(record.get('actor') or {}).get('email_address') or '' for record in content['data']}
+    assert sorted(store.actors.values) == sorted(emails)
+    assert store.actors.values[store.records['actor'][7]] == content['data'][7]['actor']['email_address']
+
+
+def test_empty_store():
+    store = UsageStore.from_records([])
+
+    assert len(store) == 0
+    assert _tables(store) == ([], [], [])
+    assert store.memory_footprint()['bytes_per_record'] == 0
+
+
+def test_store_is_rebuilt_only_when_file_changes(tmp_path):
+    shutil.copy(os.path.join(DATA_DIR, 'pharmaco_api_usage_data.json'), tmp_path)
+    path = str(tmp_path / 'pharmaco_api_usage_data.json')
+
+    store = load_usage_store(path)
+    assert load_usage_store(path) is store
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    rebuilt = load_usage_store(path)
+    assert rebuilt is not store
+    assert _tables(rebuilt) == _tables(store)
+
+
+def test_null_fractional_and_huge_metrics_are_coerced():
+    record = {
+        'date': '2025-07-01T00:00:00Z', 'actor': {'email_address': 'a@example.com'},
+        'core_metrics': {'num_sessions': None, 'lines_of_code': {'added': 12.7, 'removed': 'n/a'},
+                         'commits_by_claude_code': 2 ** 40, 'pull_requests_by_claude_code': 2 ** 70},
+        'model_breakdown': [{'model': 'm', 'estimated_cost': {'amount': None},
+                             'tokens': {'input': 3.0, 'output': float('nan'), 'cache_read': 2 ** 33}}],
+        'tool_actions': {'edit': None, 'write': {'accepted': 1.5, 'rejected': None}},
+    }
+
+    store = UsageStore.from_records([record])
+
+    records, models, tools = _tables(store)
+    assert records == [(pd.Timestamp('2025-07-01T00:00:00Z'), 'a@example.com', '', '', 0, 12, 0, 2 ** 40, 2 ** 63 - 1)]
+    assert models == [(0, 'm', 0.0, 0, 2 ** 33, 3, 0)]
+    assert tools == [(0, 'edit', 0, 0), (0, 'write', 1, 0)]
+
+
+def test_cold_load_does_not_block_other_files(tmp_path, monkeypatch):
+    for usage_file in USAGE_FILES:
+        shutil.copy(os.path.join(DATA_DIR, usage_file), tmp_path)
+    slow_path, other_path = (str(tmp_path / usage_file) for usage_file in USAGE_FILES)
+    loading, release = threading.Event(), threading.Event()
+    from_file = UsageStore.from_file
+
+    def blocking_from_file(path):
+        if path == slow_path:
+            loading.set()
+            release.wait(10)
+        return from_file(path)
+
+    monkeypatch.setattr(UsageStore, 'from_file', staticmethod(blocking_from_file))
+    slow = threading.Thread(target=load_usage_store, args=(slow_path,))
+    slow.start()
+    try:
+        assert loading.wait(10)
+        loaded = []
+        other = threading.Thread(target=lambda: loaded.append((load_usage_store(other_path), usage_store_stats())))
+        other.start()
+        other.join(5)
+        assert loaded, 'loading another file waited for the cold load'
+        store, stats = loaded[0]
+        assert store.path == other_path
+        assert os.path.abspath(other_path) in {entry['path'] for entry in stats}
+    finally:
+        release.set()
+        slow.join()
+    assert load_usage_store(slow_path).path == slow_path
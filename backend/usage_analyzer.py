@@ -0,0 +1,261 @@
+"""
+Usage Analyzer for Claude Code API usage data
+Aggregates *_api_usage_data.json records into the compact series and tables
+the usage dashboard renders, so the browser never receives raw records
+"""
+
+import heapq
+
+import pandas as pd
+from typing import Dict, List, Any, Optional, Iterable
+
+from usage_rollups import UsageRollups
+from usage_store import UsageStore
+
+
+class UsageAnalyzer:
+    """Computes usage dashboard metrics from Claude Code API usage records"""
+
+    # Savings assumptions (same as the usage dashboard)
+    HOURS_PER_LOC = 1 / 100         # 1 hour of manual coding per 100 lines
+    TIME_SAVINGS_PERCENT = 0.30     # Claude Code saves ~30% of that time
+    HOURLY_RATE = 50                # $100k annual salary
+
+    # Team sizes used when the data file's metadata doesn't list them
+    DEFAULT_ORGANIZATION_SIZES = {
+        'Software Engineers': 25,
+        'Data Scientists': 15,
+        'Data Analysts': 10
+    }
+
+    # Email domain keywords -> organization, checked in order
+    ORGANIZATION_KEYWORDS = [
+        ('Software Engineers', ('engineering', 'backend', 'frontend', 'platform')),
+        ('Data Scientists', ('datascience', 'ml', 'research')),
+        ('Data Analysts', ('analytics', 'data', 'insights', 'reporting')),
+    ]
+
+    TOP_USERS_LIMIT = 10
+
+    def __init__(self, df: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None,
+                 start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """
+        Initialize analyzer over usage activity rows
+
+        Args:
+            df: One row per record (or per day and actor, as rollups give) with email,
+                date (UTC), day, sessions, lines_of_code, commits and prs columns,
+                in the order records were first seen
+            metadata: The file's metadata block (team sizes are read from 'organizations')
+            start_date: Only include records on or after this date (YYYY-MM-DD)
+            end_date: Only include records before this date (YYYY-MM-DD)
+        """
+        self.metadata = metadata or {}
+        self.start_date = start_date
+        self.end_date = end_date
+        # Rollups and source whose stored sketches answer distinct counts (see from_rollups)
+        self.sketch_rollups: Optional[UsageRollups] = None
+        self.sketch_source: Optional[str] = None
+        self.source_rows = len(df)
+        self.df = self._filter_dates(df)
+
+    @classmethod
+    def from_store(cls, store: UsageStore, start_date: Optional[str] = None,
+                   end_date: Optional[str] = None) -> 'UsageAnalyzer':
+        """Analyze a UsageStore's records"""
+        records = store.records_frame()
+        df = pd.DataFrame({
+            'email': records['actor'],
+            'date': records['date'],
+            'sessions': records['sessions'],
+            'lines_of_code': records['lines_added'],
+            'commits': records['commits'],
+            'prs': records['pull_requests'],
+        })
+        df['day'] = df['date'].dt.floor('D')
+        return cls(df, store.metadata, start_date, end_date)
+
+    @classmethod
+    def from_file(cls, path: str, start_date: Optional[str] = None,
+                  end_date: Optional[str] = None) -> 'UsageAnalyzer':
+        """Analyze a usage file (JSON or NDJSON), streamed into a UsageStore"""
+        return cls.from_store(UsageStore.from_file(path), start_date, end_date)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None,
+                     start_date: Optional[str] = None, end_date: Optional[str] = None) -> 'UsageAnalyzer':
+        """Analyze usage records (any iterable)"""
+        analyzer = cls.from_store(UsageStore.from_records(records), start_date, end_date)
+        analyzer.metadata = metadata or {}
+        return analyzer
+
+    @classmethod
+    def from_rollups(cls, rollups: UsageRollups, source: str, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None, approximate: bool = False) -> 'UsageAnalyzer':
+        """
+        Analyze a source's daily rollups instead of its raw records
+
+        Every usage metric is a sum or distinct count per day or per user, so
+        per (day, actor) totals give the same results as the records.
+
+        Args:
+            approximate: Estimate unique and daily active users by merging the
+                rollups' stored HyperLogLog sketches instead of counting emails
+                (organization penetration stays exact: the sketches are kept per
+                organization id, not per team)
+        """
+        rows = rollups.actor_days_frame(source, start_date, end_date)
+        day = pd.to_datetime(rows['day'], utc=True)
+        df = pd.DataFrame({
+            'email': rows['actor'].astype('category'),
+            'date': day,
+            'sessions': rows['sessions'],
+            'lines_of_code': rows['lines_added'],
+            'commits': rows['commits'],
+            'prs': rows['pull_requests'],
+            'day': day,
+        })
+        state = rollups.source_state(source) or {}
+        analyzer = cls(df, state.get('metadata'), start_date, end_date)
+        if approximate:
+            analyzer.sketch_rollups, analyzer.sketch_source = rollups, source
+        return analyzer
+
+    def _filter_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Keep records in [start_date, end_date)"""
+        mask = pd.Series(True, index=df.index)
+        if self.start_date:
+            mask &= df['date'] >= pd.Timestamp(self.start_date, tz='UTC')
+        if self.end_date:
+            mask &= df['date'] < pd.Timestamp(self.end_date, tz='UTC')
+        return df[mask]
+
+    @classmethod
+    def get_organization(cls, email: Optional[str]) -> str:
+        """Map an email address to its organization by domain keyword ('Other' when there is no domain)"""
+        domain = (email or '').partition('@')[2]
+        for organization, keywords in cls.ORGANIZATION_KEYWORDS:
+            if any(keyword in domain for keyword in keywords):
+                return organization
+        return 'Other'
+
+    def _unique_users(self) -> int:
+        """Distinct emails - exact, or merged from the rollup sketches when approximate"""
+        if self.sketch_rollups is None:
+            return int(self.df['email'].nunique())
+        return self.sketch_rollups.distinct_actors(self.sketch_source, self.start_date, self.end_date, approximate=True)
+
+    def _weekdays(self) -> pd.DataFrame:
+        """Records on weekdays only (the daily charts skip weekends)"""
+        return self.df[self.df['day'].dt.dayofweek < 5]
+
+    @staticmethod
+    def _format_days(daily: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Per-day totals (indexed by day) -> records with a YYYY-MM-DD 'date' first"""
+        daily = daily.reset_index()
+        daily.insert(0, 'date', daily.pop('day').dt.strftime('%Y-%m-%d'))
+        return daily.to_dict('records')
+
+    def get_loc_time_series(self) -> List[Dict[str, Any]]:
+        """Lines of code added per weekday"""
+        daily = self._weekdays().groupby('day')['lines_of_code'].sum().to_frame()
+        return self._format_days(daily)
+
+    def get_pr_commit_time_series(self) -> List[Dict[str, Any]]:
+        """Pull requests and commits per weekday"""
+        daily = self._weekdays().groupby('day')[['prs', 'commits']].sum()
+        daily.columns = ['pull_requests', 'commits']
+        return self._format_days(daily)
+
+    def get_active_users_time_series(self) -> List[Dict[str, Any]]:
+        """Distinct users per weekday"""
+        if self.sketch_rollups is not None:
+            counts = pd.DataFrame(self.sketch_rollups.active_users(
+                self.sketch_source, 'day', self.start_date, self.end_date, approximate=True
+            ), columns=['period', 'active_users'])
+            days = pd.to_datetime(counts['period'], utc=True)
+            daily = counts.set_index(days.rename('day'))[['active_users']]
+            return self._format_days(daily[daily.index.dayofweek < 5])
+
+        daily = self._weekdays().groupby('day')['email'].nunique()
+        daily = daily.rename('active_users').to_frame()
+        return self._format_days(daily)
+
+    def get_org_penetration(self) -> List[Dict[str, Any]]:
+        """Distinct active users per organization against team size"""
+        team_sizes = self.metadata.get('organizations') or self.DEFAULT_ORGANIZATION_SIZES
+        active: Dict[str, int] = {}
+        for email in self.df['email'].drop_duplicates().astype(str):
+            organization = self.get_organization(email)
+            active[organization] = active.get(organization, 0) + 1
+
+        return [
+            {
+                'organization': organization,
+                'active_users': count,
+                'total_users': team_sizes.get(organization, 0),
+                'penetration': round(count / (team_sizes.get(organization) or 1) * 100, 1)
+            }
+            for organization, count in active.items()
+        ]
+
+    def get_top_users(self, limit: int = TOP_USERS_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Users with the most sessions
+
+        Per-user totals are ranked with a bounded heap, O(n log k) rather than
+        sorting every user.
+
+        Args:
+            limit: Number of users returned
+
+        Returns:
+            List of per-user totals, most sessions first (ties keep first-seen order)
+        """
+        totals = self.df.groupby('email', observed=True, sort=False)[['sessions', 'lines_of_code', 'commits', 'prs']].sum()
+        sessions = totals['sessions'].to_numpy()
+        # nlargest is stable, so equal session counts stay in first-seen order
+        leaders = heapq.nlargest(limit, range(len(totals)), key=sessions.__getitem__)
+        top = totals.iloc[leaders].reset_index()
+        top['email'] = top['email'].astype(str)
+        top['organization'] = [self.get_organization(email) for email in top['email']]
+        return top.to_dict('records')
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Totals over the whole period and the estimated savings"""
+        total_loc = int(self.df['lines_of_code'].sum())
+        hours_saved = total_loc * self.HOURS_PER_LOC * self.TIME_SAVINGS_PERCENT
+
+        return {
+            'unique_users': self._unique_users(),
+            'total_sessions': int(self.df['sessions'].sum()),
+            'total_commits': int(self.df['commits'].sum()),
+            'total_prs': int(self.df['prs'].sum()),
+            'total_loc': total_loc,
+            'hours_saved': hours_saved,
+            'cost_savings': hours_saved * self.HOURLY_RATE,
+            'assumptions': {
+                'hours_per_loc': self.HOURS_PER_LOC,
+                'time_savings_percent': self.TIME_SAVINGS_PERCENT,
+                'hourly_rate': self.HOURLY_RATE
+            }
+        }
+
+    def analyze(self) -> Dict[str, Any]:
+        """
+        Compute every usage dashboard section
+
+        Returns:
+            Dict with summary, loc_time_series, pr_commit_time_series,
+            active_users_time_series, org_penetration and top_users
+        """
+        print(f"📊 Analyzing {len(self.df)} of {self.source_rows} usage rows")
+
+        return {
+            'summary': self.get_summary(),
+            'loc_time_series': self.get_loc_time_series(),
+            'pr_commit_time_series': self.get_pr_commit_time_series(),
+            'active_users_time_series': self.get_active_users_time_series(),
+            'org_penetration': self.get_org_penetration(),
+            'top_users': self.get_top_users()
+        }
@@ -0,0 +1,260 @@
+"""
+Date/actor/organization index over a Claude Code usage file
+Built from the file's UsageStore; queries then read only the matching
+records from disk by their byte spans
+"""
+
+import base64
+import os
+import threading
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from usage_reader import read_record_at
+from usage_store import UsageStore, load_usage_store, usage_file_version
+
+# How many records to read between checks that the file is still the indexed version
+VERSION_CHECK_INTERVAL = 1000
+
+
+class UsageFileChangedError(Exception):
+    """The usage file changed after it was indexed, so its byte spans no longer apply"""
+
+
+class UsageIndex:
+    """
+    Record spans sorted by date, with per-actor and per-organization row lists
+
+    Rows are numbered in date order (file order within a date). A date range
+    maps to a contiguous row range by binary search, and the actor and
+    organization maps hold each key's rows in ascending order, so a filtered
+    query is a couple of searchsorted calls plus an intersection - records
+    outside the answer are never read or parsed.
+    """
+
+    def __init__(self, store: UsageStore):
+        """
+        Build the index from a store's columns (no extra pass over the file)
+
+        Args:
+            store: Store built from a usage file (UsageStore.from_file), which
+                holds each record's byte span
+        """
+        if not store.spans:
+            raise ValueError("UsageIndex needs a store built from a file (UsageStore.from_file)")
+
+        self.store = store
+        self.path = store.path
+        self.version = store.version
+
+        # Sort rows by date; a stable sort keeps file order within each date
+        order = np.argsort(store.records['date'], kind='stable')
+
+        self.dates = store.records['date'][order].view(np.int64)
+        self.offsets = store.spans['offset'][order]
+        self.lengths = store.spans['length'][order]
+        self.actor_rows = self._rows_by_key(store.records['actor'][order], store.actors.codes)
+        self.org_rows = self._rows_by_key(store.records['organization'][order], store.organizations.codes)
+
+    @staticmethod
+    def _rows_by_key(codes: np.ndarray, keys: Dict[str, int]) -> Dict[str, np.ndarray]:
+        """Map each key to its rows (ascending), grouping all keys with one sort"""
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(keys) + 1))
+        return {key: order[bounds[code]:bounds[code + 1]] for key, code in keys.items()}
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """The file's metadata block"""
+        return self.store.metadata
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def date_range(self, since: Optional[str] = None, until: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Row range [lo, hi) of records dated in [since, until)
+
+        Args:
+            since: First date included (YYYY-MM-DD)
+            until: First date excluded (YYYY-MM-DD)
+        """
+        lo = int(np.searchsorted(self.dates, pd.Timestamp(since, tz='UTC').value, side='left')) if since else 0
+        hi = int(np.searchsorted(self.dates, pd.Timestamp(until, tz='UTC').value, side='left')) if until else len(self.dates)
+        return lo, max(lo, hi)
+
+    def select(self, since: Optional[str] = None, until: Optional[str] = None,
+               actor: Optional[str] = None, organization_id: Optional[str] = None) -> np.ndarray:
+        """
+        Rows matching every given filter, in date order
+
+        Args:
+            since: First date included (YYYY-MM-DD)
+            until: First date excluded (YYYY-MM-DD)
+            actor: Actor email address
+            organization_id: Organization id
+        """
+        lo, hi = self.date_range(since, until)
+
+        candidates = []
+        for rows_by_key, key in ((self.actor_rows, actor), (self.org_rows, organization_id)):
+            if key is None:
+                continue
+            rows = rows_by_key.get(key)
+            if rows is None:
+                return np.empty(0, dtype=np.int64)
+            # The key's rows are sorted, so the date range is a slice of them too
+            candidates.append(rows[np.searchsorted(rows, lo):np.searchsorted(rows, hi)])
+
+        if not candidates:
+            return np.arange(lo, hi)
+        if len(candidates) == 1:
+            return candidates[0]
+        return np.intersect1d(candidates[0], candidates[1], assume_unique=True)
+
+    def open_file(self) -> BinaryIO:
+        """
+        Open the usage file for reading records by their spans
+
+        Raises:
+            UsageFileChangedError: If the file is no longer the indexed version
+        """
+        f = open(self.path, 'rb')
+        try:
+            self.check_version(f)
+        except UsageFileChangedError:
+            f.close()
+            raise
+        return f
+
+    def check_version(self, f: BinaryIO):
+        """
+        Check that an open usage file is still the version this index was built from
+
+        Raises:
+            UsageFileChangedError: If the file changed
+        """
+        if usage_file_version(f.fileno()) != self.version:
+            raise UsageFileChangedError(f"Usage data changed while it was being read: {self.path}")
+
+    def iter_raw(self, rows: np.ndarray, f: BinaryIO) -> Iterator[bytes]:
+        """
+        Yield the JSON text of each row's record, read straight from the file
+
+        The spans are looked up before this returns; reading stops with
+        UsageFileChangedError as soon as the file is found to have changed,
+        rather than returning bytes from a different version of it.
+
+        Args:
+            rows: Rows to read (from select or page)
+            f: File from open_file
+        """
+        offsets, lengths = self.offsets[rows], self.lengths[rows]
+        return self._read_spans(f, offsets, lengths)
+
+    def _read_spans(self, f: BinaryIO, offsets: np.ndarray, lengths: np.ndarray) -> Iterator[bytes]:
+        for i, (offset, length) in enumerate(zip(offsets, lengths)):
+            if i % VERSION_CHECK_INTERVAL == 0:
+                self.check_version(f)
+            f.seek(offset)
+            raw = f.read(length)
+            if len(raw) != length:
+                raise UsageFileChangedError(f"Usage data changed while it was being read: {self.path}")
+            yield raw
+        self.check_version(f)
+
+    def iter_records(self, rows: np.ndarray) -> Iterator[Dict[str, Any]]:
+        """Yield each row's record, parsed"""
+        with self.open_file() as f:
+            for row in rows:
+                yield read_record_at(f, self.offsets[row], self.lengths[row])
+
+    def page(self, rows: np.ndarray, cursor: Optional[str] = None,
+             limit: Optional[int] = None) -> Tuple[np.ndarray, Optional[str]]:
+        """
+        One page of selected rows
+
+        Args:
+            rows: Selected rows (from select)
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Page size (None returns everything after the cursor)
+
+        Returns:
+            Tuple of (rows on this page, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed or was issued for another version of the file
+        """
+        start = 0
+        if cursor:
+            after = self.decode_cursor(cursor)
+            start = int(np.searchsorted(rows, after, side='right'))
+
+        end = len(rows) if limit is None else min(len(rows), start + limit)
+        page_rows = rows[start:end]
+        next_cursor = self.encode_cursor(int(page_rows[-1])) if end < len(rows) and len(page_rows) else None
+        return page_rows, next_cursor
+
+    def encode_cursor(self, row: int) -> str:
+        """Opaque cursor resuming after row, tied to this version of the file"""
+        token = f'{self.version}:{row}'.encode('ascii')
+        return base64.urlsafe_b64encode(token).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> int:
+        """Row a cursor resumes after"""
+        try:
+            token = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+            version, row = token.rsplit(':', 1)
+            row = int(row)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+        if version != self.version:
+            raise ValueError("Cursor expired: the usage data changed since it was issued")
+        return row
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the index arrays"""
+        arrays = [self.dates, self.offsets, self.lengths]
+        arrays += list(self.actor_rows.values()) + list(self.org_rows.values())
+        return sum(array.nbytes for array in arrays)
+
+
+# Indexes of usage files, rebuilt along with their store when a file changes
+_usage_indexes: Dict[str, UsageIndex] = {}
+_usage_indexes_lock = threading.Lock()
+
+
+def load_usage_index(path: str) -> UsageIndex:
+    """
+    Index of a usage file, built once per file version
+
+    Args:
+        path: Usage file (JSON or NDJSON)
+    """
+    store = load_usage_store(path)
+    key = os.path.abspath(path)
+    with _usage_indexes_lock:
+        index = _usage_indexes.get(key)
+        if index is not None and index.store is store:
+            return index
+
+    index = UsageIndex(store)
+
+    with _usage_indexes_lock:
+        current = _usage_indexes.get(key)
+        if current is not None and current.store is store:
+            return current
+        _usage_indexes[key] = index
+    return index
+
+
+def usage_index_stats() -> List[Dict[str, Any]]:
+    """Loaded indexes and their sizes"""
+    with _usage_indexes_lock:
+        return [
+            {'path': path, 'records': len(index), 'memory_bytes': index.memory_bytes()}
+            for path, index in _usage_indexes.items()
+        ]
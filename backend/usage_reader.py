@@ -0,0 +1,235 @@
+"""
+Incremental reader for Claude Code API usage files
+Yields records from a usage file's "data" array one at a time, so a usage log
+of any size can be aggregated with flat memory. Also reads and writes NDJSON
+(one record per line), which needs no tokenizing beyond each line.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# Files with these extensions are read as one JSON record per line
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+# NDJSON files keep their metadata block in a sidecar file next to them
+METADATA_SUFFIX = '.metadata.json'
+
+READ_CHUNK_CHARS = 1 << 16
+
+
+def is_ndjson(path: str) -> bool:
+    """Check whether path is read as NDJSON"""
+    return path.lower().endswith(NDJSON_EXTENSIONS)
+
+
+class _TextBuffer:
+    """Sliding window over a text file for decoding one JSON value at a time"""
+
+    def __init__(self, f, chunk_chars: int):
+        self.f = f
+        self.chunk_chars = chunk_chars
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        # UTF-8 byte offset of a position in text, advanced incrementally by byte_offset()
+        self._mark_pos = 0
+        self._mark_bytes = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping text that was already consumed"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_chars)
+        if not chunk:
+            self.eof = True
+            return False
+        self._mark_bytes = self.byte_offset(self.pos)
+        self._mark_pos = 0
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def byte_offset(self, pos: int) -> int:
+        """File byte offset of a position in text (positions must not go backwards)"""
+        if pos != self._mark_pos:
+            self._mark_bytes += len(self.text[self._mark_pos:pos].encode('utf-8'))
+            self._mark_pos = pos
+        return self._mark_bytes
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.text) or not self._fill():
+                return self.text[self.pos:self.pos + 1]
+
+    def expect(self, chars: str) -> str:
+        """Consume the next non-whitespace character, which must be one of chars"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in usage file, found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def decode(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number (or literal) ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.text) and self._fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def decode_span(self) -> Tuple[Any, int, int]:
+        """Decode the next complete JSON value, with its byte offset and byte length in the file"""
+        self.peek()
+        start = self.byte_offset(self.pos)
+        value = self.decode()
+        return value, start, self.byte_offset(self.pos) - start
+
+
+class UsageFileReader:
+    """
+    Iterates over the records of a usage file without loading it whole
+
+    Works with the *_api_usage_data.json layout ({"data": [...], "metadata": {...}})
+    and with NDJSON. Top-level fields other than "data" (metadata, has_more, ...)
+    are collected in `extras` as they are read; in the JSON layout metadata
+    follows the records, so it is complete once iteration has finished.
+    """
+
+    def __init__(self, path: str, chunk_chars: int = READ_CHUNK_CHARS):
+        """
+        Args:
+            path: Usage file (.json, or .ndjson/.jsonl for NDJSON)
+            chunk_chars: Characters read from disk at a time
+        """
+        self.path = path
+        self.chunk_chars = chunk_chars
+        self.extras: Dict[str, Any] = {}
+        self.records_read = 0
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """The file's metadata block (empty until it has been read)"""
+        return self.extras.get('metadata') or {}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for record, _, _ in self.iter_spans():
+            yield record
+
+    def iter_spans(self) -> Iterator[Tuple[Dict[str, Any], int, int]]:
+        """
+        Yield (record, byte offset, byte length) for each record
+
+        The span covers exactly the record's JSON text, so read_record_at() can
+        load it again later without re-reading the rest of the file.
+        """
+        self.records_read = 0
+        spans = self._iter_ndjson() if is_ndjson(self.path) else self._iter_json()
+        for span in spans:
+            self.records_read += 1
+            yield span
+
+    def _iter_ndjson(self) -> Iterator[Tuple[Dict[str, Any], int, int]]:
+        metadata_path = self.path + METADATA_SUFFIX
+        if os.path.exists(metadata_path):
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                self.extras = json.load(f)
+
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line), offset, len(line)
+                offset += len(line)
+
+    def _iter_json(self) -> Iterator[Tuple[Dict[str, Any], int, int]]:
+        # newline='' keeps \r\n as two characters so byte offsets stay exact
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            buffer = _TextBuffer(f, self.chunk_chars)
+            buffer.expect('{')
+            if buffer.peek() == '}':
+                return
+
+            while True:
+                key = buffer.decode()
+                buffer.expect(':')
+
+                if key == 'data' and buffer.peek() == '[':
+                    buffer.expect('[')
+                    if buffer.peek() == ']':
+                        buffer.expect(']')
+                    else:
+                        while True:
+                            yield buffer.decode_span()
+                            if buffer.expect(',]') == ']':
+                                break
+                else:
+                    self.extras[key] = buffer.decode()
+
+                if buffer.expect(',}') == '}':
+                    return
+
+
+def read_record_at(f, offset: int, length: int) -> Dict[str, Any]:
+    """Load one record from a usage file opened in binary mode, given its span"""
+    f.seek(offset)
+    return json.loads(f.read(length))
+
+
+def iter_usage_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a usage file (JSON or NDJSON) one at a time"""
+    return iter(UsageFileReader(path))
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], path: str, metadata: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Write usage records as NDJSON
+
+    Args:
+        records: Usage records (any iterable, e.g. a UsageFileReader)
+        path: Output NDJSON path
+        metadata: Metadata block, saved to the sidecar file next to path
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')))
+            f.write('\n')
+            count += 1
+
+    if metadata:
+        with open(path + METADATA_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump({'metadata': metadata}, f)
+
+    print(f"✅ Wrote {count} usage records to {path}")
+    return count
+
+
+def convert_to_ndjson(json_path: str, ndjson_path: str) -> int:
+    """Convert a *_api_usage_data.json file to NDJSON (streaming, flat memory)"""
+    reader = UsageFileReader(json_path)
+    count = write_ndjson(reader, ndjson_path)
+
+    # Metadata follows the records in the JSON layout, so it is written last
+    if reader.extras:
+        with open(ndjson_path + METADATA_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump(reader.extras, f)
+
+    return count
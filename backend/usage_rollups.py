@@ -0,0 +1,562 @@
+"""
+Materialized daily rollups of Claude Code usage
+Persists per (day, organization, actor) and per (day, organization, actor, model)
+totals in SQLite, plus a HyperLogLog sketch of each (day, organization)'s actors
+for mergeable distinct-user counts. Syncing a usage file only re-aggregates the days that changed
+since the last sync, and queries read the rollups instead of the raw records.
+"""
+
+import heapq
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from hyperloglog import DEFAULT_ERROR_RATE, HyperLogLog, precision_for_error
+from usage_store import UsageStore, usage_file_version
+
+ACTIVITY_METRICS = ['records', 'sessions', 'commits', 'pull_requests', 'lines_added', 'lines_removed']
+MODEL_METRICS = ['cost', 'cache_creation_tokens', 'cache_read_tokens', 'input_tokens', 'output_tokens']
+ROLLUP_KEYS = ['day', 'organization_id', 'actor']
+
+# SQLite expression of the period a day falls in (weeks start on Monday)
+PERIOD_EXPRESSIONS = {
+    'day': 'day',
+    'week': "date(day, 'weekday 0', '-6 days')",
+    'month': "strftime('%Y-%m-01', day)",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_rollup_sources (
+    source TEXT PRIMARY KEY,
+    path TEXT,
+    version TEXT,
+    records INTEGER NOT NULL DEFAULT 0,
+    watermark TEXT,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS usage_daily (
+    source TEXT NOT NULL,
+    day TEXT NOT NULL,
+    organization_id TEXT NOT NULL,
+    actor TEXT NOT NULL,
+    records INTEGER NOT NULL,
+    sessions INTEGER NOT NULL,
+    commits INTEGER NOT NULL,
+    pull_requests INTEGER NOT NULL,
+    lines_added INTEGER NOT NULL,
+    lines_removed INTEGER NOT NULL,
+    first_seen INTEGER NOT NULL,
+    PRIMARY KEY (source, day, organization_id, actor)
+);
+CREATE TABLE IF NOT EXISTS usage_daily_models (
+    source TEXT NOT NULL,
+    day TEXT NOT NULL,
+    organization_id TEXT NOT NULL,
+    actor TEXT NOT NULL,
+    model TEXT NOT NULL,
+    cost REAL NOT NULL,
+    cache_creation_tokens INTEGER NOT NULL,
+    cache_read_tokens INTEGER NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    PRIMARY KEY (source, day, organization_id, actor, model)
+);
+CREATE TABLE IF NOT EXISTS usage_daily_sketches (
+    source TEXT NOT NULL,
+    day TEXT NOT NULL,
+    organization_id TEXT NOT NULL,
+    actors BLOB NOT NULL,
+    PRIMARY KEY (source, day, organization_id)
+);
+"""
+
+
+class UsageRollups:
+    """
+    Daily usage totals persisted in SQLite
+
+    Rows are keyed by source (e.g. company), so several usage files share one
+    database. Appends are upserts that add to existing rows, so only the
+    (day, organization, actor[, model]) rows touched by new records change.
+    A source is kept current either from its usage file (sync) or from a feed
+    of new records (append), not both.
+    """
+
+    # Columns queries may group by
+    GROUP_COLUMNS = ('day', 'organization_id', 'actor', 'model')
+
+    # Leaderboard metric -> rollup column it ranks by
+    LEADERBOARD_METRICS = {
+        'loc': 'lines_added',
+        'commits': 'commits',
+        'prs': 'pull_requests',
+        'sessions': 'sessions',
+        'cost': 'cost',
+    }
+
+    def __init__(self, db_path: str, sketch_error_rate: float = DEFAULT_ERROR_RATE):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+            sketch_error_rate: Relative standard error of the actor sketches
+                behind approximate distinct counts
+        """
+        self.db_path = db_path
+        self.sketch_precision = precision_for_error(sketch_error_rate)
+        # The database file and schema are created on first use, not here
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per call keeps this safe to use from Flask's worker threads
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def source_state(self, source: str) -> Optional[Dict[str, Any]]:
+        """Sync state of a source (version, records ingested, watermark day, metadata), or None"""
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT * FROM usage_rollup_sources WHERE source = ?', (source,)).fetchone()
+
+        if row is None:
+            return None
+        state = dict(row)
+        state['metadata'] = json.loads(state['metadata']) if state['metadata'] else {}
+        return state
+
+    def is_current(self, source: str, path: str) -> bool:
+        """Check whether a source's rollups already reflect this version of its usage file"""
+        state = self.source_state(source)
+        if state is None or state['path'] != path or state['version'] != usage_file_version(path):
+            return False
+        with closing(self._connect()) as conn:
+            return self._sketches_match(conn, source)
+
+    def sync(self, source: str, store: UsageStore) -> Dict[str, Any]:
+        """
+        Bring a source's rollups up to date with a usage file's store
+
+        Usage files grow at the end, so only records dated on or after the last
+        synced day (the watermark) are re-aggregated: that day's rows are
+        replaced, later days are added. If the source was synced from another
+        file, the file has fewer records than were ingested (it was rewritten),
+        or the actor sketches were built at another precision, the source is
+        rebuilt from scratch.
+
+        Args:
+            source: Source name (e.g. company)
+            store: Store of the source's usage file (UsageStore.from_file)
+
+        Returns:
+            Dict with the number of records aggregated and the new watermark
+        """
+        state = self.source_state(source)
+        if state is not None and state['path'] == store.path and state['version'] == store.version:
+            with closing(self._connect()) as conn:
+                current = self._sketches_match(conn, source)
+            if current:
+                return {'records_aggregated': 0, 'watermark': state['watermark']}
+
+        dates = store.records['date']
+        with closing(self._connect()) as conn, conn:
+            if state is None or state['path'] != store.path or len(store) < state['records'] or \
+                    not state['watermark'] or not self._sketches_match(conn, source):
+                watermark = None
+                for table in ('usage_daily', 'usage_daily_models', 'usage_daily_sketches'):
+                    conn.execute(f'DELETE FROM {table} WHERE source = ?', (source,))
+            else:
+                watermark = state['watermark']
+                for table in ('usage_daily', 'usage_daily_models', 'usage_daily_sketches'):
+                    conn.execute(f'DELETE FROM {table} WHERE source = ? AND day >= ?', (source, watermark))
+
+            rows = np.arange(len(store)) if watermark is None else \
+                np.flatnonzero(dates >= np.datetime64(watermark, 'ns'))
+            self._upsert(conn, source, store, rows, first_seen_offset=0)
+
+            new_watermark = pd.Timestamp(dates.max()).strftime('%Y-%m-%d') if len(store) else None
+            self._save_state(conn, source, store.path, store.version, len(store), new_watermark, store.metadata)
+
+        print(f"✅ Rolled up {len(rows)} usage records for {source} (watermark {new_watermark})")
+        return {'records_aggregated': int(len(rows)), 'watermark': new_watermark}
+
+    def append(self, source: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Add new usage records (e.g. a new day's) to a source's rollups
+
+        Args:
+            source: Source name (e.g. company)
+            records: Usage records not yet included in the rollups
+
+        Returns:
+            Dict with the number of records aggregated and the new watermark
+        """
+        store = UsageStore.from_records(records)
+        state = self.source_state(source) or {'records': 0, 'watermark': None, 'metadata': {}}
+
+        with closing(self._connect()) as conn, conn:
+            self._upsert(conn, source, store, np.arange(len(store)), first_seen_offset=state['records'])
+
+            watermark = state['watermark']
+            if len(store):
+                latest = pd.Timestamp(store.records['date'].max()).strftime('%Y-%m-%d')
+                watermark = max(watermark, latest) if watermark else latest
+            self._save_state(conn, source, None, None, state['records'] + len(store), watermark, state['metadata'])
+
+        return {'records_aggregated': len(store), 'watermark': watermark}
+
+    def _sketches_match(self, conn: sqlite3.Connection, source: str) -> bool:
+        """Check that a source's sketches exist and have the configured precision (they can only merge if so)"""
+        row = conn.execute('SELECT actors FROM usage_daily_sketches WHERE source = ? LIMIT 1', (source,)).fetchone()
+        if row is None:
+            # No sketches is only right if there are no rollups either (e.g. synced before sketches existed)
+            return conn.execute('SELECT 1 FROM usage_daily WHERE source = ? LIMIT 1', (source,)).fetchone() is None
+        return row['actors'][0] == self.sketch_precision
+
+    @staticmethod
+    def _save_state(conn: sqlite3.Connection, source: str, path: Optional[str], version: Optional[str],
+                    records: int, watermark: Optional[str], metadata: Dict[str, Any]):
+        conn.execute(
+            """
+            INSERT INTO usage_rollup_sources (source, path, version, records, watermark, metadata)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (source) DO UPDATE SET
+                path = excluded.path, version = excluded.version, records = excluded.records,
+                watermark = excluded.watermark, metadata = excluded.metadata
+            """,
+            (source, path, version, records, watermark, json.dumps(metadata))
+        )
+
+    def _upsert(self, conn: sqlite3.Connection, source: str, store: UsageStore, rows: np.ndarray,
+                first_seen_offset: int):
+        """Aggregate the given store rows and add them onto the rollup tables"""
+        if not len(rows):
+            return
+
+        records = store.records_frame().iloc[rows]
+        keys = pd.DataFrame({
+            'day': records['date'].dt.strftime('%Y-%m-%d').to_numpy(),
+            'organization_id': records['organization_id'].astype(str).to_numpy(),
+            'actor': records['actor'].astype(str).to_numpy(),
+        })
+
+        activity = keys.assign(
+            records=1,
+            sessions=records['sessions'].to_numpy(),
+            commits=records['commits'].to_numpy(),
+            pull_requests=records['pull_requests'].to_numpy(),
+            lines_added=records['lines_added'].to_numpy(),
+            lines_removed=records['lines_removed'].to_numpy(),
+            first_seen=rows + first_seen_offset,
+        ).groupby(ROLLUP_KEYS, sort=False).agg({
+            **{metric: 'sum' for metric in ACTIVITY_METRICS}, 'first_seen': 'min'
+        }).reset_index()
+
+        conn.executemany(
+            f"""
+            INSERT INTO usage_daily (source, {', '.join(ROLLUP_KEYS + ACTIVITY_METRICS)}, first_seen)
+            VALUES (?, {', '.join('?' * (len(ROLLUP_KEYS) + len(ACTIVITY_METRICS)))}, ?)
+            ON CONFLICT (source, {', '.join(ROLLUP_KEYS)}) DO UPDATE SET
+                {', '.join(f'{m} = {m} + excluded.{m}' for m in ACTIVITY_METRICS)},
+                first_seen = MIN(first_seen, excluded.first_seen)
+            """,
+            ((source, *row) for row in activity[ROLLUP_KEYS + ACTIVITY_METRICS + ['first_seen']].itertuples(index=False))
+        )
+        self._upsert_sketches(conn, source, activity)
+
+        # Model breakdown rows whose record is among the rows being added
+        models = store.model_breakdown_frame()
+        position = np.full(len(store), -1)
+        position[rows] = np.arange(len(rows))
+        models = models[position[models['record'].to_numpy()] >= 0] if len(models) else models
+        if not len(models):
+            return
+
+        record_rows = position[models['record'].to_numpy()]
+        model_totals = keys.iloc[record_rows].reset_index(drop=True).assign(
+            model=models['model'].astype(str).to_numpy(),
+            **{metric: models[metric].to_numpy() for metric in MODEL_METRICS}
+        ).groupby(ROLLUP_KEYS + ['model'], sort=False)[MODEL_METRICS].sum().reset_index()
+
+        conn.executemany(
+            f"""
+            INSERT INTO usage_daily_models (source, {', '.join(ROLLUP_KEYS + ['model'] + MODEL_METRICS)})
+            VALUES (?, {', '.join('?' * (len(ROLLUP_KEYS) + 1 + len(MODEL_METRICS)))})
+            ON CONFLICT (source, {', '.join(ROLLUP_KEYS)}, model) DO UPDATE SET
+                {', '.join(f'{m} = {m} + excluded.{m}' for m in MODEL_METRICS)}
+            """,
+            ((source, *row) for row in model_totals.itertuples(index=False))
+        )
+
+    def _upsert_sketches(self, conn: sqlite3.Connection, source: str, activity: pd.DataFrame):
+        """Add the actors of each (day, organization) onto its stored sketch"""
+        rows = []
+        for (day, organization_id), actors in activity.groupby(['day', 'organization_id'], sort=False)['actor']:
+            stored = conn.execute(
+                'SELECT actors FROM usage_daily_sketches WHERE source = ? AND day = ? AND organization_id = ?',
+                (source, day, organization_id)
+            ).fetchone()
+            sketch = HyperLogLog.from_bytes(stored['actors']) if stored else HyperLogLog(precision=self.sketch_precision)
+            sketch.update(actors)
+            rows.append((source, day, organization_id, sketch.to_bytes()))
+
+        conn.executemany(
+            'INSERT OR REPLACE INTO usage_daily_sketches (source, day, organization_id, actors) VALUES (?, ?, ?, ?)',
+            rows
+        )
+
+    def totals(self, source: str, group_by: Optional[List[str]] = None, since: Optional[str] = None,
+               until: Optional[str] = None, organization_id: Optional[str] = None,
+               actor: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Summed rollups, optionally grouped
+
+        Activity metrics (sessions, commits, ...) come from the daily table; model
+        metrics (cost, tokens) from the model table. Grouping by model returns
+        model metrics only.
+
+        Args:
+            source: Source name (e.g. company)
+            group_by: Any of 'day', 'organization_id', 'actor', 'model'
+            since: First day included (YYYY-MM-DD)
+            until: First day excluded (YYYY-MM-DD)
+            organization_id: Only this organization
+            actor: Only this actor
+
+        Raises:
+            ValueError: If group_by has an unknown column
+        """
+        group_by = group_by or []
+        unknown = [column for column in group_by if column not in self.GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Cannot group usage rollups by: {', '.join(unknown)}")
+
+        where, params = ['source = ?'], [source]
+        for clause, value in (('day >= ?', since), ('day < ?', until),
+                              ('organization_id = ?', organization_id), ('actor = ?', actor)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+
+        columns = ', '.join(group_by)
+        select = f'{columns}, ' if columns else ''
+        group = f' GROUP BY {columns} ORDER BY {columns}' if columns else ''
+
+        queries = []
+        if 'model' not in group_by:
+            queries.append(('usage_daily', ACTIVITY_METRICS))
+        queries.append(('usage_daily_models', MODEL_METRICS))
+
+        all_metrics = [metric for _, metrics in queries for metric in metrics]
+        merged: Dict[tuple, Dict[str, Any]] = {}
+        with closing(self._connect()) as conn:
+            for table, metrics in queries:
+                sums = ', '.join(f'COALESCE(SUM({m}), 0) AS {m}' for m in metrics)
+                rows = conn.execute(
+                    f"SELECT {select}{sums} FROM {table} WHERE {' AND '.join(where)}{group}", params
+                ).fetchall()
+
+                # Join activity and model totals on the group key
+                for row in rows:
+                    key = tuple(row[column] for column in group_by)
+                    entry = merged.setdefault(key, {**dict(zip(group_by, key)), **{m: 0 for m in all_metrics}})
+                    entry.update({metric: row[metric] for metric in metrics})
+
+        return [merged[key] for key in sorted(merged)]
+
+    def leaderboard(self, source: str, metric: str = 'loc', k: int = 10, since: Optional[str] = None,
+                    until: Optional[str] = None, organization_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Top k actors by a metric
+
+        Per-actor totals are streamed from SQLite into a bounded heap, so ranking
+        n actors takes O(n log k) time and O(k) memory instead of sorting them all.
+        Ties keep actor order.
+
+        Args:
+            source: Source name (e.g. company)
+            metric: One of LEADERBOARD_METRICS ('loc', 'commits', 'prs', 'sessions', 'cost')
+            k: Number of actors to return
+            since: First day included (YYYY-MM-DD)
+            until: First day excluded (YYYY-MM-DD)
+            organization_id: Only this organization
+
+        Returns:
+            Dict with actors_ranked (actors with activity) and leaders: rank,
+            actor, value and the actor's activity and cost totals
+
+        Raises:
+            ValueError: If metric is unknown or k is not positive
+        """
+        column = self.LEADERBOARD_METRICS.get(metric)
+        if column is None:
+            raise ValueError(f"Invalid metric: {metric}. Must be one of {', '.join(self.LEADERBOARD_METRICS)}")
+        if k < 1:
+            raise ValueError(f"k must be a positive integer, got {k}")
+
+        where, params = ['source = ?'], [source]
+        for clause, value in (('day >= ?', since), ('day < ?', until), ('organization_id = ?', organization_id)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        where = ' AND '.join(where)
+
+        # Min-heap of the k best (value, -position, row) seen so far; on ties the later actor is evicted
+        heap: List[tuple] = []
+        actors_ranked = 0
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT activity.*, COALESCE(models.cost, 0) AS cost
+                FROM (SELECT actor, {', '.join(f'SUM({m}) AS {m}' for m in ACTIVITY_METRICS)}
+                      FROM usage_daily WHERE {where} GROUP BY actor) AS activity
+                LEFT JOIN (SELECT actor, SUM(cost) AS cost
+                           FROM usage_daily_models WHERE {where} GROUP BY actor) AS models
+                USING (actor)
+                ORDER BY actor
+                """,
+                params + params
+            )
+            for position, row in enumerate(rows):
+                entry = (row[column], -position, row)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+                actors_ranked += 1
+
+        leaders = [row for _, _, row in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+        return {
+            'actors_ranked': actors_ranked,
+            'leaders': [
+                {'rank': rank, 'actor': row['actor'], 'value': row[column],
+                 **{m: row[m] for m in ACTIVITY_METRICS + ['cost']}}
+                for rank, row in enumerate(leaders, start=1)
+            ]
+        }
+
+    def actor_days_frame(self, source: str, since: Optional[str] = None,
+                         until: Optional[str] = None) -> pd.DataFrame:
+        """
+        Per (day, actor) activity rows in first-seen order, for UsageAnalyzer
+
+        Args:
+            source: Source name (e.g. company)
+            since: First day included (YYYY-MM-DD)
+            until: First day excluded (YYYY-MM-DD)
+        """
+        where, params = ['source = ?'], [source]
+        if since:
+            where.append('day >= ?')
+            params.append(since)
+        if until:
+            where.append('day < ?')
+            params.append(until)
+
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                f"""
+                SELECT day, actor, {', '.join(ACTIVITY_METRICS)}
+                FROM usage_daily WHERE {' AND '.join(where)}
+                ORDER BY first_seen
+                """,
+                conn, params=params
+            )
+
+    def active_users(self, source: str, granularity: str = 'day', since: Optional[str] = None,
+                     until: Optional[str] = None, organization_id: Optional[str] = None,
+                     by_organization: bool = False, approximate: bool = False) -> List[Dict[str, Any]]:
+        """
+        Distinct active actors per period
+
+        Exact counts scan the daily rows for distinct actors. Approximate counts
+        merge the stored daily HyperLogLog sketches instead, so a week, month or
+        set of organizations costs one register merge per (day, organization).
+
+        Args:
+            source: Source name (e.g. company)
+            granularity: Period - 'day', 'week' (starting Monday) or 'month'
+            since: First day included (YYYY-MM-DD)
+            until: First day excluded (YYYY-MM-DD)
+            organization_id: Only this organization
+            by_organization: Count each organization separately
+            approximate: Estimate from the sketches (see sketch_error_rate)
+
+        Returns:
+            List of dicts with period (first day), organization_id when
+            by_organization, and active_users
+
+        Raises:
+            ValueError: If granularity is unknown
+        """
+        period = PERIOD_EXPRESSIONS.get(granularity)
+        if period is None:
+            raise ValueError(f"Invalid granularity: {granularity}. Must be one of {', '.join(PERIOD_EXPRESSIONS)}")
+        return self._count_actors(source, period, since, until, organization_id, by_organization, approximate)
+
+    def distinct_actors(self, source: str, since: Optional[str] = None, until: Optional[str] = None,
+                        organization_id: Optional[str] = None, approximate: bool = False) -> int:
+        """
+        Distinct active actors over a whole date range (see active_users)
+
+        Args:
+            source: Source name (e.g. company)
+            since: First day included (YYYY-MM-DD)
+            until: First day excluded (YYYY-MM-DD)
+            organization_id: Only this organization
+            approximate: Estimate by merging the daily sketches
+        """
+        rows = self._count_actors(source, "''", since, until, organization_id, False, approximate)
+        return rows[0]['active_users'] if rows else 0
+
+    def _count_actors(self, source: str, period: str, since: Optional[str], until: Optional[str],
+                      organization_id: Optional[str], by_organization: bool,
+                      approximate: bool) -> List[Dict[str, Any]]:
+        """Distinct actors per value of a SQL period expression over day"""
+        where, params = ['source = ?'], [source]
+        for clause, value in (('day >= ?', since), ('day < ?', until), ('organization_id = ?', organization_id)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+
+        group_by = ['period', 'organization_id'] if by_organization else ['period']
+        with closing(self._connect()) as conn:
+            if not approximate:
+                rows = conn.execute(
+                    f"""
+                    SELECT {period} AS period, {'organization_id, ' if by_organization else ''}
+                           COUNT(DISTINCT actor) AS active_users
+                    FROM usage_daily WHERE {' AND '.join(where)}
+                    GROUP BY {', '.join(group_by)} ORDER BY {', '.join(group_by)}
+                    """,
+                    params
+                ).fetchall()
+                return [dict(row) for row in rows]
+
+            rows = conn.execute(
+                f"SELECT {period} AS period, organization_id, actors FROM usage_daily_sketches WHERE {' AND '.join(where)}",
+                params
+            ).fetchall()
+
+        sketches: Dict[tuple, HyperLogLog] = {}
+        for row in rows:
+            key = tuple(row[column] for column in group_by)
+            sketch = HyperLogLog.from_bytes(row['actors'])
+            if key in sketches:
+                sketches[key].merge(sketch)
+            else:
+                sketches[key] = sketch
+
+        return [
+            {**dict(zip(group_by, key)), 'active_users': sketches[key].count()}
+            for key in sorted(sketches)
+        ]
@@ -0,0 +1,346 @@
+"""
+Compact columnar store for Claude Code usage records
+Flattens nested usage records into typed NumPy arrays (struct of arrays), with
+repeated strings interned and model breakdowns / tool actions kept as flat
+child tables keyed by record index
+"""
+
+import math
+import os
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from usage_reader import UsageFileReader
+
+_INT64_MIN, _INT64_MAX = int(np.iinfo(np.int64).min), int(np.iinfo(np.int64).max)
+
+
+def _count(value: Any) -> int:
+    """Counter field as an int64-safe int (null and non-numeric values count as 0, fractions are truncated)"""
+    if isinstance(value, float) and math.isfinite(value):
+        value = int(value)
+    elif not isinstance(value, int):
+        return 0
+    return max(min(value, _INT64_MAX), _INT64_MIN)
+
+
+def _amount(value: Any) -> float:
+    """Cost field as a float (null, non-numeric and non-finite values count as 0.0)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return 0.0
+    return float(value)
+
+
+class StringPool:
+    """Interns repeated strings as small integer codes"""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        """Code of value, adding it on first sight (None is stored as '')"""
+        value = value or ''
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the interned strings"""
+        return sum(len(value.encode('utf-8')) for value in self.values)
+
+
+class UsageStore:
+    """
+    Usage records as typed columns
+
+    Record table (one entry per record): date, actor, organization, terminal,
+    customer and subscription type codes, and the core metrics. Child tables
+    (one entry per model breakdown / tool, with a `record` column pointing back
+    into the record table) hold token counts, costs and tool decisions. When
+    built from a file, each record's byte span is kept too, so the raw record
+    can be re-read on demand (see UsageIndex).
+    """
+
+    # Record table columns -> array typecode
+    RECORD_COLUMNS = {
+        'date': 'q',             # Day code, resolved to datetime64[ns] when the store is sealed
+        'actor': 'i',
+        'organization': 'i',
+        'terminal': 'i',
+        'customer_type': 'i',
+        'subscription_type': 'i',
+        'sessions': 'q',
+        'lines_added': 'q',
+        'lines_removed': 'q',
+        'commits': 'q',
+        'pull_requests': 'q',
+    }
+    MODEL_COLUMNS = {
+        'record': 'i',
+        'model': 'i',
+        'cost': 'd',
+        'cache_creation_tokens': 'q',
+        'cache_read_tokens': 'q',
+        'input_tokens': 'q',
+        'output_tokens': 'q',
+    }
+    TOOL_COLUMNS = {
+        'record': 'i',
+        'tool': 'i',
+        'accepted': 'q',
+        'rejected': 'q',
+    }
+    SPAN_COLUMNS = {
+        'offset': 'q',
+        'length': 'q',
+    }
+
+    def __init__(self):
+        self.actors = StringPool()
+        self.organizations = StringPool()
+        self.terminals = StringPool()
+        self.customer_types = StringPool()
+        self.subscription_types = StringPool()
+        self.models = StringPool()
+        self.tools = StringPool()
+        self._dates = StringPool()
+
+        self._builders = {
+            'records': {name: array(code) for name, code in self.RECORD_COLUMNS.items()},
+            'models': {name: array(code) for name, code in self.MODEL_COLUMNS.items()},
+            'tools': {name: array(code) for name, code in self.TOOL_COLUMNS.items()},
+            'spans': {name: array(code) for name, code in self.SPAN_COLUMNS.items()},
+        }
+
+        self.records: Dict[str, np.ndarray] = {}
+        self.model_breakdown: Dict[str, np.ndarray] = {}
+        self.tool_actions: Dict[str, np.ndarray] = {}
+        self.spans: Dict[str, np.ndarray] = {}
+        self.extras: Dict[str, Any] = {}
+        self.path: Optional[str] = None
+        self.version: Optional[str] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'UsageStore':
+        """Build a store from usage records (any iterable; records are not kept)"""
+        store = cls()
+        for record in records:
+            store._append(record)
+        store._seal()
+        return store
+
+    @classmethod
+    def from_file(cls, path: str) -> 'UsageStore':
+        """Build a store from a usage file (JSON or NDJSON) in one streaming pass, keeping record spans"""
+        store = cls()
+        store.path = path
+        store.version = usage_file_version(path)
+
+        reader = UsageFileReader(path)
+        offsets, lengths = store._builders['spans']['offset'], store._builders['spans']['length']
+        for record, offset, length in reader.iter_spans():
+            store._append(record)
+            offsets.append(offset)
+            lengths.append(length)
+
+        store.extras = reader.extras
+        store._seal()
+
+        footprint = store.memory_footprint()
+        print(f"✅ Loaded {footprint['records']} usage records from {path} "
+              f"({footprint['total_bytes'] / 1024 / 1024:.1f} MB, {footprint['bytes_per_record']:.0f} bytes/record)")
+        return store
+
+    def _append(self, record: Dict[str, Any]):
+        """Copy one record's fields into the column builders"""
+        columns = self._builders['records']
+        index = len(columns['date'])
+        metrics = record.get('core_metrics') or {}
+        lines = metrics.get('lines_of_code') or {}
+
+        columns['date'].append(self._dates.intern(record['date']))
+        columns['actor'].append(self.actors.intern((record.get('actor') or {}).get('email_address')))
+        columns['organization'].append(self.organizations.intern(record.get('organization_id')))
+        columns['terminal'].append(self.terminals.intern(record.get('terminal_type')))
+        columns['customer_type'].append(self.customer_types.intern(record.get('customer_type')))
+        columns['subscription_type'].append(self.subscription_types.intern(record.get('subscription_type')))
+        columns['sessions'].append(_count(metrics.get('num_sessions')))
+        columns['lines_added'].append(_count(lines.get('added')))
+        columns['lines_removed'].append(_count(lines.get('removed')))
+        columns['commits'].append(_count(metrics.get('commits_by_claude_code')))
+        columns['pull_requests'].append(_count(metrics.get('pull_requests_by_claude_code')))
+
+        models = self._builders['models']
+        for breakdown in record.get('model_breakdown') or []:
+            tokens = breakdown.get('tokens') or {}
+            models['record'].append(index)
+            models['model'].append(self.models.intern(breakdown.get('model')))
+            models['cost'].append(_amount((breakdown.get('estimated_cost') or {}).get('amount')))
+            models['cache_creation_tokens'].append(_count(tokens.get('cache_creation')))
+            models['cache_read_tokens'].append(_count(tokens.get('cache_read')))
+            models['input_tokens'].append(_count(tokens.get('input')))
+            models['output_tokens'].append(_count(tokens.get('output')))
+
+        tools = self._builders['tools']
+        for tool, decisions in (record.get('tool_actions') or {}).items():
+            decisions = decisions or {}
+            tools['record'].append(index)
+            tools['tool'].append(self.tools.intern(tool))
+            tools['accepted'].append(_count(decisions.get('accepted')))
+            tools['rejected'].append(_count(decisions.get('rejected')))
+
+    def _seal(self):
+        """Turn the column builders into NumPy arrays (views over the builders' buffers, no copy)"""
+        def to_arrays(builders: Dict[str, array]) -> Dict[str, np.ndarray]:
+            return {name: np.frombuffer(values, dtype=values.typecode) for name, values in builders.items()}
+
+        self.records = to_arrays(self._builders['records'])
+        self.model_breakdown = to_arrays(self._builders['models'])
+        self.tool_actions = to_arrays(self._builders['tools'])
+        self.spans = to_arrays(self._builders['spans']) if self.path else {}
+
+        # Dates repeat (one per day), so each distinct date string is parsed once
+        day_values = pd.to_datetime(self._dates.values, utc=True).asi8 if len(self._dates) else np.empty(0, dtype=np.int64)
+        self.records['date'] = day_values[self.records['date']].view('datetime64[ns]') if len(day_values) else \
+            np.empty(0, dtype='datetime64[ns]')
+
+        # The arrays keep the buffers they view alive; the builders and date codes aren't needed
+        self._dates = StringPool()
+        self._builders = None
+
+    def __len__(self) -> int:
+        return len(self.records['date'])
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """The file's metadata block (empty when built from records)"""
+        return self.extras.get('metadata') or {}
+
+    def records_frame(self) -> pd.DataFrame:
+        """
+        Record table as a DataFrame (numeric columns share the store's arrays)
+
+        Columns: date (UTC), actor, organization_id, terminal_type as categoricals,
+        then sessions, lines_added, lines_removed, commits, pull_requests.
+        """
+        r = self.records
+        return pd.DataFrame({
+            'date': pd.DatetimeIndex(r['date']).tz_localize('UTC'),
+            'actor': pd.Categorical.from_codes(r['actor'], categories=self._categories(self.actors)),
+            'organization_id': pd.Categorical.from_codes(r['organization'], categories=self._categories(self.organizations)),
+            'terminal_type': pd.Categorical.from_codes(r['terminal'], categories=self._categories(self.terminals)),
+            'sessions': r['sessions'],
+            'lines_added': r['lines_added'],
+            'lines_removed': r['lines_removed'],
+            'commits': r['commits'],
+            'pull_requests': r['pull_requests'],
+        }, copy=False)
+
+    def model_breakdown_frame(self) -> pd.DataFrame:
+        """Model breakdown child table as a DataFrame (record is a row of records_frame)"""
+        m = self.model_breakdown
+        return pd.DataFrame({
+            'record': m['record'],
+            'model': pd.Categorical.from_codes(m['model'], categories=self._categories(self.models)),
+            'cost': m['cost'],
+            'cache_creation_tokens': m['cache_creation_tokens'],
+            'cache_read_tokens': m['cache_read_tokens'],
+            'input_tokens': m['input_tokens'],
+            'output_tokens': m['output_tokens'],
+        }, copy=False)
+
+    def tool_actions_frame(self) -> pd.DataFrame:
+        """Tool actions child table as a DataFrame (record is a row of records_frame)"""
+        t = self.tool_actions
+        return pd.DataFrame({
+            'record': t['record'],
+            'tool': pd.Categorical.from_codes(t['tool'], categories=self._categories(self.tools)),
+            'accepted': t['accepted'],
+            'rejected': t['rejected'],
+        }, copy=False)
+
+    @staticmethod
+    def _categories(pool: StringPool) -> List[str]:
+        # Categorical needs at least a placeholder category to build from (empty) codes
+        return pool.values or ['']
+
+    def memory_footprint(self) -> Dict[str, Any]:
+        """
+        Memory held by the store
+
+        Returns:
+            Dict with records, per-table byte counts, interned string bytes,
+            total_bytes and bytes_per_record
+        """
+        def table_bytes(columns: Dict[str, np.ndarray]) -> int:
+            return int(sum(values.nbytes for values in columns.values()))
+
+        pools = (self.actors, self.organizations, self.terminals, self.customer_types,
+                 self.subscription_types, self.models, self.tools)
+        footprint = {
+            'records': len(self),
+            'record_table_bytes': table_bytes(self.records),
+            'model_breakdown_rows': len(self.model_breakdown.get('record', ())),
+            'model_breakdown_bytes': table_bytes(self.model_breakdown),
+            'tool_actions_bytes': table_bytes(self.tool_actions),
+            'span_bytes': table_bytes(self.spans),
+            'string_bytes': sum(pool.memory_bytes() for pool in pools),
+        }
+        footprint['total_bytes'] = sum(value for key, value in footprint.items() if key.endswith('_bytes'))
+        footprint['bytes_per_record'] = footprint['total_bytes'] / footprint['records'] if footprint['records'] else 0
+        return footprint
+
+
+def usage_file_version(path: Union[str, int]) -> str:
+    """Token that changes whenever the file changes (path or open file descriptor)"""
+    stat = os.stat(path)
+    return f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+
+
+# Stores of usage files, rebuilt when a file changes
+_usage_stores: Dict[str, UsageStore] = {}
+_usage_stores_lock = threading.Lock()
+
+
+def load_usage_store(path: str) -> UsageStore:
+    """
+    Store of a usage file, built once per file version
+
+    Args:
+        path: Usage file (JSON or NDJSON)
+    """
+    key = os.path.abspath(path)
+    version = usage_file_version(path)
+    with _usage_stores_lock:
+        store = _usage_stores.get(key)
+        if store is not None and store.version == version:
+            return store
+
+    # Built outside the lock, so a cold load doesn't hold up other files or usage_store_stats
+    store = UsageStore.from_file(path)
+
+    with _usage_stores_lock:
+        current = _usage_stores.get(key)
+        if current is not None and current.version == store.version:
+            # Another request built the same version first; share its store
+            return current
+        _usage_stores[key] = store
+    return store
+
+
+def usage_store_stats() -> List[Dict[str, Any]]:
+    """Loaded stores and their memory footprint"""
+    with _usage_stores_lock:
+        return [{'path': path, **store.memory_footprint()} for path, store in _usage_stores.items()]
@@ -2,30 +2,34 @@ import { useEffect, useState } from "react";
 import { LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, LabelList } from "recharts";
 import { Users, Code, Clock, DollarSign } from "lucide-react";
 
-interface UsageRecord {
-  actor: {
-    email_address: string;
-    type: string;
-  };
-  core_metrics: {
-    commits_by_claude_code: number;
-    lines_of_code: {
-      added: number;
-      removed: number;
-    };
-    num_sessions: number;
-    pull_requests_by_claude_code: number;
+interface UserStats {
+  email: string;
+  sessions: number;
+  lines_of_code: number;
+  commits: number;
+  prs: number;
+  organization: string;
+}
+
+interface UsageMetricsResult {
+  summary: {
+    unique_users: number;
+    total_sessions: number;
+    total_commits: number;
+    total_prs: number;
+    total_loc: number;
+    hours_saved: number;
+    cost_savings: number;
   };
-  date: string;
-  model_breakdown: any[];
-  organization_id: string;
-  subscription_type: string;
-  terminal_type: string;
-  tool_actions: any;
+  loc_time_series: { date: string; lines_of_code: number }[];
+  pr_commit_time_series: { date: string; pull_requests: number; commits: number }[];
+  active_users_time_series: { date: string; active_users: number }[];
+  org_penetration: { organization: string; active_users: number; total_users: number; penetration: number }[];
+  top_users: UserStats[];
 }
 
 const UsageMetrics = () => {
-  const [usageData, setUsageData] = useState<UsageRecord[]>([]);
+  const [usageMetrics, setUsageMetrics] = useState<UsageMetricsResult | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -36,14 +40,17 @@ const UsageMetrics = () => {
         const storedCompany = sessionStorage.getItem('selectedCompany') || 'fintechco';
 
         const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5001';
-        const response = await fetch(`${API_URL}/api/usage-data?company=${storedCompany}`);
+        // Aggregated server-side over the post-adoption period (Aug 25 - Sep 30)
+        const response = await fetch(
+          `${API_URL}/api/usage-metrics?company=${storedCompany}&start_date=2025-08-25&end_date=2025-10-01`
+        );
 
         if (!response.ok) {
           throw new Error(`Failed to fetch usage data: ${response.status}`);
         }
 
         const result = await response.json();
-        setUsageData(result.data || []);
+        setUsageMetrics(result);
         setLoading(false);
       } catch (err) {
         console.error('Error fetching usage data:', err);
@@ -66,7 +73,7 @@ const UsageMetrics = () => {
     );
   }
 
-  if (error) {
+  if (error || !usageMetrics) {
     return (
       <div className="bg-destructive/10 border border-destructive rounded-lg p-6">
         <p className="text-destructive font-medium">Error loading usage data</p>
@@ -75,92 +82,15 @@ const UsageMetrics = () => {
     );
   }
 
-  // Helper function to extract organization from email
-  const getOrganization = (email: string): string => {
-    const domain = email.split('@')[1];
-    if (domain.includes('engineering') || domain.includes('backend') || domain.includes('frontend') || domain.includes('platform')) {
-      return 'Software Engineers';
-    } else if (domain.includes('datascience') || domain.includes('ml') || domain.includes('research')) {
-      return 'Data Scientists';
-    } else if (domain.includes('analytics') || domain.includes('data') || domain.includes('insights') || domain.includes('reporting')) {
-      return 'Data Analysts';
-    }
-    return 'Other';
-  };
-
-  // Helper function to check if date is a weekend (with proper UTC handling)
-  const isWeekend = (dateString: string): boolean => {
-    // Parse date in UTC to avoid timezone issues
-    const [year, month, day] = dateString.split('-').map(Number);
-    const date = new Date(Date.UTC(year, month - 1, day));
-    const dayOfWeek = date.getUTCDay();
-    return dayOfWeek === 0 || dayOfWeek === 6; // Sunday = 0, Saturday = 6
-  };
-
-  // Filter data from August 25th onwards (adoption date) and before October 1st
-  const adoptionDate = new Date('2025-08-25');
-  const endDate = new Date('2025-10-01'); // End of September
-  const postAdoptionData = usageData.filter(record => {
-    const recordDate = new Date(record.date);
-    return recordDate >= adoptionDate && recordDate < endDate;
-  });
-
-  // 1. LINES OF CODE OVER TIME (excluding weekends)
-  const locByDate = postAdoptionData.reduce((acc, record) => {
-    const date = record.date.split('T')[0];
-    if (!isWeekend(date)) {
-      if (!acc[date]) {
-        acc[date] = 0;
-      }
-      acc[date] += record.core_metrics.lines_of_code.added;
-    }
-    return acc;
-  }, {} as Record<string, number>);
-
-  const locTimeSeriesData = Object.entries(locByDate)
-    .map(([date, loc]) => ({
-      date,
-      lines_of_code: loc
-    }))
-    .sort((a, b) => a.date.localeCompare(b.date));
-
-  // 2. PRS AND COMMITS OVER TIME (excluding weekends)
-  const prCommitsByDate = postAdoptionData.reduce((acc, record) => {
-    const date = record.date.split('T')[0];
-    if (!isWeekend(date)) {
-      if (!acc[date]) {
-        acc[date] = { prs: 0, commits: 0 };
-      }
-      acc[date].prs += record.core_metrics.pull_requests_by_claude_code;
-      acc[date].commits += record.core_metrics.commits_by_claude_code;
-    }
-    return acc;
-  }, {} as Record<string, { prs: number; commits: number }>);
-
-  const prCommitTimeSeriesData = Object.entries(prCommitsByDate)
-    .map(([date, data]) => ({
-      date,
-      pull_requests: data.prs,
-      commits: data.commits
-    }))
-    .sort((a, b) => a.date.localeCompare(b.date));
-
-  // 3. ORGANIZATION PENETRATION
-  const uniqueUsersByOrg = postAdoptionData.reduce((acc, record) => {
-    const org = getOrganization(record.actor.email_address);
-    if (!acc[org]) {
-      acc[org] = new Set();
-    }
-    acc[org].add(record.actor.email_address);
-    return acc;
-  }, {} as Record<string, Set<string>>);
-
-  const totalEmployeesByOrg = {
-    'Software Engineers': 25,
-    'Data Scientists': 15,
-    'Data Analysts': 10
-  };
+  const {
+    loc_time_series: locTimeSeriesData,
+    pr_commit_time_series: prCommitTimeSeriesData,
+    active_users_time_series: activeUsersTimeSeriesData,
+    top_users: topUsers,
+    summary
+  } = usageMetrics;
 
+  // 3. ORGANIZATION ADOPTION
   // Get company from sessionStorage
   const storedCompany = sessionStorage.getItem('selectedCompany') || 'fintechco';
 
@@ -217,73 +147,15 @@ const UsageMetrics = () => {
     }
   ];
 
-  const orgPenetrationData = Object.entries(uniqueUsersByOrg).map(([org, users]) => ({
-    organization: org,
-    active_users: users.size,
-    total_users: totalEmployeesByOrg[org as keyof typeof totalEmployeesByOrg] || 0,
-    penetration: ((users.size / (totalEmployeesByOrg[org as keyof typeof totalEmployeesByOrg] || 1)) * 100).toFixed(1)
-  }));
-
-  // 4. USER LEADERBOARD
-  const userStats = postAdoptionData.reduce((acc, record) => {
-    const email = record.actor.email_address;
-    if (!acc[email]) {
-      acc[email] = {
-        email,
-        sessions: 0,
-        lines_of_code: 0,
-        commits: 0,
-        prs: 0,
-        organization: getOrganization(email)
-      };
-    }
-    acc[email].sessions += record.core_metrics.num_sessions;
-    acc[email].lines_of_code += record.core_metrics.lines_of_code.added;
-    acc[email].commits += record.core_metrics.commits_by_claude_code;
-    acc[email].prs += record.core_metrics.pull_requests_by_claude_code;
-    return acc;
-  }, {} as Record<string, any>);
-
-  const topUsers = Object.values(userStats)
-    .sort((a, b) => b.sessions - a.sessions)
-    .slice(0, 10);
-
-  // 5. ACTIVE USERS TREND (HEALTH METRIC) (excluding weekends)
-  const activeUsersByDate = postAdoptionData.reduce((acc, record) => {
-    const date = record.date.split('T')[0];
-    if (!isWeekend(date)) {
-      if (!acc[date]) {
-        acc[date] = new Set();
-      }
-      acc[date].add(record.actor.email_address);
-    }
-    return acc;
-  }, {} as Record<string, Set<string>>);
-
-  const activeUsersTimeSeriesData = Object.entries(activeUsersByDate)
-    .map(([date, users]) => ({
-      date,
-      active_users: users.size
-    }))
-    .sort((a, b) => a.date.localeCompare(b.date));
-
   // Summary stats
-  const totalSessions = postAdoptionData.reduce((sum, r) => sum + r.core_metrics.num_sessions, 0);
-  const totalCommits = postAdoptionData.reduce((sum, r) => sum + r.core_metrics.commits_by_claude_code, 0);
-  const totalPRs = postAdoptionData.reduce((sum, r) => sum + r.core_metrics.pull_requests_by_claude_code, 0);
-  const totalLOC = postAdoptionData.reduce((sum, r) => sum + r.core_metrics.lines_of_code.added, 0);
-  const uniqueUsers = new Set(postAdoptionData.map(r => r.actor.email_address)).size;
-
-  // Calculate Hours Saved and Cost Savings
-  // Assumptions: Claude Code saves ~30% of time per LOC based on industry benchmarks
-  // Average: 100 LOC = 1 hour of manual coding
-  const hoursPerLOC = 1 / 100; // 1 hour per 100 lines
-  const timeSavingsPercent = 0.30; // 30% time savings
-  const totalHoursSaved = totalLOC * hoursPerLOC * timeSavingsPercent;
-
-  // Average hourly rate for software engineers: $50/hour (based on $100k annual salary)
-  const hourlyRate = 50;
-  const totalCostSavings = totalHoursSaved * hourlyRate;
+  const {
+    unique_users: uniqueUsers,
+    total_commits: totalCommits,
+    total_prs: totalPRs,
+    total_loc: totalLOC,
+    hours_saved: totalHoursSaved,
+    cost_savings: totalCostSavings
+  } = summary;
 
   const COLORS = ['#CC785C', '#8B5E3C', '#E89C7C'];
 